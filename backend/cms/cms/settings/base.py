@@ -138,6 +138,39 @@ DATABASES = {
     )
 }
 
+# -------------------------------------------------------------------
+# Cache (LocMem by default; set CACHE_BACKEND/CACHE_LOCATION to a shared
+# backend, e.g. django.core.cache.backends.redis.RedisCache with a
+# redis:// URL or django.core.cache.backends.db.DatabaseCache with a table
+# name after `manage.py createcachetable`)
+# -------------------------------------------------------------------
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache")
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": os.getenv("CACHE_LOCATION", "shambala-cms"),
+    }
+}
+
+# Backends private to one process: invalidations made by signals in other
+# workers or by management commands (import_house_designs,
+# warm_renditions, ...) never reach them
+PROCESS_LOCAL_CACHE_BACKENDS = [
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+]
+
+# Seconds a computed API payload (hero/body data) stays cached; a process-
+# local cache keeps payloads for at most a minute, since it can miss
+# invalidations
+API_PAYLOAD_CACHE_TIMEOUT = int(os.getenv("API_PAYLOAD_CACHE_TIMEOUT", 60 * 60 * 24))
+if CACHE_BACKEND in PROCESS_LOCAL_CACHE_BACKENDS:
+    API_PAYLOAD_CACHE_TIMEOUT = min(API_PAYLOAD_CACHE_TIMEOUT, 60)
+
+# Filter house design listings in memory with NumPy (house_designs.engine);
+# falls back to database queries when NumPy is not installed
+HOUSE_DESIGN_CATALOG_ENGINE = os.getenv("HOUSE_DESIGN_CATALOG_ENGINE", "False").lower() == "true"
+
 # -------------------------------------------------------------------
 # Password validation
 # -------------------------------------------------------------------
@@ -176,6 +209,10 @@ STORAGES = {
     "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
 }
 
+# Background processes that pre-generate image renditions after uploads
+# and publishes (0 disables ahead-of-time generation)
+RENDITION_WORKERS = int(os.getenv("RENDITION_WORKERS", 2))
+
 # -------------------------------------------------------------------
 # Django form field limit (Wagtail editor on complex pages)
 # -------------------------------------------------------------------
@@ -193,6 +230,12 @@ WAGTAILSEARCH_BACKENDS = {
 # Base URL for notifications / full URLs in admin (env-driven)
 WAGTAILADMIN_BASE_URL = os.getenv("WAGTAILADMIN_BASE_URL", "http://127.0.0.1:8000")
 
+# Public URL of the CMS API (scheme://host[:port], env-driven) for absolute
+# media links built outside a request. Publish-time page snapshots are
+# built for it and only served to API requests on the same scheme and host
+# (see core.snapshots), so it must match the URL the frontend calls.
+BASE_URL = os.getenv("BASE_URL", WAGTAILADMIN_BASE_URL).rstrip("/")
+
 # Allowed file extensions for Wagtail documents (keep/adjust as needed)
 WAGTAILDOCS_EXTENSIONS = [
     "csv", "docx", "key", "odt", "pdf", "pptx", "rtf", "txt", "xlsx", "zip"
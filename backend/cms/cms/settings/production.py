@@ -1,7 +1,17 @@
+from django.core.exceptions import ImproperlyConfigured
+
 from .base import *
 
 DEBUG = False
 
+# API payloads, content versions and the page URL map are invalidated by
+# signals, which must reach every worker process
+if CACHE_BACKEND in PROCESS_LOCAL_CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        "Production needs a shared cache: set CACHE_BACKEND and CACHE_LOCATION "
+        "(e.g. django.core.cache.backends.redis.RedisCache and a redis:// URL)"
+    )
+
 # ManifestStaticFilesStorage is recommended in production, to prevent
 # outdated JavaScript / CSS assets being served from cache
 # (e.g. after a Wagtail upgrade).
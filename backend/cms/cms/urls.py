@@ -11,17 +11,21 @@ from wagtail.documents import urls as wagtaildocs_urls
 
 # Wagtail API v2 (Wagtail 7.x)
 from wagtail.api.v2.router import WagtailAPIRouter
-from wagtail.api.v2.views import PagesAPIViewSet
-from wagtail.images.api.v2.views import ImagesAPIViewSet
-from wagtail.documents.api.v2.views import DocumentsAPIViewSet
 
 # Import custom API views
-from core.views import site_settings_api
+from core.views import (
+    HeadlessDocumentsAPIViewSet,
+    HeadlessImagesAPIViewSet,
+    HeadlessPagesAPIViewSet,
+    site_settings_api,
+)
+from house_designs.views import HouseDesignsAPIViewSet
 
 api_router = WagtailAPIRouter("wagtailapi")
-api_router.register_endpoint("pages", PagesAPIViewSet)
-api_router.register_endpoint("images", ImagesAPIViewSet)
-api_router.register_endpoint("documents", DocumentsAPIViewSet)
+api_router.register_endpoint("pages", HeadlessPagesAPIViewSet)
+api_router.register_endpoint("images", HeadlessImagesAPIViewSet)
+api_router.register_endpoint("documents", HeadlessDocumentsAPIViewSet)
+api_router.register_endpoint("house-designs", HouseDesignsAPIViewSet)
 
 urlpatterns = [
     path("django-admin/", admin.site.urls),
@@ -4,8 +4,13 @@ API Serialization Helpers for Wagtail Headless CMS
 Reusable methods and mixins for serializing Wagtail content to API responses.
 """
 
+from rest_framework.fields import Field
 from wagtail.api import APIField
+from wagtail.api.v2.serializers import PageSerializer
+from wagtail.api.v2.utils import BadRequestError
 from wagtail.images.api.fields import ImageRenditionField
+from core.page_urls import PageURLResolver
+from core.renditions import RenditionResolver
 from core.utils import get_base_url, get_image_data
 
 
@@ -78,6 +83,140 @@ class HeadlessSerializerMixin:
         
         hero = hero_relation.first()
         return hero.hero_data if hasattr(hero, 'hero_data') else None
+    
+    @property
+    def hero_data(self):
+        """Hero data from the relation named by ``hero_relation_name``."""
+        return self.get_hero_data(self.hero_relation_name)
+
+
+class StreamBlocksField(Field):
+    """
+    API field serializing a StreamField through a BlockSerializerRegistry,
+    so each block's output is memoized.
+    
+    Usage:
+        api_fields = [
+            APIField('body', serializer=StreamBlocksField(core_blocks)),
+        ]
+    """
+    
+    def __init__(self, registry, **kwargs):
+        self.registry = registry
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+    
+    def to_representation(self, stream_value):
+        base_url = get_base_url(self.context.get('request'))
+        return self.registry.serialize_stream(stream_value, RenditionResolver(), base_url)
+
+
+class BlockWindow:
+    """
+    A window of StreamField blocks requested through query parameters.
+    
+    For a stream exposed as ``body``:
+        ?body_offset=2&body_count=3    -> blocks 2, 3 and 4
+        ?body_id=<id>,<id>             -> the listed blocks, in stream order
+    
+    Usage:
+        window = BlockWindow.from_request(request, 'body')
+        if window:
+            indexes = window.select(block_ids)
+    """
+    
+    def __init__(self, offset=0, count=None, block_ids=None):
+        self.offset = offset
+        self.count = count
+        self.block_ids = block_ids
+    
+    @staticmethod
+    def query_parameters(prefix):
+        """Query parameter names used for a stream (e.g., 'body_offset')."""
+        return {f'{prefix}_offset', f'{prefix}_count', f'{prefix}_id'}
+    
+    @classmethod
+    def from_request(cls, request, prefix):
+        """
+        Parse the window for a stream from the request's query parameters.
+        
+        Args:
+            request: Django request object (or None)
+            prefix (str): Stream name used as parameter prefix (e.g., 'body')
+            
+        Returns:
+            BlockWindow or None: None when no window was requested
+        """
+        if request is None:
+            return None
+        
+        params = request.GET
+        offset = params.get(f'{prefix}_offset')
+        count = params.get(f'{prefix}_count')
+        block_ids = params.get(f'{prefix}_id')
+        if offset is None and count is None and block_ids is None:
+            return None
+        
+        try:
+            offset = int(offset) if offset is not None else 0
+            count = int(count) if count is not None else None
+        except ValueError:
+            raise BadRequestError(f"{prefix}_offset and {prefix}_count must be integers")
+        if offset < 0 or (count is not None and count < 0):
+            raise BadRequestError(f"{prefix}_offset and {prefix}_count must not be negative")
+        
+        if block_ids is not None:
+            block_ids = [block_id for block_id in block_ids.split(',') if block_id]
+        
+        return cls(offset, count, block_ids)
+    
+    def select(self, block_ids):
+        """
+        Pick the positions of the blocks in this window.
+        
+        Args:
+            block_ids (list): Ids of all blocks in the stream, in order
+            
+        Returns:
+            list: Positions of the selected blocks
+        """
+        indexes = range(len(block_ids))
+        if self.block_ids is not None:
+            wanted = set(self.block_ids)
+            indexes = [index for index in indexes if block_ids[index] in wanted]
+        
+        end = self.offset + self.count if self.count is not None else None
+        return list(indexes)[self.offset:end]
+
+
+class SnapshotPageSerializer(PageSerializer):
+    """
+    Page serializer that reads stored field values from ``page._snapshot``.
+    
+    The Pages API viewset attaches a page's snapshot data (see
+    core.snapshots) before serializing; fields found there are copied as-is
+    and only the remaining fields are computed.
+    """
+    
+    def to_representation(self, instance):
+        snapshot = getattr(instance, '_snapshot', None)
+        if not snapshot:
+            return super().to_representation(instance)
+        
+        # Serialize the other fields with the snapshotted ones left out
+        fields = self.fields
+        self.__dict__['fields'] = {
+            name: field for name, field in fields.items() if name not in snapshot
+        }
+        try:
+            data = super().to_representation(instance)
+        finally:
+            self.__dict__['fields'] = fields
+        
+        for name in fields:
+            if name in snapshot:
+                data[name] = snapshot[name]
+        return data
 
 
 class ImageSerializerMixin:
@@ -116,21 +255,25 @@ class ImageSerializerMixin:
         ]
 
 
-def serialize_page_for_menu(page):
+def serialize_page_for_menu(page, page_urls=None):
     """
     Serialize page for menu/navigation.
     
     Args:
         page: Wagtail Page object
+        page_urls (PageURLResolver): Resolver shared by the menu (optional)
         
     Returns:
         dict: Page data for menu
     """
+    if page_urls is None:
+        page_urls = PageURLResolver()
+    
     return {
         'id': page.id,
         'title': page.title,
         'slug': page.slug,
-        'url': page.url,
+        'url': page_urls.get_url(page),
         'show_in_menus': page.show_in_menus,
     }
 
@@ -155,7 +298,12 @@ def serialize_child_pages(parent_page, limit=None, include_unpublished=False):
     if limit:
         children = children[:limit]
     
-    return [serialize_page_for_menu(child.specific) for child in children]
+    children = [child.specific for child in children]
+    page_urls = PageURLResolver()
+    page_urls.add(*children)
+    page_urls.resolve()
+    
+    return [serialize_page_for_menu(child, page_urls) for child in children]
 
 
 def serialize_snippet_data(snippet, fields):
@@ -9,3 +9,7 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
     verbose_name = 'Core Components'
+
+    def ready(self):
+        # Connect API cache invalidation handlers
+        from core import signals  # noqa: F401
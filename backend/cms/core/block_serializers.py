@@ -0,0 +1,283 @@
+"""
+Block Serializer Registry for Wagtail Headless CMS
+
+Maps StreamField block types to serializer functions and memoizes each
+block's output in the cache. A block's cache key is built from its id, a
+hash of its raw JSON, the base URL and the current versions of every image,
+page and document it references (and of the sites, which decide page URLs), so
+editing one block (or an image it shows) only re-serializes that block.
+
+Usage:
+    home_blocks = BlockSerializerRegistry('home', collect=collect_stream_renditions)
+
+    @home_blocks.register('quality_homes')
+    def serialize_quality_homes_block(block_value, renditions, base_url):
+        ...
+
+    home_blocks.serialize_stream(page.body, renditions, base_url)
+    # [{'type': 'quality_homes', 'id': '...', 'value': {...}}, ...]
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from wagtail.blocks import ListBlock, PageChooserBlock, RichTextBlock, StreamBlock, StructBlock
+from wagtail.documents.blocks import DocumentChooserBlock
+from wagtail.documents.models import AbstractDocument
+from wagtail.images.blocks import ImageChooserBlock
+from wagtail.images.models import AbstractImage
+from wagtail.models import Page, Site
+from wagtail.rich_text import extract_references_from_rich_text
+
+from core.cache import document_tag, get_dependency_versions, image_tag, model_tag, page_tag
+
+
+BLOCK_CACHE_TIMEOUT = getattr(settings, 'API_PAYLOAD_CACHE_TIMEOUT', 60 * 60 * 24)
+
+# Cache tag of each kind of object iter_raw_dependencies() reports
+DEPENDENCY_TAGS = {
+    'image': image_tag,
+    'page': page_tag,
+    'document': document_tag,
+}
+
+
+def iter_raw_dependencies(block, raw_value):
+    """
+    Yield ('image', id) / ('page', id) / ('document', id) for every chooser
+    in a raw block value, and for every page or document link and embedded
+    image in its rich text.
+
+    Works on the stored JSON, so no images or pages are loaded.
+
+    Args:
+        block: Block definition
+        raw_value: Raw (JSON) value of the block
+
+    Yields:
+        tuple: (kind, object id)
+    """
+    if raw_value in (None, '', [], {}):
+        return
+
+    if isinstance(block, ImageChooserBlock):
+        yield 'image', raw_value
+    elif isinstance(block, PageChooserBlock):
+        yield 'page', raw_value
+    elif isinstance(block, DocumentChooserBlock):
+        yield 'document', raw_value
+    elif isinstance(block, RichTextBlock) and isinstance(raw_value, str):
+        # <a linktype="page|document" id="..."> and <embed embedtype="image" id="...">
+        for model, object_id, _, _ in extract_references_from_rich_text(raw_value):
+            if issubclass(model, Page):
+                yield 'page', object_id
+            elif issubclass(model, AbstractImage):
+                yield 'image', object_id
+            elif issubclass(model, AbstractDocument):
+                yield 'document', object_id
+    elif isinstance(block, StructBlock) and isinstance(raw_value, dict):
+        for name, child_block in block.child_blocks.items():
+            yield from iter_raw_dependencies(child_block, raw_value.get(name))
+    elif isinstance(block, ListBlock):
+        for item in raw_value:
+            # List items are stored as {'type': 'item', 'value': ..., 'id': ...}
+            if isinstance(item, dict) and item.get('type') == 'item' and 'value' in item:
+                item = item['value']
+            yield from iter_raw_dependencies(block.child_block, item)
+    elif isinstance(block, StreamBlock):
+        for child in raw_value:
+            child_block = block.child_blocks.get(child.get('type'))
+            if child_block:
+                yield from iter_raw_dependencies(child_block, child.get('value'))
+
+
+class BlockSerializerRegistry:
+    """
+    Serializer functions keyed by block type, with per-block memoization.
+
+    Serializers are called as ``serializer(block_value, renditions, base_url)``
+    and must return JSON-serializable data. Block types without a serializer
+    use Wagtail's own API representation.
+    """
+
+    def __init__(self, name, collect=None):
+        """
+        Args:
+            name (str): Registry name, part of every cache key
+            collect (callable): ``collect(blocks, renditions)`` registering the
+                renditions the given blocks need (optional)
+        """
+        self.name = name
+        self.collect = collect
+        self._serializers = {}
+
+    def register(self, block_type, serializer=None):
+        """
+        Register a serializer for a block type (usable as a decorator).
+
+        Args:
+            block_type (str): StreamField block name (e.g., 'quality_homes')
+            serializer (callable): ``serializer(block_value, renditions, base_url)``
+        """
+        if serializer is None:
+            def decorator(func):
+                self._serializers[block_type] = func
+                return func
+            return decorator
+
+        self._serializers[block_type] = serializer
+        return serializer
+
+    def serialize_block(self, block, renditions, base_url):
+        """Serialize one bound block without memoization."""
+        serializer = self._serializers.get(block.block_type)
+        if serializer is None:
+            return block.block.get_api_representation(block.value)
+        return serializer(block.value, renditions, base_url)
+
+    def get_block_cache_key(self, raw_block, base_url, versions):
+        """
+        Build the memoization key for a raw block.
+
+        Args:
+            raw_block (dict): Stored block ({'type', 'value', 'id'})
+            base_url (str): Base URL used for absolute links
+            versions (list): (tag, version) pairs of the block's dependencies
+
+        Returns:
+            str: Cache key
+        """
+        digest = hashlib.sha1(
+            json.dumps(
+                [raw_block.get('value'), base_url, versions],
+                cls=DjangoJSONEncoder, sort_keys=True,
+            ).encode('utf-8')
+        ).hexdigest()
+        return f"block-payload:{self.name}:{raw_block.get('type')}:{raw_block.get('id')}:{digest}"
+
+    def serialize_stream(self, stream_value, renditions, base_url, indexes=None):
+        """
+        Serialize the blocks of a StreamField value, reusing memoized output.
+
+        Only blocks missing from the cache are bound (loading their images and
+        pages) and serialized; their renditions are resolved in one go. Every
+        referenced image, page and document is added to ``renditions.dependencies``.
+
+        Args:
+            stream_value: StreamField value (e.g., page.body)
+            renditions (RenditionResolver): Resolver for rendition lookups
+            base_url (str): Base URL for absolute links
+            indexes (list): Positions of the blocks to serialize (default: all)
+
+        Returns:
+            list: [{'type', 'id', 'value'}, ...] in stream order
+        """
+        if not stream_value:
+            return []
+
+        if indexes is None:
+            indexes = range(len(stream_value.raw_data))
+        return self._serialize_blocks(stream_value, list(indexes), renditions, base_url)
+
+    def iter_stream(self, stream_value, renditions, base_url, indexes=None, chunk_size=1):
+        """
+        Serialize blocks lazily, ``chunk_size`` blocks at a time.
+
+        Same output as serialize_stream(), but each chunk is serialized only
+        when the previous one has been consumed, so a streaming response can
+        send the first blocks before the rest exist.
+
+        Args:
+            stream_value: StreamField value (e.g., page.body)
+            renditions (RenditionResolver): Resolver for rendition lookups
+            base_url (str): Base URL for absolute links
+            indexes (list): Positions of the blocks to serialize (default: all)
+            chunk_size (int): Blocks fetched and serialized per batch
+
+        Yields:
+            dict: {'type', 'id', 'value'} in stream order
+        """
+        if not stream_value:
+            return
+
+        if indexes is None:
+            indexes = range(len(stream_value.raw_data))
+        indexes = list(indexes)
+        for start in range(0, len(indexes), chunk_size):
+            chunk = indexes[start:start + chunk_size]
+            yield from self._serialize_blocks(stream_value, chunk, renditions, base_url)
+
+    def _serialize_blocks(self, stream_value, indexes, renditions, base_url):
+        raw_data = stream_value.raw_data
+        raw_blocks = [raw_data[index] for index in indexes]
+        child_blocks = stream_value.stream_block.child_blocks
+
+        block_tags = []
+        for raw_block in raw_blocks:
+            tags = {model_tag(Site)}
+            child_block = child_blocks.get(raw_block.get('type'))
+            if child_block:
+                for kind, object_id in iter_raw_dependencies(child_block, raw_block.get('value')):
+                    tags.add(DEPENDENCY_TAGS[kind](object_id))
+            block_tags.append(sorted(tags))
+
+        all_tags = {tag for tags in block_tags for tag in tags}
+        versions = get_dependency_versions(all_tags)
+        renditions.dependencies.update(all_tags)
+
+        keys = [
+            self.get_block_cache_key(raw_block, base_url, [(tag, versions[tag]) for tag in tags])
+            for raw_block, tags in zip(raw_blocks, block_tags)
+        ]
+        cached = cache.get_many(keys)
+
+        missed = [position for position, key in enumerate(keys) if key not in cached]
+        if missed:
+            blocks = {position: stream_value[indexes[position]] for position in missed}
+            if self.collect:
+                self.collect(blocks.values(), renditions)
+            renditions.resolve()
+
+            fresh = {
+                keys[position]: self.serialize_block(block, renditions, base_url)
+                for position, block in blocks.items()
+            }
+            cache.set_many(fresh, BLOCK_CACHE_TIMEOUT)
+            cached.update(fresh)
+
+        return [
+            {
+                'type': raw_block.get('type'),
+                'id': raw_block.get('id'),
+                'value': cached[key],
+            }
+            for raw_block, key in zip(raw_blocks, keys)
+        ]
+
+
+def get_stream_manifest(stream_value):
+    """
+    List the blocks of a StreamField value without serializing them.
+
+    Args:
+        stream_value: StreamField value (e.g., page.body)
+
+    Returns:
+        list: [{'type', 'id'}, ...] in stream order
+    """
+    if not stream_value:
+        return []
+
+    return [
+        {'type': raw_block.get('type'), 'id': raw_block.get('id')}
+        for raw_block in stream_value.raw_data
+    ]
+
+
+# Registry for the shared content blocks (core.fields) used by general and
+# landing pages and house design content. Unregistered block types fall
+# back to Wagtail's own API representation.
+core_blocks = BlockSerializerRegistry('core')
@@ -16,6 +16,8 @@ from wagtail.contrib.table_block.blocks import TableBlock
 import re
 import urllib.parse
 
+from core.page_urls import get_page_url
+
 
 # ============================================================================
 # CONFIGURATION CHOICES
@@ -121,7 +123,7 @@ class HrefStructValue(blocks.StructValue):
         free_link = self.get('free_link')
         
         if page_link:
-            return page_link.url
+            return get_page_url(page_link)
         elif external_link:
             return external_link
         elif document_link:
@@ -0,0 +1,204 @@
+"""
+API Payload Caching for Wagtail Headless CMS
+
+Caches computed page payloads (e.g. HomePage.hero_section_data) keyed by
+page id, latest revision and request host. Each payload records the tags of
+the page, images and other objects it was built from, and is stored under a
+key holding the current version of each tag, so a publish or an image change
+(which bumps the tag's version, see bump_dependency_versions) makes exactly
+the affected entries unreachable; they expire on their own.
+
+Usage:
+    @property
+    def hero_section_data(self):
+        return get_cached_payload(self, 'hero_section_data', self._build_hero_section_data)
+"""
+
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from wagtail.models import Site
+
+from core.renditions import RenditionResolver
+from core.utils import get_base_url
+
+
+PAYLOAD_CACHE_TIMEOUT = getattr(settings, 'API_PAYLOAD_CACHE_TIMEOUT', 60 * 60 * 24)
+
+CONTENT_VERSION_KEY = 'api-content-version'
+
+DEPENDENCY_VERSION_PREFIX = 'api-dependency-version'
+
+_MISSING = object()
+
+
+def page_tag(page_id):
+    """Tag for payloads built from a page."""
+    return f"page:{page_id}"
+
+
+def image_tag(image_id):
+    """Tag for payloads that reference an image."""
+    return f"image:{image_id}"
+
+
+def document_tag(document_id):
+    """Tag for payloads that link to a document."""
+    return f"document:{document_id}"
+
+
+def model_tag(model):
+    """Tag for payloads built from every instance of a model (e.g. snippets)."""
+    return f"model:{model._meta.label_lower}"
+
+
+def get_payload_cache_key(page, field_name, request=None):
+    """
+    Build the cache key for a computed page field.
+
+    Args:
+        page: Wagtail Page object
+        field_name (str): Name of the computed API field
+        request: Django request object (optional)
+
+    Returns:
+        str: Cache key unique to page, revision, host and field (the payload
+            itself is stored under this key plus its dependency versions,
+            see get_versioned_key)
+    """
+    host = request.get_host() if request else ''
+    return f"api-payload:{page.pk}:{page.latest_revision_id}:{host}:{field_name}"
+
+
+def _dependencies_key(key):
+    return f"{key}:dependencies"
+
+
+def get_versioned_key(key, versions):
+    """
+    Extend a cache key with the versions of the entry's dependencies.
+
+    Args:
+        key (str): Cache key (see get_payload_cache_key)
+        versions (dict): Version keyed by tag (see get_dependency_versions)
+
+    Returns:
+        str: Cache key
+    """
+    raw = json.dumps(sorted(versions.items()))
+    return f"{key}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+
+def get_cached_payload(page, field_name, build):
+    """
+    Return a computed page payload, building and caching it on a miss.
+
+    The current request is read from ``page._request`` (set by the API
+    viewset). ``build`` receives a fresh RenditionResolver and the base URL
+    for absolute links; every image registered with the resolver, and every
+    tag added to ``renditions.dependencies``, becomes a dependency of the
+    cached payload, as do the sites (their root pages decide page URLs).
+
+    Args:
+        page: Wagtail Page object
+        field_name (str): Name of the computed API field
+        build (callable): ``build(renditions, base_url)`` returning the payload
+
+    Returns:
+        The cached or freshly built payload
+    """
+    request = getattr(page, '_request', None)
+    key = get_payload_cache_key(page, field_name, request)
+
+    # Tags recorded by the last build of this revision
+    known_tags = cache.get(_dependencies_key(key)) or [page_tag(page.pk), model_tag(Site)]
+    versions = get_dependency_versions(known_tags)
+    payload = cache.get(get_versioned_key(key, versions), _MISSING)
+    if payload is not _MISSING:
+        return payload
+
+    renditions = RenditionResolver()
+    payload = build(renditions, get_base_url(request))
+
+    tags = {page_tag(page.pk), model_tag(Site)} | {image_tag(image_id) for image_id in renditions.image_ids}
+    tags = sorted(tags | renditions.dependencies)
+    # Versions read before the build, so a change made during it is not hidden
+    versions = {tag: versions[tag] for tag in tags if tag in versions}
+    versions.update(get_dependency_versions(tag for tag in tags if tag not in versions))
+    cache.set_many({
+        _dependencies_key(key): tags,
+        get_versioned_key(key, versions): payload,
+    }, PAYLOAD_CACHE_TIMEOUT)
+
+    return payload
+
+
+def bump_content_version():
+    """
+    Record that content outside a page's own revision changed.
+
+    The version is the current timestamp, so it doubles as the
+    Last-Modified value for API responses that depend on it.
+
+    Returns:
+        float: The new content version
+    """
+    version = time.time()
+    cache.set(CONTENT_VERSION_KEY, version, None)
+    return version
+
+
+def get_content_version():
+    """
+    Return the current content version (images, snippets, page tree).
+
+    Returns:
+        float: Timestamp of the last recorded content change
+    """
+    version = cache.get(CONTENT_VERSION_KEY)
+    if version is None:
+        version = bump_content_version()
+    return version
+
+
+def _dependency_version_key(tag):
+    return f"{DEPENDENCY_VERSION_PREFIX}:{tag}"
+
+
+def get_dependency_versions(tags):
+    """
+    Return the current version of each dependency tag.
+
+    Versions that are not in the cache yet (or were evicted) are started
+    at the current timestamp, so a lost version can never bring back an
+    output memoized before the last change.
+
+    Args:
+        tags (iterable): Dependency tags (see page_tag / image_tag)
+
+    Returns:
+        dict: Version timestamp keyed by tag
+    """
+    keys = {_dependency_version_key(tag): tag for tag in tags}
+    found = cache.get_many(list(keys))
+
+    missing = {key: time.time() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, None)
+        found.update(missing)
+
+    return {tag: found[key] for key, tag in keys.items()}
+
+
+def bump_dependency_versions(*tags):
+    """
+    Record that the objects behind ``tags`` changed.
+
+    Args:
+        *tags (str): Dependency tags (see page_tag / image_tag)
+    """
+    version = time.time()
+    cache.set_many({_dependency_version_key(tag): version for tag in tags}, None)
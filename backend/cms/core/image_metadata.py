@@ -0,0 +1,195 @@
+"""
+Persisted Image Metadata for Wagtail Headless CMS
+
+Everything an API payload needs about an original image file is computed
+once, when the file is uploaded or replaced, and stored in ImageMetadata
+(plus Wagtail's own width, height and file_size columns):
+
+- a tiny blurred preview (LQIP) and the dominant colour, so the frontend
+  can paint something before the full rendition arrives
+- the public file URL, so serializing never asks the storage backend
+
+Images uploaded before the metadata existed are served with fallback
+metadata (no placeholder) until `python manage.py build_image_metadata`
+fills it in.
+
+Usage:
+    data = get_placeholder_data(image)
+    # {'placeholder': 'data:image/webp;base64,...', 'dominant_color': '#a0b1c2'}
+    
+    url = get_image_file_url(image)
+"""
+
+import base64
+import logging
+from io import BytesIO
+
+from PIL import Image as PILImage
+
+from core.models import ImageMetadata
+
+
+logger = logging.getLogger(__name__)
+
+# Longest edge of the placeholder preview in pixels
+PLACEHOLDER_SIZE = 16
+
+
+def compute_image_placeholder(image):
+    """
+    Build the placeholder preview and dominant colour for an image.
+    
+    Args:
+        image: Wagtail Image object
+        
+    Returns:
+        tuple: (base64 data URI, '#rrggbb' colour), or ('', '') if the file
+        cannot be read as a bitmap (e.g. missing file or SVG)
+    """
+    try:
+        with image.open_file() as f:
+            with PILImage.open(f) as source:
+                # Let JPEG decoding downscale while reading
+                source.draft('RGB', (PLACEHOLDER_SIZE * 8, PLACEHOLDER_SIZE * 8))
+                preview = source.convert('RGB')
+    except Exception as e:
+        logger.warning("Could not compute placeholder for image %s: %s", image.pk, e)
+        return '', ''
+    
+    preview.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    red, green, blue = preview.resize((1, 1), PILImage.Resampling.BOX).getpixel((0, 0))
+    
+    buffer = BytesIO()
+    preview.save(buffer, format='WEBP', quality=40)
+    encoded = base64.b64encode(buffer.getvalue()).decode('ascii')
+    
+    return f"data:image/webp;base64,{encoded}", f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def update_image_metadata(image):
+    """
+    Compute and store metadata for an image if its file changed.
+    
+    This is the only place that reads the original file or asks the storage
+    backend for its size and URL.
+    
+    Args:
+        image: Wagtail Image object
+        
+    Returns:
+        ImageMetadata: Up-to-date metadata for the image
+    """
+    metadata = ImageMetadata.objects.filter(image=image).first()
+    if metadata and metadata.source_file == image.file.name:
+        return metadata
+    
+    if image.file_size is None:
+        try:
+            image.file_size = image.file.size
+        except OSError:
+            pass
+        else:
+            # Queryset update so image save signals do not fire again
+            type(image).objects.filter(pk=image.pk).update(file_size=image.file_size)
+    
+    placeholder, dominant_color = compute_image_placeholder(image)
+    metadata, _ = ImageMetadata.objects.update_or_create(
+        image=image,
+        defaults={
+            'source_file': image.file.name,
+            'file_url': image.file.url,
+            'placeholder': placeholder,
+            'dominant_color': dominant_color,
+        },
+    )
+    image.metadata = metadata
+    return metadata
+
+
+def build_fallback_metadata(image):
+    """
+    Build unsaved metadata for an image whose metadata is missing or stale.
+    
+    Only asks the storage backend for the file URL; the placeholder stays
+    empty until update_image_metadata (or the build_image_metadata command)
+    computes and stores it.
+    
+    Args:
+        image: Wagtail Image object
+        
+    Returns:
+        ImageMetadata: Unsaved metadata with an empty placeholder
+    """
+    return ImageMetadata(image=image, source_file=image.file.name, file_url=image.file.url)
+
+
+def prefetch_image_metadata(images):
+    """
+    Attach stored metadata to many images with a single query.
+    
+    Images without stored metadata (uploaded before placeholders existed)
+    get fallback metadata; nothing is computed or written while serving.
+    
+    Args:
+        images (iterable): Wagtail Image objects
+    """
+    missing = {image.pk: image for image in images}
+    for metadata in ImageMetadata.objects.filter(image_id__in=list(missing)):
+        missing.pop(metadata.image_id).metadata = metadata
+    
+    for image in missing.values():
+        image.metadata = build_fallback_metadata(image)
+
+
+def get_image_metadata(image):
+    """
+    Return the stored metadata for an image.
+    
+    Uses prefetched metadata when available. Images uploaded before the
+    metadata existed, or whose metadata is stale, get fallback metadata
+    (see build_fallback_metadata) without reading the file or writing.
+    
+    Args:
+        image: Wagtail Image object
+        
+    Returns:
+        ImageMetadata
+    """
+    try:
+        metadata = image.metadata
+    except ImageMetadata.DoesNotExist:
+        return build_fallback_metadata(image)
+    
+    if metadata.source_file != image.file.name:
+        return build_fallback_metadata(image)
+    return metadata
+
+
+def get_image_file_url(image):
+    """
+    Return the stored URL path of an image's original file.
+    
+    Args:
+        image: Wagtail Image object
+        
+    Returns:
+        str: URL of the original file (e.g., '/media/original_images/a.jpg')
+    """
+    return get_image_metadata(image).file_url
+
+
+def get_placeholder_data(image):
+    """
+    Return the placeholder fields for an image payload.
+    
+    Args:
+        image: Wagtail Image object
+        
+    Returns:
+        dict: 'placeholder' data URI and 'dominant_color'
+    """
+    metadata = get_image_metadata(image)
+    return {
+        'placeholder': metadata.placeholder,
+        'dominant_color': metadata.dominant_color,
+    }
@@ -0,0 +1,97 @@
+"""
+Compare the DRF JSON renderer with the orjson-backed FastJSONRenderer.
+
+Renders the computed API payloads of live pages (HomePage body/hero data,
+house designs listings) or, when there is no content, a synthetic payload
+of the same shape.
+
+Usage:
+    python manage.py benchmark_renderers --iterations 200
+"""
+
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import FastJSONRenderer, orjson
+from home.models import HomePage
+from house_designs.models import HouseDesignsIndexPage
+
+
+def collect_payloads():
+    """Return the API payloads of live pages."""
+    payloads = []
+    for page in HomePage.objects.live():
+        payloads.append({'hero_section_data': page.hero_section_data, 'body_content_data': page.body_content_data})
+    for page in HouseDesignsIndexPage.objects.live():
+        payloads.append({'house_designs_data': page.house_designs_data, 'filter_options': page.filter_options})
+    return payloads
+
+
+def synthetic_payload(designs=200):
+    """A house-designs-like payload with Decimals, datetimes and nested dicts."""
+    image = {
+        'src': 'http://127.0.0.1:8000/media/images/example.fill-1200x800.format-webp.webp',
+        'desktop': 'http://127.0.0.1:8000/media/images/example.fill-1200x800.format-webp.webp',
+        'tablet': 'http://127.0.0.1:8000/media/images/example.fill-1000x700.format-webp.webp',
+        'mobile': 'http://127.0.0.1:8000/media/images/example.fill-700x500.format-webp.webp',
+        'alt': 'Example',
+        'dominant_color': '#a0b1c2',
+    }
+    return {
+        'house_designs_data': [
+            {
+                'id': index,
+                'name': f"Design {index}",
+                'image': image,
+                'specs': {'bedrooms': 4, 'bathrooms': Decimal('2.5'), 'garage_spaces': 2},
+                'pricing': {'base_price': Decimal('450000.00'), 'note': 'From'},
+                'tags': ['modern', 'family', 'alfresco'],
+                'updated_at': timezone.now(),
+            }
+            for index in range(designs)
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark the fast JSON renderer against the default DRF renderer"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200, help="Renders per renderer")
+        parser.add_argument(
+            '--synthetic',
+            action='store_true',
+            help="Use a synthetic payload instead of live page payloads",
+        )
+
+    def handle(self, *args, **options):
+        payloads = [] if options['synthetic'] else collect_payloads()
+        if not payloads:
+            payloads = [synthetic_payload()]
+            self.stdout.write("Using a synthetic payload")
+
+        iterations = options['iterations']
+        size = sum(len(FastJSONRenderer().render(payload)) for payload in payloads)
+        self.stdout.write(
+            f"{len(payloads)} payload(s), {size / 1024:.1f} KiB, {iterations} iterations "
+            f"(orjson {'available' if orjson else 'NOT installed, using json fallback'})"
+        )
+
+        results = {}
+        for renderer in (JSONRenderer(), FastJSONRenderer()):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                for payload in payloads:
+                    renderer.render(payload)
+            elapsed = time.perf_counter() - started
+            results[type(renderer).__name__] = elapsed
+            self.stdout.write(
+                f"  {type(renderer).__name__:<18} {elapsed * 1000 / iterations:8.3f} ms/render"
+            )
+
+        speedup = results['JSONRenderer'] / results['FastJSONRenderer']
+        self.stdout.write(self.style.SUCCESS(f"FastJSONRenderer is {speedup:.1f}x faster"))
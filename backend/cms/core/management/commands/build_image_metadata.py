@@ -0,0 +1,41 @@
+"""
+Compute the stored metadata of every image that is missing or stale.
+
+Metadata is normally computed when an image file is uploaded or replaced
+(see core.image_metadata); run this after deploying to backfill images
+uploaded before it existed. API requests serve those images without a
+placeholder until then.
+
+Usage:
+    python manage.py build_image_metadata
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from wagtail.images import get_image_model
+
+from core.image_metadata import update_image_metadata
+from core.models import ImageMetadata
+
+
+class Command(BaseCommand):
+    help = "Compute stored metadata for images that are missing it"
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        current = {
+            image_id: source_file
+            for image_id, source_file in ImageMetadata.objects.values_list('image_id', 'source_file')
+        }
+
+        built = 0
+        for image in get_image_model().objects.iterator():
+            if current.get(image.pk) != image.file.name:
+                update_image_metadata(image)
+                built += 1
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Computed metadata for {built} images in {elapsed:.1f}s"
+        ))
@@ -0,0 +1,38 @@
+"""
+Build the stored API snapshot of every live page.
+
+Snapshots are normally built when a page is published (see core.snapshots);
+run this after deploying to backfill pages published before snapshots
+existed, or after changing BASE_URL.
+
+Usage:
+    python manage.py build_page_snapshots
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from wagtail.models import Page
+
+from core.models import PageSnapshot
+from core.snapshots import build_page_snapshot
+
+
+class Command(BaseCommand):
+    help = "Build stored API snapshots for every live page"
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        built = 0
+
+        for page in Page.objects.live().specific().iterator():
+            if build_page_snapshot(page) is not None:
+                built += 1
+
+        # Pages unpublished while snapshots were disabled
+        stale, _ = PageSnapshot.objects.filter(page__live=False).delete()
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Built {built} page snapshots in {elapsed:.1f}s ({stale} stale removed)"
+        ))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_remove_sitesettings_copyright_text_and_more'),
+        ('wagtailimages', '0027_image_description'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageMetadata',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_file', models.CharField(help_text='Image file the metadata was computed from', max_length=255)),
+                ('placeholder', models.TextField(blank=True, help_text='Tiny blurred preview as a base64 data URI (LQIP)')),
+                ('dominant_color', models.CharField(blank=True, help_text="Average colour of the image (e.g., '#a0b1c2')", max_length=7)),
+                ('image', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='metadata', to='wagtailimages.image')),
+            ],
+            options={
+                'verbose_name': 'Image Metadata',
+                'verbose_name_plural': 'Image Metadata',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_imagemetadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagemetadata',
+            name='file_url',
+            field=models.CharField(blank=True, help_text='URL of the original file, as returned by the storage backend', max_length=1000),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_imagemetadata_file_url'),
+        ('wagtailcore', '0095_groupsitepermission'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PageSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('revision_id', models.PositiveIntegerField(blank=True, help_text='Live revision the snapshot was built from', null=True)),
+                ('base_url', models.CharField(help_text='Base URL used for absolute links in the snapshot', max_length=255)),
+                ('data', models.JSONField(default=dict, help_text='Serialized API fields keyed by field name')),
+                ('built_at', models.DateTimeField(auto_now=True)),
+                ('page', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='snapshot', to='wagtailcore.page')),
+            ],
+            options={
+                'verbose_name': 'Page Snapshot',
+            },
+        ),
+        migrations.CreateModel(
+            name='PageSnapshotDependency',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.CharField(db_index=True, max_length=255)),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dependencies', to='core.pagesnapshot')),
+            ],
+            options={
+                'unique_together': {('snapshot', 'tag')},
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:40
+
+from django.db import migrations
+
+
+def fill_file_urls(apps, schema_editor):
+    # Rows computed before file_url existed; the storage only builds the URL,
+    # no file is read. Rows whose source_file was cleared by an earlier
+    # version of 0004 describe the current file and get it back.
+    ImageMetadata = apps.get_model('core', 'ImageMetadata')
+    for metadata in ImageMetadata.objects.filter(file_url='').select_related('image').iterator():
+        metadata.file_url = metadata.image.file.url
+        metadata.source_file = metadata.source_file or metadata.image.file.name
+        metadata.save(update_fields=['file_url', 'source_file'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_pagesnapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_file_urls, migrations.RunPython.noop),
+    ]
@@ -180,8 +180,10 @@ class HeroAbstract(models.Model):
         
         # Add image data
         if self.image:
+            from core.image_metadata import get_image_file_url
+            
             data['background_image'] = {
-                'url': f"{base_url}{self.image.file.url}",
+                'url': f"{base_url}{get_image_file_url(self.image)}",
                 'alt': self.image.title,
                 'width': self.image.width,
                 'height': self.image.height,
@@ -365,3 +367,109 @@ class SiteSettings(BaseSiteSetting):
     class Meta:
         verbose_name = "Site Settings"
 
+
+
+class ImageMetadata(models.Model):
+    """
+    Precomputed data served alongside every image in API payloads.
+    
+    Computed once when an image file is uploaded or replaced, so API
+    responses never have to open the original file or ask the storage
+    backend for its URL.
+    """
+    
+    image = models.OneToOneField(
+        Image,
+        on_delete=models.CASCADE,
+        related_name='metadata',
+    )
+    
+    source_file = models.CharField(
+        max_length=255,
+        help_text="Image file the metadata was computed from"
+    )
+    
+    file_url = models.CharField(
+        max_length=1000,
+        blank=True,
+        help_text="URL of the original file, as returned by the storage backend"
+    )
+    
+    placeholder = models.TextField(
+        blank=True,
+        help_text="Tiny blurred preview as a base64 data URI (LQIP)"
+    )
+    
+    dominant_color = models.CharField(
+        max_length=7,
+        blank=True,
+        help_text="Average colour of the image (e.g., '#a0b1c2')"
+    )
+    
+    class Meta:
+        verbose_name = "Image Metadata"
+        verbose_name_plural = "Image Metadata"
+    
+    def __str__(self):
+        return f"Metadata for {self.image}"
+
+
+class PageSnapshot(models.Model):
+    """
+    Serialized API fields of a live page, stored when the page is published.
+    
+    The Pages API serves these values instead of computing them on every
+    request, so read latency does not depend on how complex the page is.
+    Snapshots are rebuilt whenever something listed in their dependencies
+    (an image, a linked page, a snippet model) changes.
+    """
+    
+    page = models.OneToOneField(
+        Page,
+        on_delete=models.CASCADE,
+        related_name='snapshot',
+    )
+    
+    revision_id = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Live revision the snapshot was built from"
+    )
+    
+    base_url = models.CharField(
+        max_length=255,
+        help_text="Base URL used for absolute links in the snapshot"
+    )
+    
+    data = models.JSONField(
+        default=dict,
+        help_text="Serialized API fields keyed by field name"
+    )
+    
+    built_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Page Snapshot"
+    
+    def __str__(self):
+        return f"Snapshot of {self.page}"
+
+
+class PageSnapshotDependency(models.Model):
+    """
+    A cache tag (see core.cache) that a page snapshot was built from.
+    """
+    
+    snapshot = models.ForeignKey(
+        PageSnapshot,
+        on_delete=models.CASCADE,
+        related_name='dependencies',
+    )
+    
+    tag = models.CharField(max_length=255, db_index=True)
+    
+    class Meta:
+        unique_together = [('snapshot', 'tag')]
+    
+    def __str__(self):
+        return self.tag
@@ -0,0 +1,232 @@
+"""
+Page URL Routing Table for Wagtail Headless CMS
+
+``page.url`` looks up the site root paths and rebuilds the URL from
+``url_path`` on every access. Instead, every page's URL is kept in a
+page-id -> URL map in the cache, updated when pages are published, moved,
+renamed or deleted (see core.signals). A Site change starts a new map
+version, so all URLs are rebuilt lazily.
+
+PageURLResolver reads a whole payload's links from the map with one cache
+lookup, and computes the misses with a single site-root-path lookup and at
+most one page query.
+
+Usage:
+    page_urls = PageURLResolver()
+    page_urls.add(page_id)
+    page_urls.resolve()
+    page_urls.get_url(page_id)          # '/about/'
+    page_urls.get_link(page)            # {'id', 'title', 'url'}
+
+    get_page_url(page)                  # single lookup
+"""
+
+import logging
+import time
+
+from django.core.cache import cache
+from wagtail.models import Page
+
+
+logger = logging.getLogger(__name__)
+
+PAGE_URL_VERSION_KEY = 'page-url-version'
+
+
+def get_page_url_version():
+    """
+    Return the current version of the URL map.
+
+    Returns:
+        float: Timestamp of the last Site change (or of the first lookup)
+    """
+    version = cache.get(PAGE_URL_VERSION_KEY)
+    if version is None:
+        version = time.time()
+        cache.set(PAGE_URL_VERSION_KEY, version, None)
+    return version
+
+
+def _page_url_key(page_id, version):
+    return f"page-url:{version}:{page_id}"
+
+
+def invalidate_page_urls():
+    """Start a new URL map; every URL is recomputed on its next lookup."""
+    cache.set(PAGE_URL_VERSION_KEY, time.time(), None)
+
+
+def refresh_page_urls(pages):
+    """
+    Recompute and store the URLs of the given pages.
+
+    Args:
+        pages (iterable): Page objects (e.g. a moved page and its descendants)
+
+    Returns:
+        dict: URL keyed by page id
+    """
+    page_urls = PageURLResolver()
+    urls = {page.pk: page_urls.compute_url(page) for page in pages}
+
+    version = get_page_url_version()
+    cache.set_many({_page_url_key(page_id, version): url for page_id, url in urls.items()}, None)
+    return urls
+
+
+def forget_page_urls(*page_ids):
+    """
+    Drop pages (e.g. deleted ones) from the URL map.
+
+    Args:
+        *page_ids (int): Page ids
+    """
+    version = get_page_url_version()
+    cache.delete_many([_page_url_key(page_id, version) for page_id in page_ids])
+
+
+def get_page_url(page, default=None):
+    """
+    Return a page's URL from the URL map.
+
+    Args:
+        page: Page object or page id
+        default: Value returned when the page has no URL
+
+    Returns:
+        str: Page URL (site-relative for single-site setups)
+    """
+    return PageURLResolver().get_url(page, default)
+
+
+class PageURLResolver:
+    """
+    Resolves URLs of linked pages through the URL map.
+
+    URLs missing from the map are computed with the resolver acting as
+    Wagtail's site-root-path cache object (it is passed as ``request`` to
+    ``page.get_url_parts()``), so Site.get_site_root_paths() runs once per
+    resolver, and are written back to the map.
+
+    Every linked page is recorded in ``dependencies`` (as a core.cache page
+    tag), so payloads showing its URL are invalidated when it is renamed or
+    moved.
+
+    Args:
+        dependencies (set): Set to record tags in (e.g. a
+            RenditionResolver's); a new set by default
+    """
+
+    def __init__(self, dependencies=None):
+        self.dependencies = set() if dependencies is None else dependencies
+        self._pages = {}
+        self._urls = {}
+
+    def add(self, *pages):
+        """
+        Register linked pages.
+
+        Args:
+            *pages: Page objects or page ids (empty values are ignored)
+        """
+        # core.cache imports this module through core.renditions
+        from core.cache import page_tag
+
+        for page in pages:
+            if not page:
+                continue
+            if isinstance(page, Page):
+                self._pages[page.pk] = page
+            else:
+                self._pages.setdefault(int(page), None)
+            self.dependencies.add(page_tag(page.pk if isinstance(page, Page) else int(page)))
+
+    def resolve(self):
+        """
+        Look up every pending URL in the map (one cache lookup), loading and
+        computing the misses (one page query).
+        """
+        pending = [page_id for page_id in self._pages if page_id not in self._urls]
+        if not pending:
+            return self
+
+        version = get_page_url_version()
+        keys = {_page_url_key(page_id, version): page_id for page_id in pending}
+        for key, url in cache.get_many(list(keys)).items():
+            self._urls[keys[key]] = url
+
+        missed = [page_id for page_id in pending if page_id not in self._urls]
+        to_load = [page_id for page_id in missed if self._pages[page_id] is None]
+        if to_load:
+            for page in Page.objects.filter(pk__in=to_load).only('id', 'title', 'url_path'):
+                self._pages[page.pk] = page
+
+        fresh = {}
+        for page_id in missed:
+            page = self._pages[page_id]
+            if page is not None:
+                self._urls[page_id] = fresh[_page_url_key(page_id, version)] = self.compute_url(page)
+        if fresh:
+            cache.set_many(fresh, None)
+
+        return self
+
+    def compute_url(self, page):
+        """Compute ``page.url`` without the URL map, sharing the site root paths."""
+        try:
+            url_parts = page.get_url_parts(request=self)
+        except Exception:
+            logger.exception("Could not resolve the URL of page %s", page.pk)
+            return None
+
+        if url_parts is None or url_parts[1] is None and url_parts[2] is None:
+            return None
+
+        site_id, root_url, page_path = url_parts
+        num_sites = len({root_path[0] for root_path in page._get_site_root_paths(self)})
+        return page_path if num_sites == 1 else root_url + page_path
+
+    def get_url(self, page, default=None):
+        """
+        Return the URL of a page.
+
+        Pages that were not registered before ``resolve()`` are looked up on
+        demand and remembered.
+
+        Args:
+            page: Page object or page id
+            default: Value returned when the page has no URL
+
+        Returns:
+            str: Page URL (site-relative for single-site setups)
+        """
+        page_id = page.pk if isinstance(page, Page) else int(page)
+        if page_id not in self._urls:
+            self.add(page)
+            self.resolve()
+        url = self._urls.get(page_id)
+        return url if url is not None else default
+
+    def get_link(self, page):
+        """
+        Serialize a linked page as ``{'id', 'title', 'url'}``.
+
+        Args:
+            page: Page object or page id
+
+        Returns:
+            dict or None: None when the page does not exist
+        """
+        if not page:
+            return None
+
+        if not isinstance(page, Page):
+            page_id = int(page)
+            page = self._pages.get(page_id)
+            if page is None:
+                page = Page.objects.filter(pk=page_id).only('id', 'title', 'url_path').first()
+                if page is None:
+                    return None
+                self._pages[page_id] = page
+
+        return {'id': page.id, 'title': page.title, 'url': self.get_url(page)}
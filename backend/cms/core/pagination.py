@@ -0,0 +1,286 @@
+"""
+Keyset (Cursor) Pagination for Wagtail Headless CMS
+
+Offset pagination re-reads every skipped row and needs a COUNT(*) per
+request. Keyset pagination remembers the sort key of the last row served
+in an opaque cursor and continues with ``WHERE (keys) > (cursor)``, which
+an index on the sort keys answers directly however deep the page is.
+
+Orderings are ordinary ``order_by()`` arguments (field names, optionally
+prefixed with '-', or ``F(...).asc/desc(nulls_last=True)``); the primary
+key is appended as a tie-breaker so every position is unique.
+
+Usage:
+    ordering = with_tiebreaker(['name'])                 # ['name', 'pk']
+    rows, next_cursor = paginate_by_cursor(queryset, ordering, cursor, limit)
+
+The Pages API accepts ``?cursor=`` (empty for the first page) in place of
+``offset`` and ``?count=false`` to skip the total count.
+"""
+
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from django.db.models.expressions import OrderBy
+from rest_framework.response import Response
+from wagtail.api.v2.pagination import WagtailPagination
+from wagtail.api.v2.utils import BadRequestError
+
+
+def encode_cursor(values):
+    """
+    Encode the sort key of a row as an opaque, URL-safe cursor.
+
+    Args:
+        values (list): Sort key values (see get_keyset_values)
+
+    Returns:
+        str: Cursor
+    """
+    raw = json.dumps(list(values), cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor made by encode_cursor().
+
+    Args:
+        cursor (str): Cursor from a previous response
+
+    Returns:
+        list: Sort key values
+
+    Raises:
+        BadRequestError: The cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeError, binascii.Error):
+        raise BadRequestError("cursor is invalid")
+
+    if not isinstance(values, list):
+        raise BadRequestError("cursor is invalid")
+    return values
+
+
+def parse_count_parameter(request_or_params, name='count'):
+    """
+    Whether a total count was requested (``?count=false`` turns it off).
+
+    Args:
+        request_or_params: Django request or query parameter mapping
+        name (str): Parameter name
+
+    Returns:
+        bool
+    """
+    params = getattr(request_or_params, 'GET', request_or_params)
+    return str(params.get(name, 'true')).lower() not in ('false', '0', 'no')
+
+
+def get_ordering_keys(ordering):
+    """
+    Normalize ``order_by()`` arguments to ``(field, descending, nulls_last)``.
+
+    Args:
+        ordering (list): Field names ('-name') or F(...).asc()/desc() expressions
+
+    Returns:
+        list: Tuples (field name, descending, nulls_last)
+
+    Raises:
+        BadRequestError: The ordering cannot be paginated with a cursor
+    """
+    keys = []
+    for item in ordering:
+        if isinstance(item, str):
+            if item == '?':
+                raise BadRequestError("random ordering cannot be used with a cursor")
+            keys.append((item.lstrip('-'), item.startswith('-'), False))
+        elif isinstance(item, OrderBy) and isinstance(item.expression, F):
+            keys.append((item.expression.name, item.descending, bool(item.nulls_last)))
+        else:
+            raise BadRequestError("this ordering cannot be used with a cursor")
+    return keys
+
+
+def with_tiebreaker(ordering):
+    """Append the primary key to an ordering unless it already ends with it."""
+    ordering = list(ordering)
+    names = [key[0] for key in get_ordering_keys(ordering)]
+    if not names or names[-1] not in ('pk', 'id'):
+        ordering.append('pk')
+    return ordering
+
+
+def get_keyset_values(ordering, row):
+    """
+    Read the sort key of a row.
+
+    Args:
+        ordering (list): Ordering ending with the primary key (see with_tiebreaker)
+        row: Model instance, dict or tuple (tuples in ordering order)
+
+    Returns:
+        list: Key values
+    """
+    names = [key[0] for key in get_ordering_keys(ordering)]
+    if isinstance(row, (tuple, list)):
+        return list(row[:len(names)])
+    if isinstance(row, dict):
+        return [row[name] for name in names]
+
+    values = []
+    for name in names:
+        if name == 'pk':
+            values.append(row.pk)
+        else:
+            values.append(row._meta.get_field(name).value_from_object(row))
+    return values
+
+
+def _after(name, descending, nulls_last, value):
+    """Rows strictly after ``value`` on one key."""
+    if value is None:
+        # Only nulls-last keys hold None, and nothing sorts after the nulls
+        return Q(pk__in=[])
+    after = Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+    if nulls_last:
+        after |= Q(**{f"{name}__isnull": True})
+    return after
+
+
+def _equal(name, value):
+    if value is None:
+        return Q(**{f"{name}__isnull": True})
+    return Q(**{name: value})
+
+
+def keyset_filter(ordering, values):
+    """
+    Build the filter selecting rows after a cursor position.
+
+    For keys (k1, k2, k3) this is ``k1 > v1 OR (k1 = v1 AND k2 > v2) OR
+    (k1 = v1 AND k2 = v2 AND k3 > v3)``, with > and < swapped for
+    descending keys.
+
+    Args:
+        ordering (list): Ordering ending with the primary key
+        values (list): Key values of the last row served
+
+    Returns:
+        Q
+    """
+    keys = get_ordering_keys(ordering)
+    if len(values) != len(keys):
+        raise BadRequestError("cursor does not match the ordering")
+
+    condition = Q(pk__in=[])
+    equal = Q()
+    for (name, descending, nulls_last), value in zip(keys, values):
+        condition |= equal & _after(name, descending, nulls_last, value)
+        equal &= _equal(name, value)
+    return condition
+
+
+def paginate_by_cursor(queryset, ordering, cursor, limit):
+    """
+    Return one keyset page of a queryset.
+
+    Args:
+        queryset: QuerySet (its ordering is replaced by ``ordering``)
+        ordering (list): Ordering ending with the primary key
+        cursor (str): Cursor of the previous page, or '' for the first page
+        limit (int): Page size
+
+    Returns:
+        tuple: (rows, next cursor or None)
+
+    Raises:
+        BadRequestError: The cursor is malformed or its values do not fit
+            the ordering's fields
+    """
+    if cursor:
+        # Well-formed cursors can still hold values of the wrong type
+        try:
+            queryset = queryset.filter(keyset_filter(ordering, decode_cursor(cursor)))
+        except (ValueError, TypeError, ValidationError):
+            raise BadRequestError("cursor is invalid")
+
+    rows = list(queryset.order_by(*ordering)[:limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(get_keyset_values(ordering, rows[-1]))
+
+
+class CursorPagination(WagtailPagination):
+    """
+    Wagtail API pagination with an optional keyset mode.
+
+    ``?cursor=`` (empty for the first page, then the ``next_cursor`` of the
+    previous response) pages by the listing's ordering instead of
+    ``offset``; ``?count=false`` leaves out ``total_count`` in either mode,
+    so no COUNT(*) query runs.
+    """
+
+    query_parameters = frozenset(['cursor', 'count'])
+
+    def get_offset_and_limit(self, request):
+        """Validate ``offset`` and ``limit`` the way WagtailPagination does."""
+        limit_max = getattr(settings, 'WAGTAILAPI_LIMIT_MAX', 20)
+
+        try:
+            offset = int(request.GET.get('offset', 0))
+            if offset < 0:
+                raise ValueError()
+        except ValueError:
+            raise BadRequestError("offset must be a positive integer")
+
+        try:
+            limit_default = 20 if not limit_max else min(20, limit_max)
+            limit = int(request.GET.get('limit', limit_default))
+            if limit < 0:
+                raise ValueError()
+        except ValueError:
+            raise BadRequestError("limit must be a positive integer")
+
+        if limit_max and limit > limit_max:
+            raise BadRequestError("limit cannot be higher than %d" % limit_max)
+
+        return offset, limit
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.view = view
+        self.cursor_mode = 'cursor' in request.GET
+        self.next_cursor = None
+        offset, limit = self.get_offset_and_limit(request)
+        self.total_count = queryset.count() if parse_count_parameter(request) else None
+
+        if not self.cursor_mode:
+            return queryset[offset:offset + limit]
+
+        if 'offset' in request.GET:
+            raise BadRequestError("cursor and offset cannot be combined")
+        if 'search' in request.GET:
+            raise BadRequestError("cursor cannot be used with search")
+
+        ordering = with_tiebreaker(queryset.query.order_by or queryset.model._meta.ordering)
+        rows, self.next_cursor = paginate_by_cursor(queryset, ordering, request.GET['cursor'], limit)
+        return rows
+
+    def get_paginated_response(self, data):
+        meta = OrderedDict()
+        if self.total_count is not None:
+            meta['total_count'] = self.total_count
+        if self.cursor_mode:
+            meta['next_cursor'] = self.next_cursor
+        return Response(OrderedDict([('meta', meta), ('items', data)]))
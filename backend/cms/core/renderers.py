@@ -0,0 +1,73 @@
+"""
+Fast JSON Rendering for the Headless API
+
+An orjson-backed DRF renderer (and matching ``dumps``) used by the API v2
+endpoints and the site settings endpoint. Output matches Django's
+JsonResponse encoding: Decimals, dates and times, UUIDs and lazy
+translation strings go through DjangoJSONEncoder, and RichText values are
+rendered to HTML. Falls back to the standard json module when orjson is
+not installed.
+"""
+
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+from wagtail.rich_text import RichText
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class APIJSONEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder that also renders Wagtail RichText values."""
+    
+    def default(self, obj):
+        if isinstance(obj, RichText):
+            return str(obj)
+        return super().default(obj)
+
+
+_encoder = APIJSONEncoder()
+
+if orjson is not None:
+    # Datetimes are passed through so they are formatted like JsonResponse
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(data):
+    """
+    Encode data as compact UTF-8 JSON.
+    
+    Args:
+        data: JSON-serializable data (plus Decimal, datetime, lazy strings, RichText)
+        
+    Returns:
+        bytes: Encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_encoder.default, option=ORJSON_OPTIONS)
+    
+    return json.dumps(
+        data, cls=APIJSONEncoder, ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
+
+
+class FastJSONRenderer(BaseRenderer):
+    """
+    DRF renderer using ``dumps`` (orjson when available).
+    
+    Usage:
+        renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    """
+    
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return dumps(data)
@@ -0,0 +1,36 @@
+"""
+Entry Points for Rendition Worker Processes
+
+Spawned workers unpickle the functions they run by importing their
+module before Django is set up, so this module must not import models
+(or anything that does) at import time; see core.renditions for the pool.
+"""
+
+
+def init_worker():
+    """Configure Django inside a freshly spawned worker process."""
+    import django
+
+    django.setup()
+
+
+def generate_renditions(image_id, specs):
+    """
+    Fetch or create renditions for one image (runs inside a worker).
+
+    Args:
+        image_id (int): Primary key of the Wagtail image
+        specs (list): Rendition specifications
+
+    Returns:
+        int: Number of renditions now available for the image
+    """
+    from wagtail.images import get_image_model
+
+    Image = get_image_model()
+    try:
+        image = Image.objects.get(pk=image_id)
+    except Image.DoesNotExist:
+        return 0
+
+    return len(image.get_renditions(*specs))
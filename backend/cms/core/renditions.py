@@ -0,0 +1,215 @@
+"""
+Bulk Rendition Resolution for Wagtail Headless CMS
+
+Collects every (image, filter spec) pair needed by a payload up front and
+fetches the matching renditions in a single query, instead of one query
+per ``image.get_rendition()`` call.
+
+Also runs ahead-of-time rendition generation in a process pool, so the
+first visitor after an upload or publish does not pay for it.
+
+Usage:
+    renditions = RenditionResolver()
+    renditions.add(image, 'fill-400x300', 'fill-800x600')
+    renditions.resolve()
+    renditions.get(image, 'fill-400x300').url
+
+    enqueue_renditions(image.pk, ['fill-400x300'])
+"""
+
+import atexit
+import logging
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from wagtail.images import get_image_model
+
+from core.image_metadata import prefetch_image_metadata
+from core.page_urls import PageURLResolver
+from core.rendition_workers import generate_renditions, init_worker
+
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+class RenditionResolver:
+    """
+    Batches rendition lookups for many images.
+
+    ``add()`` registers the specs an image will need, ``resolve()`` loads all
+    existing renditions in one query (creating any missing ones), and
+    ``get()`` returns the rendition for an (image, spec) pair.
+
+    Also carries the payload's PageURLResolver as ``page_urls``, so block
+    serializers resolve page links with a shared site-root-path lookup; the
+    linked pages are recorded in ``dependencies``.
+    """
+
+    def __init__(self):
+        # Extra cache tags (e.g. linked pages) of the payload being built
+        self.dependencies = set()
+        self.page_urls = PageURLResolver(self.dependencies)
+        self._images = {}
+        # Other instances of registered images (e.g. the same image chosen
+        # in several blocks), which share the first instance's metadata
+        self._copies = defaultdict(list)
+        self._specs = defaultdict(dict)
+        self._renditions = {}
+        self._with_metadata = set()
+
+    @property
+    def image_ids(self):
+        """Primary keys of every image registered with this resolver."""
+        return list(self._images)
+
+    @property
+    def specs_by_image(self):
+        """Registered specs keyed by image primary key."""
+        return {image_id: list(specs) for image_id, specs in self._specs.items()}
+
+    def add(self, image, *specs):
+        """
+        Register filter specs required for an image.
+
+        Args:
+            image: Wagtail Image object (ignored if empty)
+            *specs (str): Rendition specifications (e.g., 'fill-400x300')
+        """
+        if not image:
+            return
+
+        if self._images.setdefault(image.pk, image) is not image:
+            self._copies[image.pk].append(image)
+        for spec in specs:
+            self._specs[image.pk].setdefault(spec, None)
+
+    def resolve(self):
+        """
+        Fetch or create every registered rendition.
+
+        Existing renditions for all images are loaded with one query and
+        attached to each image as its prefetched renditions, so Wagtail only
+        touches the database again for renditions that still need creating.
+        Placeholder metadata for the images is loaded with a second query
+        (and shared with other instances of the same image), and page links
+        registered with ``page_urls`` are resolved too.
+        """
+        new_images = [
+            image for image_id, image in self._images.items() if image_id not in self._with_metadata
+        ]
+        if new_images:
+            prefetch_image_metadata(new_images)
+            self._with_metadata.update(image.pk for image in new_images)
+        for image_id, copies in self._copies.items():
+            for copy in copies:
+                copy.metadata = self._images[image_id].metadata
+        self._copies.clear()
+
+        self.page_urls.resolve()
+
+        pending = {
+            image_id: [spec for spec in specs if (image_id, spec) not in self._renditions]
+            for image_id, specs in self._specs.items()
+        }
+        pending = {image_id: specs for image_id, specs in pending.items() if specs}
+        if not pending:
+            return self
+
+        Rendition = get_image_model().get_rendition_model()
+        all_specs = {spec for specs in pending.values() for spec in specs}
+
+        prefetched = defaultdict(list)
+        for rendition in Rendition.objects.filter(
+            image_id__in=list(pending), filter_spec__in=all_specs
+        ):
+            prefetched[rendition.image_id].append(rendition)
+
+        for image_id, specs in pending.items():
+            image = self._images[image_id]
+            image.prefetched_renditions = prefetched[image_id]
+            renditions = image.get_renditions(*specs).values()
+            for spec, rendition in zip(specs, renditions):
+                self._renditions[(image_id, spec)] = rendition
+
+        return self
+
+    def get(self, image, spec):
+        """
+        Return the rendition of ``image`` for ``spec``.
+
+        Pairs that were not registered before ``resolve()`` fall back to a
+        regular ``image.get_rendition()`` call and are remembered afterwards.
+        """
+        key = (image.pk, spec)
+        if key not in self._renditions:
+            self._images.setdefault(image.pk, image)
+            self._renditions[key] = image.get_rendition(spec)
+        return self._renditions[key]
+
+
+def create_rendition_executor(max_workers):
+    """
+    Create a process pool for rendition generation.
+
+    Workers are spawned rather than forked so they never share the parent's
+    database connections; the functions they run live in
+    core.rendition_workers, which loads before Django is set up.
+
+    Args:
+        max_workers (int): Number of worker processes
+
+    Returns:
+        ProcessPoolExecutor
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=init_worker,
+    )
+
+
+def get_rendition_executor():
+    """
+    Return the shared rendition process pool, creating it on first use.
+
+    Returns:
+        ProcessPoolExecutor: Pool sized by settings.RENDITION_WORKERS
+    """
+    global _executor
+
+    if _executor is None:
+        _executor = create_rendition_executor(getattr(settings, 'RENDITION_WORKERS', 2))
+        atexit.register(_executor.shutdown, wait=False, cancel_futures=True)
+
+    return _executor
+
+
+def _log_failure(future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Rendition generation failed: %s", future.exception())
+
+
+def enqueue_renditions(image_id, specs):
+    """
+    Queue rendition generation for an image on the worker pool.
+
+    Does nothing when settings.RENDITION_WORKERS is 0.
+
+    Args:
+        image_id (int): Primary key of the Wagtail image
+        specs (iterable): Rendition specifications
+
+    Returns:
+        Future or None
+    """
+    specs = sorted(set(specs))
+    if not specs or not getattr(settings, 'RENDITION_WORKERS', 2):
+        return None
+
+    future = get_rendition_executor().submit(generate_renditions, image_id, specs)
+    future.add_done_callback(_log_failure)
+    return future
@@ -0,0 +1,202 @@
+"""
+Signal handlers for Core App - API cache invalidation, image metadata and page snapshots
+"""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from wagtail.documents import get_document_model
+from wagtail.images import get_image_model
+from wagtail.models import Page, Site
+from wagtail.signals import page_published, page_slug_changed, page_unpublished, post_page_move
+
+from core.cache import (
+    bump_content_version,
+    bump_dependency_versions,
+    document_tag,
+    image_tag,
+    model_tag,
+    page_tag,
+)
+from core.models import PageSnapshot, SiteSettings
+from core.image_metadata import update_image_metadata
+from core.page_urls import forget_page_urls, invalidate_page_urls, refresh_page_urls
+from core.site_settings import (
+    invalidate_site_settings_payload,
+    refresh_site_settings_payload,
+    site_settings_payload_links_page,
+)
+from core.snapshots import refresh_page_snapshots
+
+
+def _bump_versions(tags):
+    bump_dependency_versions(*tags)
+    bump_content_version()
+
+
+def bump_versions_on_commit(*tags):
+    """
+    Bump the content version and the versions of ``tags`` once the current
+    transaction commits (bumped earlier, a concurrent request could cache
+    the old rows under the new versions).
+    """
+    transaction.on_commit(partial(_bump_versions, tags))
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+def invalidate_page_payloads(sender, instance, **kwargs):
+    """Drop cached API payloads of (or linking to) a page when it is published or unpublished."""
+    bump_versions_on_commit(page_tag(instance.pk))
+
+
+@receiver(post_save, sender=get_image_model())
+@receiver(post_delete, sender=get_image_model())
+def invalidate_image_payloads(sender, instance, **kwargs):
+    """Drop cached API payloads that reference a changed or deleted image."""
+    bump_versions_on_commit(image_tag(instance.pk))
+
+
+@receiver(post_save, sender=get_document_model())
+@receiver(post_delete, sender=get_document_model())
+def invalidate_document_payloads(sender, instance, **kwargs):
+    """Drop cached API payloads that link to a changed or deleted document."""
+    bump_versions_on_commit(document_tag(instance.pk))
+
+
+@receiver(post_save, sender=get_image_model())
+def compute_image_placeholder(sender, instance, update_fields=None, **kwargs):
+    """Compute the placeholder preview when an image file is uploaded or replaced."""
+    if update_fields is None or 'file' in update_fields:
+        update_image_metadata(instance)
+
+
+@receiver(page_slug_changed)
+@receiver(post_page_move)
+def invalidate_moved_page_payloads(sender, instance, **kwargs):
+    """A renamed or moved page and its descendants have new URLs; drop payloads linking to them."""
+    tags = [
+        page_tag(page_id)
+        for page_id in instance.get_descendants(inclusive=True).values_list('pk', flat=True)
+    ]
+    bump_versions_on_commit(*tags)
+
+
+@receiver(post_delete, sender=Page)
+def invalidate_deleted_page_payloads(sender, instance, **kwargs):
+    """Drop payloads linking to a deleted page."""
+    bump_versions_on_commit(page_tag(instance.pk))
+
+
+def _refresh_subtree_urls(page_id):
+    page = Page.objects.filter(pk=page_id).first()
+    if page is not None:
+        refresh_page_urls(page.get_descendants(inclusive=True))
+
+
+@receiver(page_published)
+def refresh_published_page_url(sender, instance, **kwargs):
+    """Store the URL of a published page in the URL map."""
+    transaction.on_commit(partial(refresh_page_urls, [instance]))
+
+
+@receiver(page_slug_changed)
+@receiver(post_page_move)
+def refresh_subtree_urls(sender, instance, **kwargs):
+    """A renamed or moved page and its descendants have new URLs."""
+    transaction.on_commit(partial(_refresh_subtree_urls, instance.pk))
+
+
+@receiver(post_delete, sender=Page)
+def forget_deleted_page_url(sender, instance, **kwargs):
+    """Drop a deleted page from the URL map."""
+    forget_page_urls(instance.pk)
+
+
+@receiver(post_save, sender=Site)
+@receiver(post_delete, sender=Site)
+def invalidate_site_page_urls(sender, **kwargs):
+    """Site root pages and hostnames decide every URL; start a new URL map."""
+    invalidate_page_urls()
+
+
+@receiver(post_save, sender=Site)
+@receiver(post_delete, sender=Site)
+def invalidate_site_payloads(sender, **kwargs):
+    """Drop every payload and block built with the previous page URLs."""
+    bump_versions_on_commit(model_tag(Site))
+
+
+def refresh_snapshots_on_commit(page_ids=(), tags=()):
+    """Rebuild the affected page snapshots once the current transaction commits."""
+    transaction.on_commit(partial(refresh_page_snapshots, list(page_ids), list(tags)))
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+def refresh_published_page_snapshot(sender, instance, **kwargs):
+    """Rebuild a page's snapshot (dropped once unpublished) and the snapshots linking to it."""
+    refresh_snapshots_on_commit(page_ids=[instance.pk], tags=[page_tag(instance.pk)])
+
+
+@receiver(post_save, sender=get_image_model())
+@receiver(post_delete, sender=get_image_model())
+def refresh_image_snapshots(sender, instance, **kwargs):
+    """Rebuild the snapshots of pages that show a changed or deleted image."""
+    refresh_snapshots_on_commit(tags=[image_tag(instance.pk)])
+
+
+@receiver(post_save, sender=get_document_model())
+@receiver(post_delete, sender=get_document_model())
+def refresh_document_snapshots(sender, instance, **kwargs):
+    """Rebuild the snapshots of pages that link to a changed or deleted document."""
+    refresh_snapshots_on_commit(tags=[document_tag(instance.pk)])
+
+
+@receiver(page_slug_changed)
+@receiver(post_page_move)
+def refresh_moved_page_snapshots(sender, instance, **kwargs):
+    """Rebuild the snapshots linking to a renamed or moved page or its descendants."""
+    page_ids = instance.get_descendants(inclusive=True).values_list('pk', flat=True)
+    refresh_snapshots_on_commit(tags=[page_tag(page_id) for page_id in page_ids])
+
+
+@receiver(post_delete, sender=Page)
+def refresh_deleted_page_snapshots(sender, instance, **kwargs):
+    """Rebuild the snapshots linking to a deleted page."""
+    refresh_snapshots_on_commit(tags=[page_tag(instance.pk)])
+
+
+@receiver(post_save, sender=Site)
+@receiver(post_delete, sender=Site)
+def refresh_site_snapshots(sender, **kwargs):
+    """Rebuild every snapshot; any of them may link to pages of the changed site."""
+    refresh_snapshots_on_commit(page_ids=PageSnapshot.objects.values_list('page_id', flat=True))
+
+
+def _rebuild_site_settings_payload():
+    try:
+        refresh_site_settings_payload()
+    except Site.DoesNotExist:
+        invalidate_site_settings_payload()
+
+
+@receiver(post_save, sender=SiteSettings)
+@receiver(post_save, sender=Site)
+@receiver(post_delete, sender=Site)
+@receiver(page_slug_changed)
+@receiver(post_page_move)
+def rebuild_site_settings_payload(sender, **kwargs):
+    """Rebuild the site settings payload after settings, sites or the page tree change."""
+    transaction.on_commit(_rebuild_site_settings_payload)
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(post_delete, sender=Page)
+def rebuild_site_settings_for_linked_page(sender, instance, **kwargs):
+    """Rebuild the site settings payload when a page it links to changes."""
+    if site_settings_payload_links_page(instance.pk):
+        transaction.on_commit(_rebuild_site_settings_payload)
@@ -0,0 +1,207 @@
+"""
+Prebuilt Site Settings Payload
+
+Builds the site-settings API payload once (when SiteSettings or a linked
+page changes) and stores it in the cache as a versioned blob, so the
+endpoint can serve it with a single cache lookup.
+
+Cached blob format:
+    {
+        'version': 'sha1 of the payload',   # used as a strong ETag
+        'last_modified': 1700000000.0,      # build timestamp
+        'data': {...},                      # the JSON payload
+        'page_ids': [...],                  # pages linked from menus/footer
+    }
+"""
+
+import hashlib
+import json
+import time
+
+from django.conf import settings as django_settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from wagtail.models import Site
+
+from core.models import SiteSettings
+from core.page_urls import PageURLResolver
+
+
+SITE_SETTINGS_CACHE_KEY = 'site-settings-payload'
+
+SITE_SETTINGS_CACHE_TIMEOUT = getattr(django_settings, 'API_PAYLOAD_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def _page_link(page, page_ids, page_urls):
+    """Resolve a linked page URL and remember it as a dependency."""
+    page_ids.add(page.pk)
+    return page_urls.get_url(page, default='')
+
+
+def build_site_settings_payload(settings):
+    """
+    Serialize site-wide settings (header/footer configuration).
+
+    Args:
+        settings: SiteSettings object
+
+    Returns:
+        tuple: (payload dict, set of linked page ids)
+    """
+    page_ids = set()
+    page_urls = PageURLResolver()
+
+    # Serialize header menu items
+    header_menu = []
+    for menu_item in settings.header_menu_items:
+        item_data = {
+            'label': menu_item.value.get('label', ''),
+            'aria_label': menu_item.value.get('aria_label', ''),
+            'link': menu_item.value.get('link', ''),
+        }
+
+        # Check if page is selected instead of URL
+        if menu_item.value.get('page'):
+            item_data['link'] = _page_link(menu_item.value['page'], page_ids, page_urls)
+
+        # Serialize sub-items
+        sub_items = menu_item.value.get('sub_items', [])
+        if sub_items:
+            item_data['subItems'] = []
+            for sub_item in sub_items:
+                sub_data = {
+                    'label': sub_item.get('label', ''),
+                    'link': sub_item.get('link', ''),
+                }
+                if sub_item.get('page'):
+                    sub_data['link'] = _page_link(sub_item['page'], page_ids, page_urls)
+                item_data['subItems'].append(sub_data)
+
+        header_menu.append(item_data)
+
+    # Serialize footer sections
+    footer_sections = []
+    for section in settings.footer_content:
+        section_data = {
+            'type': section.value.get('section_type', 'columns'),
+        }
+
+        if section.value.get('section_type') == 'columns':
+            columns = section.value.get('columns', [])
+            section_data['columns'] = []
+            for column in columns:
+                column_data = {
+                    'heading': column.get('heading', ''),
+                    'links': []
+                }
+                for link in column.get('links', []):
+                    link_data = {
+                        'text': link.get('text', ''),
+                        'link': link.get('link', ''),
+                    }
+                    if link.get('page'):
+                        link_data['link'] = _page_link(link['page'], page_ids, page_urls)
+                    column_data['links'].append(link_data)
+                section_data['columns'].append(column_data)
+
+        elif section.value.get('section_type') == 'text':
+            section_data['content'] = section.value.get('content', '')
+
+        elif section.value.get('section_type') == 'contact':
+            section_data['contact'] = {
+                'show_email': section.value.get('show_email', True),
+                'show_phone': section.value.get('show_phone', True),
+                'show_address': section.value.get('show_address', True),
+                'email': settings.contact_email,
+                'phone': settings.contact_phone,
+                'address': settings.contact_address,
+            }
+
+        footer_sections.append(section_data)
+
+    # Build social media links
+    social_links = {}
+    if settings.facebook_url:
+        social_links['facebook'] = settings.facebook_url
+    if settings.twitter_url:
+        social_links['twitter'] = settings.twitter_url
+    if settings.instagram_url:
+        social_links['instagram'] = settings.instagram_url
+    if settings.linkedin_url:
+        social_links['linkedin'] = settings.linkedin_url
+    if settings.youtube_url:
+        social_links['youtube'] = settings.youtube_url
+
+    payload = {
+        'header': {
+            'logo_text': settings.header_logo_text,
+            'menu_items': header_menu,
+        },
+        'footer': {
+            'sections': footer_sections,
+            'copyright': settings.footer_copyright,
+        },
+        'contact': {
+            'email': settings.contact_email,
+            'phone': settings.contact_phone,
+            'address': settings.contact_address,
+        },
+        'social': social_links,
+    }
+
+    return payload, page_ids
+
+
+def refresh_site_settings_payload():
+    """
+    Rebuild the default site's settings payload and store it in the cache.
+
+    Returns:
+        dict: The cached blob ('version', 'last_modified', 'data', 'page_ids')
+    """
+    site = Site.objects.get(is_default_site=True)
+    payload, page_ids = build_site_settings_payload(SiteSettings.for_site(site))
+
+    data = json.loads(json.dumps(payload, cls=DjangoJSONEncoder))
+    encoded = json.dumps(data, sort_keys=True)
+    blob = {
+        'version': hashlib.sha1(encoded.encode('utf-8')).hexdigest(),
+        'last_modified': time.time(),
+        'data': data,
+        'page_ids': sorted(page_ids),
+    }
+
+    cache.set(SITE_SETTINGS_CACHE_KEY, blob, SITE_SETTINGS_CACHE_TIMEOUT)
+    return blob
+
+
+def get_site_settings_payload():
+    """
+    Return the cached site settings blob, building it on a cache miss.
+
+    Returns:
+        dict: The cached blob ('version', 'last_modified', 'data', 'page_ids')
+    """
+    blob = cache.get(SITE_SETTINGS_CACHE_KEY)
+    if blob is None:
+        blob = refresh_site_settings_payload()
+    return blob
+
+
+def site_settings_payload_links_page(page_id):
+    """
+    Check whether the cached blob links to a page.
+
+    Args:
+        page_id (int): Page id
+
+    Returns:
+        bool: True if the cached payload resolves this page's URL
+    """
+    blob = cache.get(SITE_SETTINGS_CACHE_KEY)
+    return blob is not None and page_id in blob['page_ids']
+
+
+def invalidate_site_settings_payload():
+    """Drop the cached blob so the next request rebuilds it."""
+    cache.delete(SITE_SETTINGS_CACHE_KEY)
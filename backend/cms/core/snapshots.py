@@ -0,0 +1,191 @@
+"""
+Materialized Page Snapshots for Wagtail Headless CMS
+
+Serializes the expensive API fields of a live page (listed in the page
+model's ``snapshot_fields``) once at publish time and stores them in
+PageSnapshot. The Pages API then serves the stored JSON instead of
+computing the fields per request.
+
+Every snapshot records the cache tags it was built from (images, pages and
+documents referenced by the page, plus anything the page's optional
+``get_snapshot_dependencies()`` returns), so a change to one of them
+rebuilds exactly the snapshots that use it.
+
+Usage:
+    class MyPage(Page):
+        api_fields = [APIField('hero_data'), ...]
+        snapshot_fields = ['hero_data']
+
+    build_page_snapshot(page)
+    refresh_page_snapshots(tags=[image_tag(image.pk)])
+"""
+
+import json
+
+from django.db import transaction
+from django.db.models import Q
+from wagtail.documents import get_document_model
+from wagtail.images import get_image_model
+from wagtail.models import Page, ReferenceIndex
+
+from core.cache import document_tag, image_tag, page_tag
+from core.models import PageSnapshot, PageSnapshotDependency
+from core.renderers import dumps
+from core.utils import get_base_url
+
+
+def get_snapshot_fields(page):
+    """Names of the API fields stored in a page's snapshot."""
+    return list(getattr(page, 'snapshot_fields', []))
+
+
+def serialize_snapshot_field(page, field_name):
+    """
+    Serialize one API field the way the Pages API would.
+
+    Fields with a custom API serializer (e.g. StreamBlocksField) go through
+    it; other fields are read from the page. The result is normalized to
+    plain JSON types.
+
+    Args:
+        page: Specific page object
+        field_name (str): Name of an entry in ``page.api_fields``
+
+    Returns:
+        JSON-compatible value
+    """
+    value = getattr(page, field_name)
+
+    api_field = next((field for field in page.api_fields if field.name == field_name), None)
+    if api_field is not None and api_field.serializer is not None and value is not None:
+        value = api_field.serializer.to_representation(value)
+
+    return json.loads(dumps(value))
+
+
+def get_page_dependencies(page):
+    """
+    Collect the cache tags a page's API output depends on.
+
+    Args:
+        page: Specific page object
+
+    Returns:
+        set: Tags (see core.cache) of referenced images, pages and documents, plus
+            the page's own ``get_snapshot_dependencies()``
+    """
+    Image = get_image_model()
+    Document = get_document_model()
+    tags = {page_tag(page.pk)}
+
+    references = ReferenceIndex.get_references_for_object(page).select_related('to_content_type')
+    for reference in references:
+        model = reference.to_content_type.model_class()
+        if model is None:
+            continue
+        if issubclass(model, Page):
+            tags.add(page_tag(reference.to_object_id))
+        elif issubclass(model, Image):
+            tags.add(image_tag(reference.to_object_id))
+        elif issubclass(model, Document):
+            tags.add(document_tag(reference.to_object_id))
+
+    if hasattr(page, 'get_snapshot_dependencies'):
+        tags.update(page.get_snapshot_dependencies())
+
+    return tags
+
+
+def build_page_snapshot(page):
+    """
+    Build (or drop) the stored snapshot of a page.
+
+    Pages without ``snapshot_fields`` are skipped and non-live pages lose
+    their snapshot.
+
+    Args:
+        page: Wagtail Page object
+
+    Returns:
+        PageSnapshot or None
+    """
+    page = page.specific
+    fields = get_snapshot_fields(page)
+    if not fields:
+        return None
+
+    if not page.live:
+        PageSnapshot.objects.filter(page=page).delete()
+        return None
+
+    # Snapshots are request-independent: absolute links use the configured base URL
+    page._request = None
+    data = {field_name: serialize_snapshot_field(page, field_name) for field_name in fields}
+    tags = get_page_dependencies(page)
+
+    with transaction.atomic():
+        snapshot, _ = PageSnapshot.objects.update_or_create(
+            page=page,
+            defaults={
+                'revision_id': page.live_revision_id,
+                'base_url': get_base_url(None),
+                'data': data,
+            },
+        )
+        snapshot.dependencies.all().delete()
+        PageSnapshotDependency.objects.bulk_create(
+            PageSnapshotDependency(snapshot=snapshot, tag=tag) for tag in sorted(tags)
+        )
+
+    return snapshot
+
+
+def refresh_page_snapshots(page_ids=(), tags=()):
+    """
+    Rebuild the snapshots of the given pages and of every page built from
+    any of ``tags``.
+
+    Args:
+        page_ids (iterable): Pages to (re)build directly
+        tags (iterable): Dependency tags (see core.cache)
+
+    Returns:
+        int: Number of snapshots built
+    """
+    dependents = PageSnapshotDependency.objects.filter(tag__in=list(tags)).values('snapshot__page_id')
+    pages = Page.objects.filter(Q(pk__in=list(page_ids)) | Q(pk__in=dependents)).specific()
+
+    count = 0
+    for page in pages:
+        if build_page_snapshot(page) is not None:
+            count += 1
+    return count
+
+
+def get_page_snapshots(pages, base_url):
+    """
+    Load the usable snapshots for a list of pages with one query.
+
+    A snapshot is usable when it was built from the page's live revision
+    for the same base URL as the current request.
+
+    Args:
+        pages (list): Page objects about to be serialized
+        base_url (str): Base URL of the current request
+
+    Returns:
+        dict: Snapshot data keyed by page id
+    """
+    revisions = {page.pk: page.live_revision_id for page in pages}
+    if not revisions:
+        return {}
+
+    snapshots = PageSnapshot.objects.filter(
+        page_id__in=list(revisions), base_url=base_url
+    ).values_list('page_id', 'revision_id', 'data')
+
+    return {
+        page_id: data
+        for page_id, revision_id, data in snapshots
+        if revision_id == revisions[page_id]
+    }
@@ -0,0 +1,493 @@
+import datetime
+import io
+import json
+import tempfile
+from urllib.parse import urlparse
+from decimal import Decimal
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.core.files.storage import FileSystemStorage
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.core.serializers.json import DjangoJSONEncoder
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+
+from wagtail.documents.models import Document
+from wagtail.images.models import Image
+from wagtail.images.tests.utils import get_test_image_file
+from wagtail.models import Site
+
+from pages.models import GeneralPage, GeneralPageHero
+
+from wagtail.rich_text import RichText
+
+from core.models import ImageMetadata, PageSnapshot, SiteSettings
+from core.pagination import encode_cursor
+from core.page_urls import PageURLResolver, get_page_url
+from core.renderers import FastJSONRenderer
+from core.utils import get_image_data
+
+
+class SiteSettingsAPITests(TestCase):
+    """
+    Tests for the prebuilt site settings payload.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.settings = SiteSettings.for_site(Site.objects.get(is_default_site=True))
+
+    def test_repeat_requests_are_served_from_cache(self):
+        first = self.client.get(reverse("site_settings_api"))
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first["ETag"].startswith('"'))
+
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse("site_settings_api"))
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertEqual(second.json(), first.json())
+
+    def test_saving_settings_rebuilds_payload(self):
+        etag = self.client.get(reverse("site_settings_api"))["ETag"]
+
+        self.settings.header_logo_text = "NEW LOGO"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.settings.save()
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("site_settings_api"))
+        self.assertEqual(response.json()["header"]["logo_text"], "NEW LOGO")
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class ConditionalGetTests(TestCase):
+    """
+    Tests for ETag / Last-Modified handling on the JSON APIs.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def test_site_settings_answers_if_none_match_with_304(self):
+        etag = self.client.get(reverse("site_settings_api"))["ETag"]
+
+        response = self.client.get(reverse("site_settings_api"), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_pages_api_answers_if_none_match_before_serializing(self):
+        url = "/api/v2/pages/?fields=title"
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("Last-Modified", first)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_publishing_changes_pages_etag(self):
+        url = "/api/v2/pages/?fields=title"
+        etag = self.client.get(url)["ETag"]
+
+        Site.objects.get(is_default_site=True).root_page.specific.save_revision().publish()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), RENDITION_WORKERS=0)
+class ImagePlaceholderTests(TestCase):
+    """
+    Tests for placeholder metadata computed at upload time.
+    """
+
+    def setUp(self):
+        self.image = Image.objects.create(
+            title="Red", file=get_test_image_file(colour="red", size=(320, 240))
+        )
+
+    def test_upload_computes_placeholder(self):
+        metadata = ImageMetadata.objects.get(image=self.image)
+
+        self.assertEqual(metadata.source_file, self.image.file.name)
+        self.assertTrue(metadata.placeholder.startswith('data:image/webp;base64,'))
+        self.assertEqual(metadata.dominant_color, '#ff0000')
+
+    def test_title_change_keeps_placeholder(self):
+        ImageMetadata.objects.filter(image=self.image).update(dominant_color='#000000')
+
+        self.image.title = "Renamed"
+        self.image.save()
+
+        self.assertEqual(ImageMetadata.objects.get(image=self.image).dominant_color, '#000000')
+
+    def test_image_data_includes_placeholder(self):
+        image = Image.objects.get(pk=self.image.pk)
+
+        data = get_image_data(image)
+
+        self.assertEqual(data['dominant_color'], '#ff0000')
+        self.assertTrue(data['placeholder'].startswith('data:image/webp;base64,'))
+
+    def test_image_data_does_not_touch_storage(self):
+        image = Image.objects.get(pk=self.image.pk)
+
+        with mock.patch.object(FileSystemStorage, 'size', side_effect=AssertionError), \
+                mock.patch.object(FileSystemStorage, 'url', side_effect=AssertionError):
+            data = get_image_data(image, base_url='http://testserver')
+
+        self.assertEqual(data['url'], f"http://testserver/media/{self.image.file.name}")
+        self.assertEqual(data['file_size'], self.image.file.size)
+        self.assertEqual((data['width'], data['height']), (320, 240))
+
+
+    def test_missing_metadata_is_not_computed_while_serving(self):
+        ImageMetadata.objects.filter(image=self.image).delete()
+        image = Image.objects.get(pk=self.image.pk)
+
+        with mock.patch('core.image_metadata.compute_image_placeholder', side_effect=AssertionError):
+            data = get_image_data(image, base_url='http://testserver')
+
+        self.assertEqual(data['url'], f"http://testserver/media/{self.image.file.name}")
+        self.assertEqual(data['placeholder'], '')
+        self.assertFalse(ImageMetadata.objects.exists())
+
+    def test_build_command_fills_in_missing_metadata(self):
+        ImageMetadata.objects.filter(image=self.image).delete()
+
+        call_command('build_image_metadata', stdout=io.StringIO())
+
+        metadata = ImageMetadata.objects.get(image=self.image)
+        self.assertEqual(metadata.file_url, self.image.file.url)
+        self.assertEqual(metadata.dominant_color, '#ff0000')
+
+
+class GeneralPageAPITests(TestCase):
+    """
+    Tests for GeneralPage body and hero API fields.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.page = GeneralPage(
+            title="About",
+            slug="about",
+            body=json.dumps([{'type': 'heading', 'value': {'heading': '<p>About us</p>'}}]),
+        )
+        Site.objects.get(is_default_site=True).root_page.add_child(instance=self.page)
+        GeneralPageHero.objects.create(page=self.page, title="About hero")
+
+    def get_item(self):
+        response = self.client.get(
+            "/api/v2/pages/", {'type': 'pages.GeneralPage', 'fields': 'body,hero_data'}
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()['items'][0]
+
+    def test_body_and_hero_are_serialized(self):
+        item = self.get_item()
+
+        self.assertEqual(item['hero_data']['title'], "About hero")
+        self.assertEqual(item['body'][0]['type'], 'heading')
+        self.assertEqual(item['body'][0]['value']['heading'], '<p>About us</p>')
+        self.assertEqual(item['body'][0]['id'], self.page.body[0].id)
+
+    @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+    def test_deleted_document_link_is_reserialized(self):
+        document = Document.objects.create(title="Brochure", file=ContentFile(b"%PDF", name="brochure.pdf"))
+        self.page.body = json.dumps([{'type': 'button', 'value': {
+            'text': "Brochure",
+            'href': {'page_link': None, 'external_link': '', 'document_link': document.pk, 'free_link': ''},
+        }}])
+        self.page.save()
+        self.assertEqual(self.get_item()['body'][0]['value']['href']['document_link'], document.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            document.delete()
+
+        self.assertIsNone(self.get_item()['body'][0]['value']['href']['document_link'])
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), RENDITION_WORKERS=0, BASE_URL='http://testserver')
+class PageSnapshotTests(TestCase):
+    """
+    Tests for API snapshots stored at publish time.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.image = Image.objects.create(title="Hero", file=get_test_image_file())
+        self.page = GeneralPage(
+            title="About",
+            slug="about",
+            body=json.dumps([{'type': 'heading', 'value': {'heading': '<p>About us</p>'}}]),
+        )
+        self.page.generalpage_hero = [GeneralPageHero(title="About hero", image=self.image)]
+        with self.captureOnCommitCallbacks(execute=True):
+            Site.objects.get(is_default_site=True).root_page.add_child(instance=self.page)
+            self.page.save_revision().publish()
+        self.page.refresh_from_db()
+
+    def get_detail(self):
+        response = self.client.get(f"/api/v2/pages/{self.page.pk}/")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_publish_stores_snapshot(self):
+        snapshot = PageSnapshot.objects.get(page=self.page)
+
+        self.assertEqual(snapshot.revision_id, self.page.live_revision_id)
+        self.assertEqual(snapshot.data['hero_data']['title'], "About hero")
+        self.assertEqual(snapshot.data['body'][0]['value']['heading'], '<p>About us</p>')
+        self.assertIn(
+            f"image:{self.image.pk}", snapshot.dependencies.values_list('tag', flat=True)
+        )
+
+    def test_api_serves_snapshot(self):
+        PageSnapshot.objects.filter(page=self.page).update(
+            data={'hero_data': {'title': "Stored"}, 'body': []}
+        )
+
+        item = self.get_detail()
+
+        self.assertEqual(item['hero_data'], {'title': "Stored"})
+        self.assertEqual(item['body'], [])
+        self.assertEqual(item['title'], "About")
+
+    def test_snapshot_for_other_base_url_is_ignored(self):
+        PageSnapshot.objects.filter(page=self.page).update(
+            base_url='https://cms.example.com', data={'hero_data': {'title': "Stored"}}
+        )
+
+        self.assertEqual(self.get_detail()['hero_data']['title'], "About hero")
+
+    def test_image_change_rebuilds_snapshot(self):
+        PageSnapshot.objects.filter(page=self.page).update(data={'hero_data': {'title': "Stale"}})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.image.title = "Renamed hero"
+            self.image.save()
+
+        hero = PageSnapshot.objects.get(page=self.page).data['hero_data']
+        self.assertEqual(hero['title'], "About hero")
+        self.assertEqual(hero['background_image']['alt'], "Renamed hero")
+
+    def test_document_change_rebuilds_snapshot(self):
+        document = Document.objects.create(title="Brochure", file=ContentFile(b"%PDF", name="brochure.pdf"))
+        self.page.body = json.dumps([{'type': 'button', 'value': {
+            'text': "Brochure",
+            'href': {'page_link': None, 'external_link': '', 'document_link': document.pk, 'free_link': ''},
+        }}])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.page.save_revision().publish()
+        self.assertIn(
+            f"document:{document.pk}",
+            PageSnapshot.objects.get(page=self.page).dependencies.values_list('tag', flat=True),
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            document.delete()
+
+        body = PageSnapshot.objects.get(page=self.page).data['body']
+        self.assertIsNone(body[0]['value']['href']['document_link'])
+
+    def test_site_change_rebuilds_snapshots(self):
+        PageSnapshot.objects.filter(page=self.page).update(data={'hero_data': {'title': "Stale"}})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            site = Site.objects.get(is_default_site=True)
+            site.hostname = 'cms.example.com'
+            site.save()
+
+        self.assertEqual(PageSnapshot.objects.get(page=self.page).data['hero_data']['title'], "About hero")
+
+    def test_unpublish_drops_snapshot(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.page.unpublish()
+
+        self.assertFalse(PageSnapshot.objects.filter(page=self.page).exists())
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), RENDITION_WORKERS=0)
+class PageSnapshotBaseURLTests(TestCase):
+    """
+    Tests for snapshots with the configured BASE_URL (no test override).
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.page = GeneralPage(title="About", slug="about")
+        with self.captureOnCommitCallbacks(execute=True):
+            Site.objects.get(is_default_site=True).root_page.add_child(instance=self.page)
+            self.page.save_revision().publish()
+
+    def test_snapshot_is_built_for_base_url(self):
+        snapshot = PageSnapshot.objects.get(page=self.page)
+        self.assertEqual(snapshot.base_url, settings.BASE_URL)
+
+    def test_requests_on_base_url_host_are_served_from_snapshot(self):
+        PageSnapshot.objects.filter(page=self.page).update(data={'hero_data': {'title': "Stored"}, 'body': []})
+        base_url = urlparse(settings.BASE_URL)
+
+        response = self.client.get(
+            f"/api/v2/pages/{self.page.pk}/", HTTP_HOST=base_url.netloc, secure=base_url.scheme == 'https'
+        )
+
+        self.assertEqual(response.json()['hero_data'], {'title': "Stored"})
+
+
+class PageURLResolverTests(TestCase):
+    """
+    Tests for batched page URL resolution.
+    """
+
+    def setUp(self):
+        cache.clear()
+        root = Site.objects.get(is_default_site=True).root_page
+        self.pages = [
+            root.add_child(instance=GeneralPage(title=f"Page {i}", slug=f"page-{i}"))
+            for i in range(3)
+        ]
+
+    def test_pages_added_by_id_load_in_one_query(self):
+        page_urls = PageURLResolver()
+        page_urls.add(*[page.pk for page in self.pages])
+
+        # One query for the pages, one for the site root paths
+        with self.assertNumQueries(2):
+            page_urls.resolve()
+
+        with self.assertNumQueries(0):
+            urls = [page_urls.get_url(page.pk) for page in self.pages]
+        self.assertEqual(urls, [page.url for page in self.pages])
+
+    def test_link_for_missing_page_is_none(self):
+        self.assertIsNone(PageURLResolver().get_link(999999))
+
+    def test_urls_are_served_from_the_url_map(self):
+        PageURLResolver().get_url(self.pages[0].pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_page_url(self.pages[0].pk), '/page-0/')
+
+    def test_slug_change_refreshes_descendant_urls(self):
+        child = self.pages[0].add_child(instance=GeneralPage(title="Child", slug="child"))
+        self.assertEqual(get_page_url(child), '/page-0/child/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.pages[0].slug = 'renamed'
+            self.pages[0].save_revision().publish()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_page_url(child.pk), '/renamed/child/')
+
+    def test_site_change_starts_a_new_url_map(self):
+        get_page_url(self.pages[0])
+
+        site = Site.objects.get(is_default_site=True)
+        site.root_page = self.pages[0]
+        site.save()
+
+        self.assertEqual(get_page_url(self.pages[0].pk), '/')
+
+
+class FastJSONRendererTests(TestCase):
+    """
+    Tests for the orjson-backed API renderer.
+    """
+
+    def test_matches_django_json_encoding(self):
+        data = {
+            'base_price': Decimal('450000.00'),
+            'bathrooms': Decimal('2.5'),
+            'published': datetime.datetime(2024, 5, 1, 9, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'label': gettext_lazy("Home"),
+            'nested': [{'id': 1, 'title': 'Ünïcode'}],
+        }
+
+        rendered = FastJSONRenderer().render(data)
+
+        self.assertEqual(json.loads(rendered), json.loads(json.dumps(data, cls=DjangoJSONEncoder)))
+
+    def test_renders_rich_text_as_html(self):
+        rendered = FastJSONRenderer().render({'description': RichText('<p>Hello</p>')})
+
+        self.assertEqual(json.loads(rendered), {'description': '<p>Hello</p>'})
+
+    def test_api_uses_fast_renderer(self):
+        response = self.client.get("/api/v2/pages/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+
+
+class CursorPaginationTests(TestCase):
+    """
+    Tests for keyset pagination of the Pages API.
+    """
+
+    def setUp(self):
+        cache.clear()
+        root = Site.objects.get(is_default_site=True).root_page
+        for title in ["Delta", "Alpha", "Charlie", "Bravo", "Alpha"]:
+            root.add_child(instance=GeneralPage(title=title, slug=f"{title.lower()}-{GeneralPage.objects.count()}"))
+
+    def get_listing(self, **params):
+        response = self.client.get("/api/v2/pages/", {'type': 'pages.GeneralPage', 'limit': 2, **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def walk(self, **params):
+        ids, cursor, pages = [], '', 0
+        while cursor is not None:
+            data = self.get_listing(cursor=cursor, **params)
+            ids += [item['id'] for item in data['items']]
+            cursor = data['meta']['next_cursor']
+            pages += 1
+        return ids, pages
+
+    def test_cursor_pages_follow_the_ordering(self):
+        expected = list(GeneralPage.objects.order_by('title', 'pk').values_list('pk', flat=True))
+
+        ids, pages = self.walk(order='title')
+
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+
+    def test_descending_and_default_order(self):
+        ids, _ = self.walk(order='-title')
+        self.assertEqual(ids, list(GeneralPage.objects.order_by('-title', 'pk').values_list('pk', flat=True)))
+
+        ids, _ = self.walk()
+        self.assertEqual(ids, list(GeneralPage.objects.order_by('path').values_list('pk', flat=True)))
+
+    def test_count_is_optional(self):
+        self.assertEqual(self.get_listing(cursor='')['meta']['total_count'], 5)
+
+        with CaptureQueriesContext(connection) as queries:
+            meta = self.get_listing(cursor='', count='false')['meta']
+        self.assertNotIn('total_count', meta)
+        self.assertFalse(any('COUNT(' in query['sql'] for query in queries))
+
+        self.assertNotIn('total_count', self.get_listing(count='false')['meta'])
+
+    def test_invalid_requests(self):
+        for params in ({'cursor': 'not-a-cursor'}, {'cursor': '', 'offset': 2}, {'cursor': '', 'order': 'random'}):
+            response = self.client.get("/api/v2/pages/", {'type': 'pages.GeneralPage', **params})
+            self.assertEqual(response.status_code, 400, params)
+
+    def test_cursor_values_of_the_wrong_type_are_rejected(self):
+        # Default ordering is ['path', 'pk']
+        for values in (["a", "zzz"], ["a", {"pk": 1}], ["a", [1, 2]]):
+            response = self.client.get("/api/v2/pages/", {
+                'type': 'pages.GeneralPage', 'cursor': encode_cursor(values),
+            })
+            self.assertEqual(response.status_code, 400, values)
+            self.assertEqual(response.json(), {'message': "cursor is invalid"})
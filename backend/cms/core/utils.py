@@ -4,10 +4,17 @@ Utility functions for Wagtail Headless CMS
 Common helper functions used across the project.
 """
 
+import json
 import re
+from types import GeneratorType
+
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
 
+from core.image_metadata import get_image_file_url, get_placeholder_data
+from core.renditions import RenditionResolver
+
 
 def is_email_valid(email):
     """
@@ -53,21 +60,22 @@ def get_image_data(image, base_url='http://127.0.0.1:8000'):
         base_url (str): Base URL for image URLs
         
     Returns:
-        dict: Image data with URL, alt text, dimensions
+        dict: Image data with URL, alt text, dimensions and placeholder
     """
     if not image:
         return None
     
     return {
-        'url': f"{base_url}{image.file.url}",
+        'url': f"{base_url}{get_image_file_url(image)}",
         'alt': image.title,
         'width': image.width,
         'height': image.height,
-        'file_size': image.file.size,
+        'file_size': image.file_size,
+        **get_placeholder_data(image),
     }
 
 
-def get_rendition_data(image, rendition_spec, base_url='http://127.0.0.1:8000'):
+def get_rendition_data(image, rendition_spec, base_url='http://127.0.0.1:8000', renditions=None):
     """
     Get specific rendition of an image.
     
@@ -75,6 +83,7 @@ def get_rendition_data(image, rendition_spec, base_url='http://127.0.0.1:8000'):
         image: Wagtail Image object
         rendition_spec (str): Rendition specification (e.g., 'fill-400x300')
         base_url (str): Base URL for image URLs
+        renditions (RenditionResolver): Resolver holding prefetched renditions (optional)
         
     Returns:
         dict: Rendition data
@@ -82,7 +91,10 @@ def get_rendition_data(image, rendition_spec, base_url='http://127.0.0.1:8000'):
     if not image:
         return None
     
-    rendition = image.get_rendition(rendition_spec)
+    if renditions is not None:
+        rendition = renditions.get(image, rendition_spec)
+    else:
+        rendition = image.get_rendition(rendition_spec)
     return {
         'url': f"{base_url}{rendition.url}",
         'alt': image.title,
@@ -91,13 +103,21 @@ def get_rendition_data(image, rendition_spec, base_url='http://127.0.0.1:8000'):
     }
 
 
-def get_responsive_image_data(image, base_url='http://127.0.0.1:8000'):
+RESPONSIVE_RENDITION_SPECS = {
+    'thumbnail': 'fill-400x300',
+    'medium': 'fill-800x600',
+    'large': 'fill-1200x900',
+}
+
+
+def get_responsive_image_data(image, base_url='http://127.0.0.1:8000', renditions=None):
     """
     Get multiple renditions for responsive images.
     
     Args:
         image: Wagtail Image object
         base_url (str): Base URL for image URLs
+        renditions (RenditionResolver): Resolver holding prefetched renditions (optional)
         
     Returns:
         dict: Image data with multiple renditions
@@ -105,12 +125,15 @@ def get_responsive_image_data(image, base_url='http://127.0.0.1:8000'):
     if not image:
         return None
     
-    return {
-        'original': get_image_data(image, base_url),
-        'thumbnail': get_rendition_data(image, 'fill-400x300', base_url),
-        'medium': get_rendition_data(image, 'fill-800x600', base_url),
-        'large': get_rendition_data(image, 'fill-1200x900', base_url),
-    }
+    if renditions is None:
+        renditions = RenditionResolver()
+        renditions.add(image, *RESPONSIVE_RENDITION_SPECS.values())
+        renditions.resolve()
+    
+    data = {'original': get_image_data(image, base_url)}
+    for name, spec in RESPONSIVE_RENDITION_SPECS.items():
+        data[name] = get_rendition_data(image, spec, base_url, renditions)
+    return data
 
 
 def sanitize_slug(text):
@@ -246,3 +269,36 @@ def strip_html_tags(html_text):
     """
     clean_text = re.sub(r'<[^>]+>', '', html_text)
     return clean_text.strip()
+
+
+def iter_json(value, encoder=None):
+    """
+    Encode a value as JSON incrementally.
+    
+    Generators are written as arrays, one item per fragment, so a generator
+    of blocks is only consumed as the output is sent (e.g. through a
+    StreamingHttpResponse). Dicts holding generators are written key by key;
+    everything else is encoded in one piece.
+    
+    Args:
+        value: Value to encode (dicts and generators may be nested)
+        encoder (JSONEncoder): Encoder for everything else (optional)
+        
+    Yields:
+        str: JSON text fragments
+    """
+    encoder = encoder or DjangoJSONEncoder()
+    
+    if isinstance(value, GeneratorType):
+        yield '['
+        for index, item in enumerate(value):
+            yield (',' if index else '') + ''.join(iter_json(item, encoder))
+        yield ']'
+    elif isinstance(value, dict) and any(isinstance(item, GeneratorType) for item in value.values()):
+        yield '{'
+        for index, (key, item) in enumerate(value.items()):
+            yield f"{',' if index else ''}{json.dumps(str(key))}:"
+            yield from iter_json(item, encoder)
+        yield '}'
+    else:
+        yield encoder.encode(value)
@@ -1,11 +1,59 @@
 """
-API Views for Core App - Site Settings
+API Views for Core App - Site Settings and Pages
 """
 
-from django.http import JsonResponse
-from wagtail.models import Site
-from core.models import SiteSettings
-from core.utils import get_base_url, get_image_data
+import hashlib
+import json
+
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.urls import path
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+from wagtail.api.v2.utils import BadRequestError
+from wagtail.api.v2.views import PagesAPIViewSet
+from wagtail.documents.api.v2.views import DocumentsAPIViewSet
+from wagtail.images.api.v2.views import ImagesAPIViewSet
+from core.api import BlockWindow, SnapshotPageSerializer
+from core.cache import get_content_version
+from core.pagination import CursorPagination
+from core.renderers import FastJSONRenderer, dumps
+from core.renditions import RenditionResolver
+from core.site_settings import get_site_settings_payload
+from core.snapshots import get_page_snapshots
+from core.utils import get_base_url, iter_json
+
+
+def set_validators(response, etag, last_modified=None):
+    """
+    Attach ETag and Last-Modified headers to a response.
+    
+    Args:
+        response: Django/DRF response object
+        etag (str): Quoted entity tag
+        last_modified (float): Unix timestamp (optional)
+        
+    Returns:
+        The same response
+    """
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def get_not_modified_response(request, etag, last_modified=None):
+    """
+    Answer conditional requests before any payload is built.
+    
+    Returns:
+        HttpResponseNotModified (with validators) or None
+    """
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
 
 
 def site_settings_api(request):
@@ -13,118 +61,195 @@ def site_settings_api(request):
     API endpoint to retrieve site-wide settings (header/footer configuration).
     
     Returns header navigation, footer content, contact info, and social links.
+    The payload is prebuilt and served from cache with a strong ETag.
     """
     try:
-        site = Site.objects.get(is_default_site=True)
-        settings = SiteSettings.for_site(site)
-        base_url = get_base_url(request)
+        blob = get_site_settings_payload()
+        etag = f'"{blob["version"]}"'
         
-        # Serialize header menu items
-        header_menu = []
-        for menu_item in settings.header_menu_items:
-            item_data = {
-                'label': menu_item.value.get('label', ''),
-                'aria_label': menu_item.value.get('aria_label', ''),
-                'link': menu_item.value.get('link', ''),
-            }
-            
-            # Check if page is selected instead of URL
-            if menu_item.value.get('page'):
-                page = menu_item.value['page']
-                item_data['link'] = page.url if hasattr(page, 'url') else ''
-            
-            # Serialize sub-items
-            sub_items = menu_item.value.get('sub_items', [])
-            if sub_items:
-                item_data['subItems'] = []
-                for sub_item in sub_items:
-                    sub_data = {
-                        'label': sub_item.get('label', ''),
-                        'link': sub_item.get('link', ''),
-                    }
-                    if sub_item.get('page'):
-                        page = sub_item['page']
-                        sub_data['link'] = page.url if hasattr(page, 'url') else ''
-                    item_data['subItems'].append(sub_data)
-            
-            header_menu.append(item_data)
+        not_modified = get_not_modified_response(request, etag, blob['last_modified'])
+        if not_modified is not None:
+            return not_modified
         
-        # Serialize footer sections
-        footer_sections = []
-        for section in settings.footer_content:
-            section_data = {
-                'type': section.value.get('section_type', 'columns'),
-            }
-            
-            if section.value.get('section_type') == 'columns':
-                columns = section.value.get('columns', [])
-                section_data['columns'] = []
-                for column in columns:
-                    column_data = {
-                        'heading': column.get('heading', ''),
-                        'links': []
-                    }
-                    for link in column.get('links', []):
-                        link_data = {
-                            'text': link.get('text', ''),
-                            'link': link.get('link', ''),
-                        }
-                        if link.get('page'):
-                            page = link['page']
-                            link_data['link'] = page.url if hasattr(page, 'url') else ''
-                        column_data['links'].append(link_data)
-                    section_data['columns'].append(column_data)
-            
-            elif section.value.get('section_type') == 'text':
-                section_data['content'] = section.value.get('content', '')
-            
-            elif section.value.get('section_type') == 'contact':
-                section_data['contact'] = {
-                    'show_email': section.value.get('show_email', True),
-                    'show_phone': section.value.get('show_phone', True),
-                    'show_address': section.value.get('show_address', True),
-                    'email': settings.contact_email,
-                    'phone': settings.contact_phone,
-                    'address': settings.contact_address,
-                }
-            
-            footer_sections.append(section_data)
-        
-        # Build social media links
-        social_links = {}
-        if settings.facebook_url:
-            social_links['facebook'] = settings.facebook_url
-        if settings.twitter_url:
-            social_links['twitter'] = settings.twitter_url
-        if settings.instagram_url:
-            social_links['instagram'] = settings.instagram_url
-        if settings.linkedin_url:
-            social_links['linkedin'] = settings.linkedin_url
-        if settings.youtube_url:
-            social_links['youtube'] = settings.youtube_url
-        
-        # Build response
-        response_data = {
-            'header': {
-                'logo_text': settings.header_logo_text,
-                'menu_items': header_menu,
-            },
-            'footer': {
-                'sections': footer_sections,
-                'copyright': settings.footer_copyright,
-            },
-            'contact': {
-                'email': settings.contact_email,
-                'phone': settings.contact_phone,
-                'address': settings.contact_address,
-            },
-            'social': social_links,
-        }
-        
-        return JsonResponse(response_data)
+        response = HttpResponse(dumps(blob['data']), content_type='application/json')
+        return set_validators(response, etag, blob['last_modified'])
     
     except Exception as e:
         return JsonResponse(
             {'error': f'Failed to load site settings: {str(e)}'},
             status=500
         )
+
+
+class FastJSONRendererMixin:
+    """Render API responses with the orjson-backed FastJSONRenderer."""
+    
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
+
+class HeadlessImagesAPIViewSet(FastJSONRendererMixin, ImagesAPIViewSet):
+    """Images API endpoint using the fast JSON renderer."""
+
+
+class HeadlessDocumentsAPIViewSet(FastJSONRendererMixin, DocumentsAPIViewSet):
+    """Documents API endpoint using the fast JSON renderer."""
+
+
+class HeadlessPagesAPIViewSet(FastJSONRendererMixin, PagesAPIViewSet):
+    """
+    Pages API endpoint that exposes the current request to page properties.
+    
+    Computed API fields (e.g. HomePage.hero_section_data) read
+    ``page._request`` to build absolute media URLs and per-host cache keys.
+    
+    Responses carry ETag/Last-Modified validators derived from the pages'
+    live revisions and the global content version, and conditional
+    requests are answered with 304 before any serialization happens.
+    JSON is rendered with the orjson-backed FastJSONRenderer.
+    
+    Listings can be paged with an opaque ``?cursor=`` instead of ``offset``
+    and without a total count (``?count=false``); see core.pagination.
+    
+    Fields stored in a page's snapshot (see core.snapshots) are served
+    from it instead of being computed.
+    
+    Page types can accept extra query parameters for their computed fields
+    by listing them in ``api_query_parameters`` (e.g. the house design
+    listing filters); such requests are computed rather than snapshotted.
+    """
+    
+    base_serializer_class = SnapshotPageSerializer
+    pagination_class = CursorPagination
+    
+    # Block window parameters for HomePage.body_content_data, and cursor
+    # pagination parameters
+    known_query_parameters = PagesAPIViewSet.known_query_parameters.union(
+        BlockWindow.query_parameters('body'),
+        CursorPagination.query_parameters,
+    )
+    
+    # Body blocks fetched and serialized per batch by body_stream_view
+    body_stream_chunk_size = 2
+    
+    @classmethod
+    def get_urlpatterns(cls):
+        return super().get_urlpatterns() + [
+            path("<int:pk>/body/", cls.as_view({"get": "body_stream_view"}), name="body_stream"),
+        ]
+    
+    def check_query_parameters(self, queryset):
+        model_parameters = set(getattr(queryset.model, 'api_query_parameters', ()))
+        if model_parameters:
+            self.known_query_parameters = self.known_query_parameters.union(model_parameters)
+        super().check_query_parameters(queryset)
+    
+    def get_page_validators(self, pages):
+        """
+        Compute (etag, last_modified) for the pages in a response.
+        
+        Args:
+            pages (list): Page objects about to be serialized
+            
+        Returns:
+            tuple: (quoted ETag string, Unix timestamp)
+        """
+        content_version = get_content_version()
+        state = [
+            (page.pk, page.live_revision_id, page.last_published_at.isoformat() if page.last_published_at else None)
+            for page in pages
+        ]
+        raw = json.dumps([
+            self.request.get_full_path(),
+            self.request.get_host(),
+            self.request.META.get('HTTP_ACCEPT', ''),
+            content_version,
+            state,
+        ])
+        etag = f'"{hashlib.sha1(raw.encode("utf-8")).hexdigest()}"'
+        
+        timestamps = [page.last_published_at.timestamp() for page in pages if page.last_published_at]
+        return etag, max(timestamps + [content_version])
+    
+    def listing_view(self, request):
+        queryset = self.get_queryset()
+        self.check_query_parameters(queryset)
+        queryset = self.filter_queryset(queryset)
+        queryset = self.paginate_queryset(queryset)
+        
+        etag, last_modified = self.get_page_validators(queryset)
+        not_modified = get_not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        
+        serializer = self.get_serializer(queryset, many=True)
+        return set_validators(self.get_paginated_response(serializer.data), etag, last_modified)
+    
+    def detail_view(self, request, pk):
+        instance = self.get_object()
+        
+        etag, last_modified = self.get_page_validators([instance])
+        not_modified = get_not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        
+        serializer = self.get_serializer(instance)
+        return set_validators(Response(serializer.data), etag, last_modified)
+    
+    def get_snapshots(self, pages):
+        """
+        Snapshot data for the pages in a response, keyed by page id.
+        
+        Windowed body requests are always computed, since snapshots hold
+        the full body, and so are pages whose own query parameters
+        (``api_query_parameters``) are present.
+        """
+        if BlockWindow.from_request(self.request, 'body') is not None:
+            return {}
+        
+        params = set(self.request.GET.keys())
+        pages = [page for page in pages if not params.intersection(getattr(page, 'api_query_parameters', ()))]
+        return get_page_snapshots(pages, get_base_url(self.request))
+    
+    def get_serializer(self, *args, **kwargs):
+        if args:
+            pages = list(args[0]) if kwargs.get('many') else [args[0]]
+            snapshots = self.get_snapshots(pages)
+            for page in pages:
+                page._request = self.request
+                page._snapshot = snapshots.get(page.pk)
+        return super().get_serializer(*args, **kwargs)
+    
+    def body_stream_view(self, request, pk):
+        """
+        Stream a page's body blocks as they are serialized.
+        
+        Emits ``{"id", "title", "hero_section_data", "body_manifest",
+        "body_content_data": [...]}`` through a StreamingHttpResponse, so the
+        first blocks go out before the rest are built and the full list is
+        never held in memory. Accepts the same body window parameters as the
+        detail view.
+        """
+        page = self.get_object()
+        if not hasattr(page, 'iter_body_content_data'):
+            raise BadRequestError("this page type has no streamable body")
+        
+        etag, last_modified = self.get_page_validators([page])
+        not_modified = get_not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        
+        page._request = request
+        window = BlockWindow.from_request(request, 'body')
+        body = page.iter_body_content_data(
+            RenditionResolver(), get_base_url(request), window, self.body_stream_chunk_size
+        )
+        document = {
+            'id': page.pk,
+            'title': page.title,
+            'hero_section_data': page.hero_section_data,
+            'body_manifest': page.body_manifest,
+            'body_content_data': body,
+        }
+        
+        response = StreamingHttpResponse(iter_json(document), content_type='application/json')
+        return set_validators(response, etag, last_modified)
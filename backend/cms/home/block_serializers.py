@@ -0,0 +1,344 @@
+"""
+HomePage Block Serializers
+
+Transforms HomePage body blocks into the format expected by the frontend
+components. Serializers are registered by block type on ``home_blocks``,
+which memoizes each block's output (see core.block_serializers).
+"""
+
+from core.block_serializers import BlockSerializerRegistry
+from core.page_urls import PageURLResolver
+
+from .image_config import collect_stream_renditions, generate_responsive_image_data
+
+
+home_blocks = BlockSerializerRegistry('home', collect=collect_stream_renditions)
+
+
+def get_page_urls(renditions=None):
+    """Page URL resolver shared by the payload being built (see core.page_urls)"""
+    return renditions.page_urls if renditions is not None else PageURLResolver()
+
+
+@home_blocks.register('residential_projects')
+@home_blocks.register('commercial_projects')
+def serialize_projects_block(block_value, renditions=None, base_url='http://127.0.0.1:8000'):
+    """Serialize residential/commercial projects blocks with proper image URLs"""
+    page_urls = get_page_urls(renditions)
+    projects_data = []
+
+    for project in block_value.get('projects', []):
+        project_data = {
+            'title': project.get('title', ''),
+            'description': project.get('description', ''),
+            'button_text': project.get('button_text', 'Learn More'),
+            'is_external_link': project.get('is_external_link', False),
+            'external_url': project.get('external_url', ''),
+        }
+
+        # Handle page link
+        project_data['page_link'] = page_urls.get_link(project.get('page_link'))
+
+        # Handle project image with global config (residential and commercial share it)
+        if project.get('image'):
+            project_data['image'] = generate_responsive_image_data(
+                project['image'], 'residential_projects', 'projects.image',
+                base_url=base_url, renditions=renditions
+            )
+        else:
+            project_data['image'] = None
+
+        projects_data.append(project_data)
+
+    return {
+        'title': block_value.get('title', ''),
+        'subtitle': block_value.get('subtitle', ''),
+        'projects': projects_data
+    }
+
+
+@home_blocks.register('horizontal_slider')
+def serialize_horizontal_slider_block(block_value, renditions=None, base_url='http://127.0.0.1:8000'):
+    """Serialize horizontal slider block"""
+    page_urls = get_page_urls(renditions)
+    slides_data = []
+
+    for slide in block_value.get('slides', []):
+        slide_data = {
+            'order': slide.get('order', '1'),
+            'title': slide.get('title', ''),
+            'description': slide.get('description', ''),
+            'button_text': slide.get('button_text', 'Learn More'),
+            'is_external_link': slide.get('is_external_link', False),
+            'external_url': slide.get('external_url', ''),
+        }
+
+        # Handle page link
+        slide_data['page_link'] = page_urls.get_link(slide.get('page_link'))
+
+        # Handle slide image with global config
+        if slide.get('image'):
+            slide_data['image'] = generate_responsive_image_data(
+                slide['image'], 'horizontal_slider', 'slides.image',
+                base_url=base_url, renditions=renditions
+            )
+        else:
+            slide_data['image'] = None
+
+        slides_data.append(slide_data)
+
+    return {
+        'title': block_value.get('title', ''),
+        'description': block_value.get('description', ''),
+        'slides': slides_data,
+        'autoplay_enabled': block_value.get('autoplay_enabled', True),
+        'autoplay_delay': block_value.get('autoplay_delay', '3000'),
+    }
+
+
+@home_blocks.register('multi_image_content')
+def serialize_multi_image_content_block(block_value, renditions=None, base_url='http://127.0.0.1:8000'):
+    """Serialize multi-image content block for StudioSection.tsx"""
+    page_urls = get_page_urls(renditions)
+
+    # Serialize images with global configuration
+    images_data = []
+    for image_block in block_value.get('images', []):
+        if image_block.get('image'):
+            image_data = generate_responsive_image_data(
+                image_block['image'], 'multi_image_content', 'images.image',
+                base_url=base_url, renditions=renditions
+            )
+            # Override alt text if provided in block
+            if image_block.get('alt_text'):
+                image_data['alt'] = image_block['alt_text']
+            images_data.append(image_data)
+
+    # Serialize CTA button
+    cta_data = {}
+    cta_block = block_value.get('cta', {})
+    if cta_block:
+        cta_data = {
+            'button_text': cta_block.get('button_text', 'Get Started'),
+            'is_external_link': cta_block.get('is_external_link', False),
+            'external_url': cta_block.get('external_url', ''),
+        }
+
+        # Handle internal page link
+        cta_data['page_link'] = page_urls.get_link(cta_block.get('page_link'))
+
+    # Convert rich text to formatted text array (preserve paragraphs and line breaks)
+    description_text = []
+    if block_value.get('description'):
+        import re
+        rich_text = str(block_value['description'])
+
+        # Split by paragraph tags and preserve line breaks
+        # Replace <br> tags with line breaks
+        rich_text = re.sub(r'<br\s*/?>', '\n', rich_text)
+
+        # Split by paragraph tags
+        paragraphs = re.split(r'</?p[^>]*>', rich_text)
+
+        # Clean up each paragraph and filter out empty ones
+        for paragraph in paragraphs:
+            # Remove remaining HTML tags but preserve line breaks
+            clean_paragraph = re.sub(r'<[^>]+>', '', paragraph).strip()
+            if clean_paragraph:
+                description_text.append(clean_paragraph)
+
+    return {
+        'title': block_value.get('section_title', 'Bring your dream home to life'),
+        'subtitle': block_value.get('section_subtitle', ''),
+        'description': description_text,
+        'images': images_data,
+        'cta': cta_data
+    }
+
+
+@home_blocks.register('quality_homes')
+def serialize_quality_homes_block(block_value, renditions=None, base_url='http://127.0.0.1:8000'):
+    """Serialize quality homes block with proper image URLs and CTA"""
+    page_urls = get_page_urls(renditions)
+    features_data = []
+
+    for feature in block_value.get('features', []):
+        feature_data = {
+            'icon': feature.get('icon', '✓'),
+            'title': feature.get('title', ''),
+            'description': feature.get('description', ''),
+        }
+
+        # Handle feature image with global config
+        if feature.get('image'):
+            feature_data['image'] = generate_responsive_image_data(
+                feature['image'], 'quality_homes', 'features.image',
+                base_url=base_url, renditions=renditions
+            )
+        else:
+            feature_data['image'] = None
+
+        features_data.append(feature_data)
+
+    # Handle CTA data
+    cta_data = None
+    if block_value.get('cta'):
+        cta = block_value['cta']
+        cta_data = {
+            'button_text': cta.get('button_text', 'Learn More'),
+            'is_external_link': cta.get('is_external_link', False),
+            'external_url': cta.get('external_url', ''),
+        }
+
+        # Handle page link
+        cta_data['page_link'] = page_urls.get_link(cta.get('page_link'))
+
+    return {
+        'main_title': block_value.get('main_title', 'Building quality homes for over 40 years'),
+        'features': features_data,
+        'cta': cta_data
+    }
+
+
+@home_blocks.register('dream_home_journey')
+def serialize_dream_home_journey_block(block_value, renditions=None, base_url='http://127.0.0.1:8000'):
+    """Serialize dream home journey block with background image and dual CTAs"""
+    page_urls = get_page_urls(renditions)
+
+    # Handle primary CTA data
+    primary_cta_data = None
+    if block_value.get('primary_cta'):
+        primary_cta = block_value['primary_cta']
+        primary_cta_data = {
+            'button_text': primary_cta.get('button_text', 'Learn More'),
+            'is_external_link': primary_cta.get('is_external_link', False),
+            'external_url': primary_cta.get('external_url', ''),
+        }
+
+        # Handle page link
+        primary_cta_data['page_link'] = page_urls.get_link(primary_cta.get('page_link'))
+
+    # Handle secondary CTA data
+    secondary_cta_data = None
+    if block_value.get('secondary_cta'):
+        secondary_cta = block_value['secondary_cta']
+        secondary_cta_data = {
+            'button_text': secondary_cta.get('button_text', 'Learn More'),
+            'is_external_link': secondary_cta.get('is_external_link', False),
+            'external_url': secondary_cta.get('external_url', ''),
+        }
+
+        # Handle page link
+        secondary_cta_data['page_link'] = page_urls.get_link(secondary_cta.get('page_link'))
+
+    # Handle background image with global config
+    background_image_data = None
+    if block_value.get('background_image'):
+        background_image_data = generate_responsive_image_data(
+            block_value['background_image'], 'dream_home_journey', 'background_image',
+            base_url=base_url, renditions=renditions
+        )
+
+    return {
+        'title': block_value.get('title', 'Begin your dream home journey with Shambala Homes'),
+        'description': block_value.get('description', 'Discover modern house designs and packages to turn your vision into reality — from open living spaces to stunning alfresco homes.'),
+        'primary_cta': primary_cta_data,
+        'secondary_cta': secondary_cta_data,
+        'background_image': background_image_data
+    }
+
+
+def serialize_blog_post(post_data, is_featured=False, renditions=None, base_url='http://127.0.0.1:8000'):
+    """Helper to serialize a single blog post"""
+    page_urls = get_page_urls(renditions)
+    # Handle link configuration
+    post_link = '#'
+    if post_data.get('is_external_link') and post_data.get('external_url'):
+        post_link = post_data.get('external_url')
+    elif not post_data.get('is_external_link') and post_data.get('page_link'):
+        post_link = page_urls.get_url(post_data['page_link'], default='#')
+
+    # Handle main image
+    image_data = None
+    if post_data.get('image'):
+        image_config = 'blog_featured' if is_featured else 'blog_post'
+        image_data = generate_responsive_image_data(
+            post_data['image'], 'blog_section', f'{image_config}.image',
+            base_url=base_url, renditions=renditions
+        )
+
+    blog_post = {
+        'id': hash(str(post_data.get('title', '') + str(post_data.get('date', '')))),  # Generate unique ID
+        'title': post_data.get('title', ''),
+        'date': post_data.get('date', ''),
+        'category': post_data.get('category', 'Design Tips'),
+        'excerpt': post_data.get('excerpt', ''),
+        'imageSrc': image_data['src'] if image_data else None,
+        'imageAlt': image_data['alt'] if image_data else '',
+        'link': post_link,
+        'featured': is_featured
+    }
+
+    # Add additional content for featured posts
+    if is_featured:
+        blog_post['additional_text'] = post_data.get('additional_text', '')
+
+        # Handle additional image
+        if post_data.get('additional_image'):
+            additional_image_data = generate_responsive_image_data(
+                post_data['additional_image'], 'blog_section', 'blog_additional.image',
+                base_url=base_url, renditions=renditions
+            )
+            blog_post['additional_image'] = {
+                'src': additional_image_data['src'],
+                'alt': additional_image_data['alt']
+            }
+        else:
+            blog_post['additional_image'] = None
+
+    return blog_post
+
+
+@home_blocks.register('blog_section')
+def serialize_blog_section_block(block_value, renditions=None, base_url='http://127.0.0.1:8000'):
+    """Serialize blog section block with featured post and sidebar posts"""
+    page_urls = get_page_urls(renditions)
+
+    # Serialize featured post (left side)
+    featured_post = None
+    if block_value.get('featured_post'):
+        featured_post = serialize_blog_post(block_value['featured_post'], is_featured=True, renditions=renditions, base_url=base_url)
+
+    # Serialize sidebar posts (right side)
+    sidebar_posts = []
+    for post in block_value.get('sidebar_posts', []):
+        sidebar_posts.append(serialize_blog_post(post, is_featured=False, renditions=renditions, base_url=base_url))
+
+    # Combine all posts for the component
+    all_posts = []
+    if featured_post:
+        all_posts.append(featured_post)
+    all_posts.extend(sidebar_posts)
+
+    # Handle section CTA
+    cta_data = None
+    if block_value.get('cta'):
+        cta = block_value['cta']
+        cta_text = cta.get('button_text', 'View all blog posts')
+        cta_link = '#'
+
+        if cta.get('is_external_link') and cta.get('external_url'):
+            cta_link = cta.get('external_url')
+        elif not cta.get('is_external_link') and cta.get('page_link'):
+            cta_link = page_urls.get_url(cta['page_link'], default='#')
+
+        cta_data = {
+            'text': cta_text,
+            'link': cta_link
+        }
+
+    return {
+        'section_title': block_value.get('section_title', 'Design and building tips from our blog'),
+        'posts': all_posts,
+        'cta': cta_data
+    }
@@ -4,6 +4,12 @@ This file defines the exact image sizes required by each frontend component
 to ensure crisp, properly sized images without blur or stretching.
 """
 
+from wagtail.blocks.list_block import ListValue
+from wagtail.models import ReferenceIndex
+
+from core.image_metadata import get_placeholder_data
+from core.renditions import RenditionResolver
+
 # Desktop breakpoint: 1400px max container
 # Tablet breakpoint: 768px - 1024px  
 # Mobile breakpoint: < 768px
@@ -99,12 +105,68 @@ COMPONENT_IMAGE_MAPPING = {
         'blog_additional.image': 'content_image',   # Additional small image in featured post
     },
     
+    # Snippet and page-level images outside StreamFields
+    'house_design': {
+        'featured_image': 'content_image',
+    },
+    'house_design_content': {
+        'image.image': 'content_image',
+        'image_gallery.images.image': 'media_comparator',
+    },
+    'house_designs_index': {
+        'hero_background_image': 'hero_background',
+    },
+    'page_hero': {
+        'image': 'hero_background',
+    },
+    # Shared content blocks (core.fields) of general and landing page bodies
+    'page_content': {
+        'image.image': 'content_image',
+        'fullwidth_image.image': 'hero_background',
+        'image_gallery.images.image': 'media_comparator',
+        'content_with_image.image': 'content_image',
+        'card_grid.cards.image': 'content_image',
+        'video.poster_image': 'video_poster',
+    },
+    
     # Default fallback
     'default': {
         'image': 'content_image',
     }
 }
 
+# Block value paths for mapped field paths that do not match the block
+# structure directly. Each entry lists candidate paths sharing one parent;
+# the first non-empty candidate is the image the serializer will use.
+IMAGE_FIELD_SOURCES = {
+    'hero': {
+        'slides.full_image': ('slides.full_image', 'slides.image'),
+    },
+    'blog_section': {
+        'blog_featured.image': ('featured_post.image',),
+        'blog_post.image': ('sidebar_posts.image',),
+        'blog_additional.image': ('featured_post.additional_image',),
+    },
+}
+
+# Image fields outside block StreamFields, keyed by (model label, reference
+# index model path), mapped to (component type, field path)
+MODEL_IMAGE_FIELDS = {
+    ('house_designs.housedesign', 'featured_image'): ('house_design', 'featured_image'),
+    ('house_designs.housedesignsindexpage', 'hero_background_image'): ('house_designs_index', 'hero_background_image'),
+    ('pages.generalpage', 'generalpage_hero.item.image'): ('page_hero', 'image'),
+    ('pages.landingpage', 'landingpage_hero.item.image'): ('page_hero', 'image'),
+}
+
+# StreamFields whose blocks all belong to one component, keyed by (model
+# label, field name), mapped to (component type, wrapper block type or None).
+# Other StreamFields (e.g. HomePage.body) use their block types as components.
+STREAM_FIELD_COMPONENTS = {
+    ('house_designs.housedesign', 'additional_content'): ('house_design_content', 'content'),
+    ('pages.generalpage', 'body'): ('page_content', None),
+    ('pages.landingpage', 'body'): ('page_content', None),
+}
+
 def get_image_renditions(component_type, field_path='image'):
     """
     Get the appropriate image renditions for a component type and field.
@@ -125,7 +187,93 @@ def get_image_renditions(component_type, field_path='image'):
     # Get the actual image config
     return IMAGE_CONFIGS.get(config_key, IMAGE_CONFIGS['content_image'])
 
-def generate_responsive_image_data(image_obj, component_type, field_path='image', base_url='http://127.0.0.1:8000'):
+def _iter_values(value, parts):
+    """Yield every value found at ``parts`` below ``value``, fanning out over lists."""
+    if isinstance(value, (list, tuple, ListValue)):
+        for item in value:
+            yield from _iter_values(item, parts)
+        return
+    
+    if not parts:
+        yield value
+        return
+    
+    child = value.get(parts[0]) if hasattr(value, 'get') else None
+    if child:
+        yield from _iter_values(child, parts[1:])
+
+def iter_block_images(component_type, block_value):
+    """
+    Yield (image, field_path) for every image a component will serialize.
+    
+    Args:
+        component_type (str): The block type (e.g., 'hero', 'blog_section')
+        block_value: StructValue of the block
+        
+    Yields:
+        tuple: (Wagtail Image object, mapped field path)
+    """
+    sources = IMAGE_FIELD_SOURCES.get(component_type, {})
+    
+    for field_path in COMPONENT_IMAGE_MAPPING.get(component_type, {}):
+        candidates = sources.get(field_path, (field_path,))
+        parent_parts = candidates[0].split('.')[:-1]
+        leaves = [candidate.rsplit('.', 1)[-1] for candidate in candidates]
+        
+        for parent in _iter_values(block_value, parent_parts):
+            for leaf in leaves:
+                image = parent.get(leaf) if hasattr(parent, 'get') else None
+                if image:
+                    yield image, field_path
+                    break
+
+def iter_component_stream_images(component_type, stream_value):
+    """
+    Yield (image, field_path) for a stream whose blocks all belong to one
+    component (see STREAM_FIELD_COMPONENTS); its field paths start with
+    the block type (e.g. 'image_gallery.images.image').
+    
+    Args:
+        component_type (str): COMPONENT_IMAGE_MAPPING key (e.g., 'page_content')
+        stream_value: StreamField (or StreamBlock) value
+        
+    Yields:
+        tuple: (Wagtail Image object, mapped field path)
+    """
+    field_paths = COMPONENT_IMAGE_MAPPING.get(component_type, {})
+    
+    for block in stream_value or []:
+        for field_path in field_paths:
+            parts = field_path.split('.')
+            if parts[0] != block.block_type:
+                continue
+            for parent in _iter_values(block.value, parts[1:-1]):
+                image = parent.get(parts[-1]) if hasattr(parent, 'get') else None
+                if image:
+                    yield image, field_path
+
+def collect_stream_renditions(stream_value, renditions):
+    """
+    Register every (image, spec) pair a StreamField value needs.
+    
+    Walks each block using COMPONENT_IMAGE_MAPPING so a single
+    ``renditions.resolve()`` call can fetch all renditions for the page.
+    
+    Args:
+        stream_value: StreamField value (e.g., page.body)
+        renditions (RenditionResolver): Resolver to register pairs with
+        
+    Returns:
+        RenditionResolver: The same resolver, for chaining
+    """
+    for block in stream_value or []:
+        for image, field_path in iter_block_images(block.block_type, block.value):
+            specs = get_image_renditions(block.block_type, field_path)
+            renditions.add(image, *specs.values())
+    
+    return renditions
+
+def generate_responsive_image_data(image_obj, component_type, field_path='image', base_url='http://127.0.0.1:8000', renditions=None):
     """
     Generate responsive image data for a Wagtail image object.
     
@@ -134,19 +282,98 @@ def generate_responsive_image_data(image_obj, component_type, field_path='image'
         component_type (str): Type of component using the image
         field_path (str): Path to the image field
         base_url (str): Base URL for the site
+        renditions (RenditionResolver): Resolver holding prefetched renditions (optional)
         
     Returns:
-        dict: Image data with src, desktop, tablet, mobile URLs and alt text
+        dict: Image data with src, desktop, tablet, mobile URLs, alt text and placeholder
     """
     if not image_obj:
         return None
         
-    renditions = get_image_renditions(component_type, field_path)
+    specs = get_image_renditions(component_type, field_path)
+    
+    if renditions is None:
+        renditions = RenditionResolver()
+        renditions.add(image_obj, *specs.values())
+        renditions.resolve()
+    
+    desktop_url = f"{base_url}{renditions.get(image_obj, specs['desktop']).url}"
     
     return {
-        'src': f"{base_url}{image_obj.get_rendition(renditions['desktop']).url}",
-        'desktop': f"{base_url}{image_obj.get_rendition(renditions['desktop']).url}",
-        'tablet': f"{base_url}{image_obj.get_rendition(renditions['tablet']).url}",
-        'mobile': f"{base_url}{image_obj.get_rendition(renditions['mobile']).url}",
+        'src': desktop_url,
+        'desktop': desktop_url,
+        'tablet': f"{base_url}{renditions.get(image_obj, specs['tablet']).url}",
+        'mobile': f"{base_url}{renditions.get(image_obj, specs['mobile']).url}",
         'alt': image_obj.title or 'Image',
-    }
\ No newline at end of file
+        **get_placeholder_data(image_obj),
+    }
+
+def _get_reference_usage(model_label, model_path):
+    """
+    Map a reference index entry to (component type, field path).
+    
+    Args:
+        model_label (str): Label of the referencing model (e.g., 'home.homepage')
+        model_path (str): Reference path (e.g., 'body.quality_homes.features.item.image')
+        
+    Returns:
+        tuple: (component type, path within the component), or None
+    """
+    if (model_label, model_path) in MODEL_IMAGE_FIELDS:
+        return MODEL_IMAGE_FIELDS[(model_label, model_path)]
+    
+    parts = [part for part in model_path.split('.') if part != 'item']
+    if len(parts) < 3:
+        return None
+    
+    component = STREAM_FIELD_COMPONENTS.get((model_label, parts[0]))
+    if component is None:
+        # Block StreamField: the top-level block type is the component
+        return parts[1], '.'.join(parts[2:])
+    
+    component_type, wrapper = component
+    parts = parts[1:]
+    if wrapper is not None:
+        if parts[0] != wrapper:
+            return None
+        parts = parts[1:]
+    return component_type, '.'.join(parts)
+
+def get_image_usage_specs(image):
+    """
+    Get every rendition spec an image needs, based on where it is used.
+    
+    Reads the Wagtail reference index, whose model paths look like
+    ``body.quality_homes.features.item.image`` or ``featured_image``, and
+    maps each usage back to its COMPONENT_IMAGE_MAPPING entry: block
+    StreamFields by block type, image foreign keys through
+    MODEL_IMAGE_FIELDS and component streams (house design content, page
+    bodies) through STREAM_FIELD_COMPONENTS.
+    
+    An image that is not referenced yet (e.g. just uploaded) gets the
+    default component's specs.
+    
+    Args:
+        image: Wagtail Image object
+        
+    Returns:
+        set: Rendition specifications
+    """
+    specs = set()
+    references = list(ReferenceIndex.get_references_to(image).select_related('content_type'))
+    if not references:
+        return set(get_image_renditions('default').values())
+    
+    for reference in references:
+        model_label = f"{reference.content_type.app_label}.{reference.content_type.model}"
+        usage = _get_reference_usage(model_label, reference.model_path)
+        if usage is None:
+            continue
+        
+        component_type, path = usage
+        sources = IMAGE_FIELD_SOURCES.get(component_type, {})
+        for field_path in COMPONENT_IMAGE_MAPPING.get(component_type, {}):
+            if path in sources.get(field_path, (field_path,)):
+                specs.update(get_image_renditions(component_type, field_path).values())
+    
+    return specs
@@ -0,0 +1,250 @@
+"""
+Export the API responses used by the React frontend as static JSON files.
+
+Renders each response through the normal URL routing (so the files match
+what the live API returns byte for byte) and writes them into a directory
+tree a CDN can serve without a Django process:
+
+    <output>/site-settings.json            /api/v2/site-settings/
+    <output>/pages/home.json               homepage fields query
+    <output>/pages/house-designs/<slug>.json
+                                           house designs page by slug
+    <output>/house-designs.json            /api/v2/house-designs/ (card fields)
+    <output>/house-designs.<n>.json        further listing pages, if any
+    <output>/house-designs/<slug>.json     /api/v2/house-designs/<slug>/
+    <output>/manifest.json                 export state, see below
+
+The manifest records, for every file, the source URL and the state of the
+content it was rendered from (live revision and snapshot build time of each
+page, the last update of each published design plus the dependency
+versions of its category, location and featured image, or the site
+settings version). Later runs only re-render files whose
+state changed and remove files whose pages are gone; --full re-renders
+everything.
+
+Usage:
+    python manage.py export_static_api build/api --base-url https://cms.example.com
+"""
+
+import hashlib
+import json
+import os
+import time
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.utils import timezone
+from wagtail.models import Site
+
+from core.cache import get_dependency_versions, image_tag, model_tag
+from core.models import PageSnapshot
+from core.site_settings import get_site_settings_payload
+from core.utils import get_base_url
+from home.models import HomePage
+from house_designs.models import BuildLocation, HouseCategory, HouseDesign, HouseDesignsIndexPage
+
+
+MANIFEST_NAME = 'manifest.json'
+
+# Query strings used by the frontend (services/api.ts, hooks/useHouseDesigns.ts)
+HOME_QUERY = {
+    'type': 'home.HomePage',
+    'fields': 'title,hero_section_data,body_content_data',
+    'limit': 1,
+}
+
+HOUSE_DESIGNS_QUERY = {
+    'type': 'house_designs.HouseDesignsIndexPage',
+    'fields': '*',
+}
+
+# HOUSE_DESIGN_CARD_FIELDS in services/api.ts
+HOUSE_DESIGN_LISTING_QUERY = {
+    'fields': 'name,slug,thumbnail,pricing',
+}
+
+
+def get_page_states(pages):
+    """
+    Describe the exported state of pages, with one snapshot query.
+
+    Args:
+        pages (list): Page objects
+
+    Returns:
+        dict: [live revision id, snapshot build time] keyed by str(page id)
+    """
+    built = dict(
+        PageSnapshot.objects.filter(page__in=pages).values_list('page_id', 'built_at')
+    )
+    return {
+        str(page.pk): [page.live_revision_id, built[page.pk].isoformat() if page.pk in built else None]
+        for page in pages
+    }
+
+
+def get_design_states():
+    """
+    Describe the exported state of the published house designs.
+
+    Categories, locations and featured images are edited on their own, so
+    each state also holds their dependency versions (see core.cache).
+
+    Returns:
+        dict: [last update time, versions keyed by tag] keyed by design
+        slug, in listing order
+    """
+    rows = list(
+        HouseDesign.objects.filter(is_published=True)
+        .order_by('id')
+        .values_list('slug', 'updated_at', 'featured_image_id')
+    )
+    shared_tags = [model_tag(HouseCategory), model_tag(BuildLocation)]
+    versions = get_dependency_versions(
+        shared_tags + [image_tag(image_id) for _, _, image_id in rows if image_id]
+    )
+
+    states = {}
+    for slug, updated_at, image_id in rows:
+        tags = shared_tags + ([image_tag(image_id)] if image_id else [])
+        states[slug] = [updated_at.isoformat(), {tag: versions[tag] for tag in tags}]
+    return states
+
+
+def get_export_targets():
+    """
+    List the files to export.
+
+    Returns:
+        dict: {'url', 'state'} keyed by file path relative to the output directory
+    """
+    root = Site.objects.get(is_default_site=True).root_page
+    targets = {
+        'site-settings.json': {
+            'url': '/api/v2/site-settings/',
+            'state': get_site_settings_payload()['version'],
+        },
+    }
+
+    home_pages = list(HomePage.objects.live().descendant_of(root, inclusive=True))
+    if home_pages:
+        targets['pages/home.json'] = {
+            'url': f"/api/v2/pages/?{urlencode(HOME_QUERY)}",
+            'state': get_page_states(home_pages),
+        }
+
+    # The designs page embeds the designs, so it changes with them as well
+    designs = get_design_states()
+    for page in HouseDesignsIndexPage.objects.live().descendant_of(root):
+        targets[f"pages/house-designs/{page.slug}.json"] = {
+            'url': f"/api/v2/pages/?{urlencode({**HOUSE_DESIGNS_QUERY, 'slug': page.slug})}",
+            'state': [get_page_states([page]), designs],
+        }
+
+    # Every listing page depends on every design (sort order and counts)
+    limit = getattr(settings, 'WAGTAILAPI_LIMIT_MAX', 20) or max(len(designs), 1)
+    for number, offset in enumerate(range(0, max(len(designs), 1), limit), 1):
+        query = {**HOUSE_DESIGN_LISTING_QUERY, 'limit': limit, 'offset': offset}
+        targets['house-designs.json' if number == 1 else f"house-designs.{number}.json"] = {
+            'url': f"/api/v2/house-designs/?{urlencode(query)}",
+            'state': designs,
+        }
+
+    for slug, state in designs.items():
+        targets[f"house-designs/{slug}.json"] = {
+            'url': f"/api/v2/house-designs/{slug}/",
+            'state': state,
+        }
+
+    return targets
+
+
+def write_file(path, content):
+    """Write a file atomically, so a CDN sync never picks up a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def load_manifest(output):
+    try:
+        with open(os.path.join(output, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+class Command(BaseCommand):
+    help = "Export the frontend's API responses as static JSON files for CDN hosting"
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help="Directory to write the JSON files to")
+        parser.add_argument(
+            '--base-url',
+            default=None,
+            help="Public URL of the CMS, used for absolute media links (default: settings.BASE_URL)",
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help="Re-render every file instead of only the changed ones",
+        )
+
+    def handle(self, *args, **options):
+        output = options['output']
+        base_url = (options['base_url'] or get_base_url(None)).rstrip('/')
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https') or not parts.netloc:
+            raise CommandError(f"Invalid base URL: {base_url}")
+
+        previous = load_manifest(output)
+        previous_files = previous.get('files', {})
+        if options['full'] or previous.get('base_url') != base_url:
+            previous_files = {}
+
+        started = time.monotonic()
+        client = Client(HTTP_HOST=parts.netloc, secure=parts.scheme == 'https')
+        targets = get_export_targets()
+        files = {}
+        written = 0
+
+        for path, target in targets.items():
+            entry = previous_files.get(path)
+            if entry and entry['url'] == target['url'] and entry['state'] == target['state']:
+                files[path] = entry
+                continue
+
+            response = client.get(target['url'])
+            if response.status_code != 200:
+                raise CommandError(f"{target['url']} returned {response.status_code}")
+
+            content = response.content
+            write_file(os.path.join(output, path), content)
+            files[path] = {**target, 'sha1': hashlib.sha1(content).hexdigest()}
+            written += 1
+            self.stdout.write(f"  {path}")
+
+        removed = 0
+        for path in set(previous.get('files', {})) - set(files):
+            try:
+                os.remove(os.path.join(output, path))
+            except FileNotFoundError:
+                pass
+            removed += 1
+
+        manifest = {
+            'base_url': base_url,
+            'exported_at': timezone.now().isoformat(),
+            'files': files,
+        }
+        write_file(os.path.join(output, MANIFEST_NAME), json.dumps(manifest, indent=2).encode('utf-8'))
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {written} files ({len(files) - written} unchanged, {removed} removed) "
+            f"in {elapsed:.1f}s"
+        ))
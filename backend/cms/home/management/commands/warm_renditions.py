@@ -0,0 +1,165 @@
+"""
+Pre-generate every image rendition the headless API serves.
+
+Discovers (image, spec) pairs from live HomePages, house designs (featured
+images and additional_content), the house designs index hero, and general
+and landing page heroes and bodies using COMPONENT_IMAGE_MAPPING, skips
+pairs that already have a rendition, and generates the rest in worker
+processes. Renditions are saved as each image finishes, so an interrupted
+run simply picks up where it stopped when started again.
+
+Usage:
+    python manage.py warm_renditions --workers 4
+"""
+
+import time
+from concurrent.futures import as_completed
+
+from django.core.management.base import BaseCommand
+from wagtail.images import get_image_model
+
+from core.renditions import RenditionResolver, create_rendition_executor, generate_renditions
+from home.image_config import (
+    STREAM_FIELD_COMPONENTS,
+    collect_stream_renditions,
+    get_image_renditions,
+    iter_component_stream_images,
+)
+from home.models import HomePage
+from house_designs.block_serializers import collect_content_renditions
+from house_designs.models import HouseDesign, HouseDesignsIndexPage
+from pages.models import GeneralPage, GeneralPageHero, LandingPage, LandingPageHero
+
+
+def collect_api_renditions():
+    """
+    Register every (image, spec) pair the API will request.
+
+    Returns:
+        RenditionResolver: Resolver holding the pairs (not resolved)
+    """
+    renditions = RenditionResolver()
+
+    def add(image, component_type, field_path):
+        renditions.add(image, *get_image_renditions(component_type, field_path).values())
+
+    for page in HomePage.objects.live().specific():
+        collect_stream_renditions(page.hero_section, renditions)
+        collect_stream_renditions(page.body, renditions)
+
+    for design in HouseDesign.objects.filter(is_published=True).select_related('featured_image'):
+        add(design.featured_image, 'house_design', 'featured_image')
+        collect_content_renditions(design.additional_content, renditions)
+
+    for page in HouseDesignsIndexPage.objects.live().select_related('hero_background_image'):
+        add(page.hero_background_image, 'house_designs_index', 'hero_background_image')
+
+    for hero_model in (GeneralPageHero, LandingPageHero):
+        for hero in hero_model.objects.filter(page__live=True).select_related('image'):
+            add(hero.image, 'page_hero', 'image')
+
+    for page_model in (GeneralPage, LandingPage):
+        component_type, _ = STREAM_FIELD_COMPONENTS[(page_model._meta.label_lower, 'body')]
+        for page in page_model.objects.live():
+            for image, field_path in iter_component_stream_images(component_type, page.body):
+                add(image, component_type, field_path)
+
+    return renditions
+
+
+def get_missing_renditions(specs_by_image):
+    """
+    Drop pairs that already have a rendition, using one query.
+
+    Args:
+        specs_by_image (dict): Specs keyed by image primary key
+
+    Returns:
+        dict: Specs still to generate, keyed by image primary key
+    """
+    Rendition = get_image_model().get_rendition_model()
+    all_specs = {spec for specs in specs_by_image.values() for spec in specs}
+
+    existing = set(
+        Rendition.objects.filter(
+            image_id__in=list(specs_by_image), filter_spec__in=all_specs
+        ).values_list('image_id', 'filter_spec')
+    )
+
+    missing = {
+        image_id: [spec for spec in specs if (image_id, spec) not in existing]
+        for image_id, specs in specs_by_image.items()
+    }
+    return {image_id: specs for image_id, specs in missing.items() if specs}
+
+
+class Command(BaseCommand):
+    help = "Pre-generate image renditions for every image served by the API"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=2,
+            help="Number of worker processes (0 generates in this process)",
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only report how many renditions are missing",
+        )
+
+    def handle(self, *args, **options):
+        specs_by_image = collect_api_renditions().specs_by_image
+        total = sum(len(specs) for specs in specs_by_image.values())
+
+        missing = get_missing_renditions(specs_by_image)
+        pending = sum(len(specs) for specs in missing.values())
+
+        self.stdout.write(
+            f"{total} renditions across {len(specs_by_image)} images, "
+            f"{total - pending} already exist, {pending} to generate"
+        )
+        if options['dry_run'] or not pending:
+            return
+
+        started = time.monotonic()
+        done = 0
+
+        if options['workers'] > 0:
+            executor = create_rendition_executor(options['workers'])
+            futures = {
+                executor.submit(generate_renditions, image_id, specs): image_id
+                for image_id, specs in missing.items()
+            }
+            try:
+                for future in as_completed(futures):
+                    image_id = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        self.stderr.write(f"Image {image_id} failed: {e}")
+                        continue
+                    done += len(missing[image_id])
+                    self._report(done, pending, started)
+            except KeyboardInterrupt:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self.stderr.write(f"Interrupted after {done} renditions; run again to resume")
+                raise
+            executor.shutdown()
+        else:
+            for image_id, specs in missing.items():
+                generate_renditions(image_id, specs)
+                done += len(specs)
+                self._report(done, pending, started)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {done} renditions in {elapsed:.1f}s "
+            f"({done / elapsed if elapsed else done:.1f}/s)"
+        ))
+
+    def _report(self, done, pending, started):
+        elapsed = time.monotonic() - started
+        rate = done / elapsed if elapsed else done
+        self.stdout.write(f"  {done}/{pending} renditions ({rate:.1f}/s)")
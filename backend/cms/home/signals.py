@@ -0,0 +1,43 @@
+"""
+Signal handlers for Home App - ahead-of-time rendition generation
+"""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from wagtail.images import get_image_model
+from wagtail.signals import page_published
+
+from core.renditions import RenditionResolver, enqueue_renditions
+from home.image_config import collect_stream_renditions, get_image_usage_specs
+from home.models import HomePage
+
+
+def _enqueue_image_usage(image_id):
+    Image = get_image_model()
+    image = Image.objects.filter(pk=image_id).first()
+    if image:
+        enqueue_renditions(image.pk, get_image_usage_specs(image))
+
+
+@receiver(post_save, sender=get_image_model())
+def generate_image_renditions(sender, instance, **kwargs):
+    """Pre-generate renditions for every block an uploaded or edited image is used in."""
+    transaction.on_commit(partial(_enqueue_image_usage, instance.pk))
+
+
+def _enqueue_page_renditions(specs_by_image):
+    for image_id, specs in specs_by_image.items():
+        enqueue_renditions(image_id, specs)
+
+
+@receiver(page_published, sender=HomePage)
+def generate_homepage_renditions(sender, instance, **kwargs):
+    """Pre-generate every rendition a newly published HomePage will serve."""
+    renditions = RenditionResolver()
+    collect_stream_renditions(instance.hero_section, renditions)
+    collect_stream_renditions(instance.body, renditions)
+
+    transaction.on_commit(partial(_enqueue_page_renditions, renditions.specs_by_image))
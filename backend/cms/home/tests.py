@@ -1,7 +1,24 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django.urls import reverse
+from home.image_config import IMAGE_CONFIGS, get_image_usage_specs
 from home.models import HomePage
+from core.cache import get_payload_cache_key
+from house_designs.models import HouseCategory, HouseDesign, HouseDesignsIndexPage
+from pages.models import GeneralPage
+from core.renditions import RenditionResolver, generate_renditions
+from home.block_serializers import home_blocks
 
-from wagtail.models import Page
+from wagtail.images.models import Image
+from wagtail.images.tests.utils import get_test_image_file
+from wagtail.models import Page, Site
 from wagtail.test.utils import WagtailPageTestCase
 
 
@@ -41,3 +58,673 @@ class HomeTests(WagtailPageTestCase):
     def test_homepage_template_used(self):
         response = self.client.get(reverse("home"))
         self.assertTemplateUsed(response, "home/home_page.html")
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), RENDITION_WORKERS=0)
+class RenditionResolverTests(TestCase):
+    """
+    Tests for bulk rendition resolution across many images.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.images = [
+            Image.objects.create(title=f"Image {i}", file=get_test_image_file())
+            for i in range(3)
+        ]
+        self.specs = ['fill-40x30', 'fill-80x60']
+
+    def test_warm_renditions_resolve_in_two_queries(self):
+        cold = RenditionResolver()
+        for image in self.images:
+            cold.add(image, *self.specs)
+        cold.resolve()
+
+        warm = RenditionResolver()
+        for image in Image.objects.filter(pk__in=[image.pk for image in self.images]):
+            warm.add(image, *self.specs)
+        # One query for renditions, one for placeholder metadata
+        with self.assertNumQueries(2):
+            warm.resolve()
+
+        for image in self.images:
+            for spec in self.specs:
+                self.assertEqual(warm.get(image, spec).filter_spec, spec)
+
+    def test_body_content_data_collects_every_block_image(self):
+        features = [
+            {'icon': '✓', 'title': f"Feature {i}", 'description': '', 'image': image.pk}
+            for i, image in enumerate(self.images)
+        ]
+        homepage = HomePage(
+            title="Home",
+            body=json.dumps([{'type': 'quality_homes', 'value': {'main_title': 'Quality', 'features': features}}]),
+        )
+        Page.objects.get(pk=1).add_child(instance=homepage)
+
+        data = HomePage.objects.get(pk=homepage.pk).body_content_data
+
+        self.assertEqual(len(data[0]['value']['features']), 3)
+        image_data = data[0]['value']['features'][0]['image']
+        self.assertTrue(image_data['placeholder'].startswith('data:image/webp;base64,'))
+        self.assertRegex(image_data['dominant_color'], r'^#[0-9a-f]{6}$')
+        expected = set(IMAGE_CONFIGS['content_image'].values())
+        for image in self.images:
+            self.assertEqual(
+                set(image.renditions.values_list('filter_spec', flat=True)), expected
+            )
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), RENDITION_WORKERS=0)
+class HomePayloadCacheTests(TestCase):
+    """
+    Tests for the cached hero/body API payloads.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.image = Image.objects.create(title="Journey", file=get_test_image_file())
+        self.homepage = HomePage(
+            title="Home",
+            body=json.dumps([{'type': 'dream_home_journey', 'value': {
+                'title': 'Journey',
+                'description': 'Start here',
+                'background_image': self.image.pk,
+                'primary_cta': {'button_text': 'Go'},
+                'secondary_cta': {'button_text': 'Later'},
+            }}]),
+        )
+        Page.objects.get(pk=1).add_child(instance=self.homepage)
+
+    def test_repeat_access_is_served_from_cache(self):
+        first = HomePage.objects.get(pk=self.homepage.pk).body_content_data
+
+        page = HomePage.objects.get(pk=self.homepage.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(page.body_content_data, first)
+
+    def test_image_change_invalidates_payload(self):
+        HomePage.objects.get(pk=self.homepage.pk).body_content_data
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.image.title = "Renamed"
+            self.image.save()
+
+        data = HomePage.objects.get(pk=self.homepage.pk).body_content_data
+        self.assertEqual(data[0]['value']['background_image']['alt'], "Renamed")
+
+    def test_publish_invalidates_payload(self):
+        page = HomePage.objects.get(pk=self.homepage.pk)
+        page.body_content_data
+        key = get_payload_cache_key(page, 'body_content_data')
+
+        page.save_revision().publish()
+
+        self.assertNotEqual(get_payload_cache_key(HomePage.objects.get(pk=page.pk), 'body_content_data'), key)
+
+    def test_dependency_lists_do_not_grow(self):
+        HomePage.objects.get(pk=self.homepage.pk).body_content_data
+
+        for title in ["One", "Two", "Three"]:
+            self.image.title = title
+            self.image.save()
+            HomePage.objects.get(pk=self.homepage.pk).body_content_data
+
+        page = HomePage.objects.get(pk=self.homepage.pk)
+        tags = cache.get(f"{get_payload_cache_key(page, 'body_content_data')}:dependencies")
+        self.assertEqual(len(tags), len(set(tags)))
+        self.assertIn(f"image:{self.image.pk}", tags)
+        self.assertIsNone(cache.get(f"api-payload-tag:image:{self.image.pk}"))
+
+
+class HeroLinkInvalidationTests(TestCase):
+    """
+    Tests for hero payloads that link to other pages.
+    """
+
+    def setUp(self):
+        cache.clear()
+        root = Site.objects.get(is_default_site=True).root_page
+        self.target = root.add_child(instance=HomePage(title="Target", slug="target"))
+        self.other = root.add_child(instance=HomePage(title="Other", slug="other"))
+        self.homepage = HomePage(
+            title="Hero",
+            slug="hero",
+            hero_section=json.dumps([{'type': 'hero', 'value': {
+                'slides': [{'type': 'item', 'id': 'slide-1', 'value': {
+                    'title': 'Slide',
+                    'button_text': 'Go',
+                    'is_external_link': False,
+                    'page_link': self.target.pk,
+                }}],
+            }}]),
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            root.add_child(instance=self.homepage)
+            self.homepage.save_revision().publish()
+
+    def get_button_url(self):
+        response = self.client.get('/api/v2/pages/', {'type': 'home.HomePage', 'fields': 'hero_section_data'})
+        item = next(item for item in response.json()['items'] if item['id'] == self.homepage.pk)
+        return item['hero_section_data']['slides'][0]['button']['url']
+
+    def test_renaming_linked_page_updates_payload(self):
+        self.assertEqual(self.get_button_url(), '/target/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.target.slug = 'renamed'
+            self.target.save_revision().publish()
+
+        self.assertEqual(self.get_button_url(), '/renamed/')
+
+    def test_moving_linked_page_updates_payload(self):
+        self.assertEqual(self.get_button_url(), '/target/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Page.objects.get(pk=self.target.pk).move(self.other, pos='last-child')
+
+        self.assertEqual(self.get_button_url(), '/other/target/')
+
+    def test_site_change_updates_payload(self):
+        self.assertEqual(self.get_button_url(), '/target/')
+
+        # With a second site, links carry their site's root URL
+        with self.captureOnCommitCallbacks(execute=True):
+            Site.objects.create(hostname='other.test', root_page=self.other)
+
+        self.assertEqual(self.get_button_url(), 'http://localhost/target/')
+
+    def test_renaming_parent_of_linked_page_updates_payload(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            child = self.other.add_child(instance=HomePage(title="Child", slug="child"))
+            self.homepage.hero_section = json.dumps([{'type': 'hero', 'value': {
+                'slides': [{'type': 'item', 'id': 'slide-1', 'value': {
+                    'title': 'Slide',
+                    'button_text': 'Go',
+                    'is_external_link': False,
+                    'page_link': child.pk,
+                }}],
+            }}])
+            self.homepage.save_revision().publish()
+        self.assertEqual(self.get_button_url(), '/other/child/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.slug = 'renamed'
+            self.other.save_revision().publish()
+
+        self.assertEqual(self.get_button_url(), '/renamed/child/')
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), RENDITION_WORKERS=0)
+class AheadOfTimeRenditionTests(TestCase):
+    """
+    Tests for rendition generation after uploads and publishes.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.image = Image.objects.create(title="Feature", file=get_test_image_file())
+        self.homepage = HomePage(
+            title="Home",
+            body=json.dumps([{'type': 'quality_homes', 'value': {
+                'main_title': 'Quality',
+                'features': [{'icon': '✓', 'title': 'Feature', 'description': '', 'image': self.image.pk}],
+            }}]),
+        )
+        # The reference index is updated once the page save commits
+        with self.captureOnCommitCallbacks(execute=True):
+            Page.objects.get(pk=1).add_child(instance=self.homepage)
+
+    def test_usage_specs_follow_block_mapping(self):
+        self.assertEqual(
+            get_image_usage_specs(self.image), set(IMAGE_CONFIGS['content_image'].values())
+        )
+
+    def test_unused_image_gets_default_specs(self):
+        image = Image.objects.create(title="Unused", file=get_test_image_file())
+        self.assertEqual(get_image_usage_specs(image), set(IMAGE_CONFIGS['content_image'].values()))
+
+    def test_usage_specs_cover_fields_outside_block_streams(self):
+        image = Image.objects.create(title="Design", file=get_test_image_file())
+        with self.captureOnCommitCallbacks(execute=True):
+            HouseDesign.objects.create(
+                name="Aira", slug="aira", bedrooms=3, bathrooms=2, featured_image=image,
+                additional_content=json.dumps([{'type': 'content', 'value': [
+                    {'type': 'image_gallery', 'value': {'layout': 'grid', 'images': [
+                        {'type': 'item', 'id': 'photo-1', 'value': {'image': image.pk}},
+                    ]}},
+                ]}]),
+            )
+            Site.objects.get(is_default_site=True).root_page.add_child(instance=GeneralPage(
+                title="About", slug="about",
+                body=json.dumps([{'type': 'fullwidth_image', 'value': {'image': image.pk}}]),
+            ))
+
+        self.assertEqual(get_image_usage_specs(image), {
+            *IMAGE_CONFIGS['content_image'].values(),
+            *IMAGE_CONFIGS['media_comparator'].values(),
+            *IMAGE_CONFIGS['hero_background'].values(),
+        })
+
+    def test_generate_renditions_creates_missing_renditions(self):
+        specs = list(IMAGE_CONFIGS['content_image'].values())
+
+        self.assertEqual(generate_renditions(self.image.pk, specs), 3)
+        self.assertEqual(self.image.renditions.count(), 3)
+        self.assertEqual(generate_renditions(0, specs), 0)
+
+    def test_image_save_enqueues_usage_specs(self):
+        with mock.patch('home.signals.enqueue_renditions') as enqueue:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.image.save()
+
+        enqueue.assert_called_once_with(self.image.pk, set(IMAGE_CONFIGS['content_image'].values()))
+
+    def test_publish_enqueues_page_renditions(self):
+        page = HomePage.objects.get(pk=self.homepage.pk)
+        with mock.patch('home.signals.enqueue_renditions') as enqueue:
+            with self.captureOnCommitCallbacks(execute=True):
+                page.save_revision().publish()
+
+        enqueue.assert_called_once_with(self.image.pk, list(IMAGE_CONFIGS['content_image'].values()))
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), RENDITION_WORKERS=0)
+class WarmRenditionsCommandTests(TestCase):
+    """
+    Tests for the warm_renditions management command.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.image = Image.objects.create(title="Journey", file=get_test_image_file())
+        self.design_image = Image.objects.create(title="Design", file=get_test_image_file())
+        homepage = HomePage(
+            title="Home",
+            body=json.dumps([{'type': 'dream_home_journey', 'value': {
+                'title': 'Journey',
+                'background_image': self.image.pk,
+                'primary_cta': {'button_text': 'Go'},
+                'secondary_cta': {'button_text': 'Later'},
+            }}]),
+        )
+        Page.objects.get(pk=1).add_child(instance=homepage)
+        HouseDesign.objects.create(
+            name="Alpha", slug="alpha", bedrooms=3, bathrooms=2, featured_image=self.design_image
+        )
+
+    def warm(self):
+        out = StringIO()
+        call_command('warm_renditions', workers=0, stdout=out)
+        return out.getvalue()
+
+    def test_generates_mapped_renditions(self):
+        output = self.warm()
+
+        self.assertIn("6 to generate", output)
+        self.assertEqual(
+            set(self.image.renditions.values_list('filter_spec', flat=True)),
+            set(IMAGE_CONFIGS['hero_background'].values()),
+        )
+        self.assertEqual(
+            set(self.design_image.renditions.values_list('filter_spec', flat=True)),
+            set(IMAGE_CONFIGS['content_image'].values()),
+        )
+
+    def test_rerun_skips_existing_renditions(self):
+        self.image.get_rendition(IMAGE_CONFIGS['hero_background']['desktop'])
+
+        self.assertIn("1 already exist, 5 to generate", self.warm())
+        self.assertIn("6 already exist, 0 to generate", self.warm())
+
+    def test_warms_design_content_and_page_bodies(self):
+        gallery_image = Image.objects.create(title="Gallery", file=get_test_image_file())
+        body_image = Image.objects.create(title="Body", file=get_test_image_file())
+        HouseDesign.objects.filter(slug='alpha').update(additional_content=json.dumps([
+            {'type': 'content', 'value': [
+                {'type': 'image_gallery', 'value': {'layout': 'grid', 'images': [
+                    {'type': 'item', 'id': 'photo-1', 'value': {'image': gallery_image.pk}},
+                ]}},
+            ]},
+        ]))
+        Site.objects.get(is_default_site=True).root_page.add_child(instance=GeneralPage(
+            title="About", slug="about",
+            body=json.dumps([{'type': 'image', 'value': {'image': body_image.pk}}]),
+        ))
+
+        self.assertIn("12 to generate", self.warm())
+        self.assertEqual(
+            set(gallery_image.renditions.values_list('filter_spec', flat=True)),
+            set(IMAGE_CONFIGS['media_comparator'].values()),
+        )
+        self.assertEqual(
+            set(body_image.renditions.values_list('filter_spec', flat=True)),
+            set(IMAGE_CONFIGS['content_image'].values()),
+        )
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), RENDITION_WORKERS=0)
+class BlockSerializerMemoizationTests(TestCase):
+    """
+    Tests for per-block memoization of HomePage body serialization.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.image = Image.objects.create(title="Journey", file=get_test_image_file())
+        self.homepage = HomePage(
+            title="Home",
+            body=json.dumps([
+                {'type': 'dream_home_journey', 'value': {
+                    'title': 'Journey',
+                    'background_image': self.image.pk,
+                    'primary_cta': {'button_text': 'Go'},
+                    'secondary_cta': {'button_text': 'Later'},
+                }},
+                {'type': 'quality_homes', 'value': {'main_title': 'Quality', 'features': []}},
+            ]),
+        )
+        Page.objects.get(pk=1).add_child(instance=self.homepage)
+
+    def serialized_block_types(self):
+        page = HomePage.objects.get(pk=self.homepage.pk)
+        with mock.patch.object(home_blocks, 'serialize_block', wraps=home_blocks.serialize_block) as serialize:
+            data = page.body_content_data
+        return data, [call.args[0].block_type for call in serialize.call_args_list]
+
+    def test_editing_one_block_reserializes_only_that_block(self):
+        self.assertEqual(len(self.serialized_block_types()[1]), 2)
+
+        page = HomePage.objects.get(pk=self.homepage.pk)
+        page.body[1].value['main_title'] = 'Still quality'
+        page.save_revision().publish()
+
+        data, serialized = self.serialized_block_types()
+        self.assertEqual(serialized, ['quality_homes'])
+        self.assertEqual(data[1]['value']['main_title'], 'Still quality')
+        self.assertEqual(data[0]['value']['title'], 'Journey')
+
+    def test_image_change_reserializes_only_blocks_using_it(self):
+        self.serialized_block_types()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.image.title = "Renamed"
+            self.image.save()
+
+        data, serialized = self.serialized_block_types()
+        self.assertEqual(serialized, ['dream_home_journey'])
+        self.assertEqual(data[0]['value']['background_image']['alt'], "Renamed")
+
+    def test_moving_page_linked_from_rich_text_reserializes_block(self):
+        root = Site.objects.get(is_default_site=True).root_page
+        target = root.add_child(instance=HomePage(title="Target", slug="target"))
+        page = HomePage.objects.get(pk=self.homepage.pk)
+        page.body = json.dumps(list(page.body.raw_data) + [{'type': 'multi_image_content', 'value': {
+            'section_title': 'Studio',
+            'description': f'<p><a linktype="page" id="{target.pk}">Visit</a></p>',
+            'images': [],
+        }}])
+        page.save_revision().publish()
+        self.serialized_block_types()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            target.slug = 'renamed'
+            target.save_revision().publish()
+
+        self.assertEqual(self.serialized_block_types()[1], ['multi_image_content'])
+
+
+class WindowedBodyAPITests(TestCase):
+    """
+    Tests for windowed body_content_data delivery and the body manifest.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.homepage = HomePage(
+            title="Home",
+            slug="windowed-home",
+            body=json.dumps([
+                {'type': 'quality_homes', 'value': {'main_title': f'Block {i}', 'features': []}}
+                for i in range(4)
+            ]),
+        )
+        Site.objects.get(is_default_site=True).root_page.add_child(instance=self.homepage)
+        self.url = f"/api/v2/pages/{self.homepage.pk}/"
+
+    def get_body(self, **params):
+        response = self.client.get(self.url, {'fields': 'body_content_data,body_manifest', **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_manifest_lists_every_block(self):
+        data = self.get_body(body_count=0)
+
+        self.assertEqual(data['body_content_data'], [])
+        self.assertEqual(
+            [block['id'] for block in data['body_manifest']],
+            [f"quality_homes_{block.id}" for block in self.homepage.body],
+        )
+
+    def test_offset_and_count_select_a_window(self):
+        data = self.get_body(body_offset=1, body_count=2)
+
+        self.assertEqual(
+            [block['value']['main_title'] for block in data['body_content_data']],
+            ['Block 1', 'Block 2'],
+        )
+
+    def test_block_ids_select_blocks(self):
+        manifest = self.get_body()['body_manifest']
+
+        data = self.get_body(body_id=f"{manifest[3]['id']},{manifest[0]['id']}")
+
+        self.assertEqual(
+            [block['id'] for block in data['body_content_data']],
+            [manifest[0]['id'], manifest[3]['id']],
+        )
+
+    def test_windows_are_not_cached_as_payloads(self):
+        self.get_body(body_offset=0)
+
+        with mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+            for offset in range(3):
+                self.get_body(body_offset=offset, body_count=1)
+                self.get_body(body_id=f"missing-{offset}")
+
+        payload_keys = [call.args[0] for call in cache_set.call_args_list if call.args[0].startswith('api-payload')]
+        self.assertEqual(payload_keys, [])
+
+    def test_invalid_window_is_rejected(self):
+        response = self.client.get(self.url, {'fields': 'body_content_data', 'body_offset': 'x'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_streamed_body_matches_detail_view(self):
+        expected = self.get_body(body_offset=1)
+
+        response = self.client.get(f"{self.url}body/", {'body_offset': 1})
+
+        self.assertTrue(response.streaming)
+        self.assertIn('ETag', response)
+        streamed = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(streamed['body_content_data'], expected['body_content_data'])
+        self.assertEqual(streamed['body_manifest'], expected['body_manifest'])
+
+    def test_streamed_body_is_serialized_lazily(self):
+        response = self.client.get(f"{self.url}body/")
+
+        with mock.patch.object(home_blocks, 'serialize_block', wraps=home_blocks.serialize_block) as serialize:
+            chunks = iter(response.streaming_content)
+            next(chunks)
+            self.assertEqual(serialize.call_count, 0)
+            b''.join(chunks)
+        self.assertEqual(serialize.call_count, 4)
+
+
+class StaticExportCommandTests(TestCase):
+    """
+    Tests for the export_static_api management command.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.output = tempfile.mkdtemp()
+        self.homepage = Site.objects.get(is_default_site=True).root_page.specific
+        with self.captureOnCommitCallbacks(execute=True):
+            self.homepage.save_revision().publish()
+            self.designs_page = HouseDesignsIndexPage(title="Designs", slug="home-design")
+            self.homepage.add_child(instance=self.designs_page)
+            self.designs_page.save_revision().publish()
+            self.design = HouseDesign.objects.create(name="Aira", slug="aira", bedrooms=3, bathrooms=2)
+
+    def export(self, *args):
+        out = StringIO()
+        call_command('export_static_api', self.output, '--base-url', 'http://testserver', *args, stdout=out)
+        return out.getvalue()
+
+    def read(self, path):
+        with open(os.path.join(self.output, path)) as f:
+            return json.load(f)
+
+    def test_exports_frontend_responses(self):
+        self.export()
+
+        self.assertEqual(self.read('pages/home.json')['items'][0]['title'], "Home")
+        designs = self.read('pages/house-designs/home-design.json')['items'][0]
+        self.assertIn('house_designs_data', designs)
+        self.assertIn('header', self.read('site-settings.json'))
+        self.assertEqual(
+            [item['slug'] for item in self.read('house-designs.json')['items']], ['aira'],
+        )
+        self.assertEqual(self.read('house-designs/aira.json')['name'], "Aira")
+        self.assertEqual(
+            set(self.read('manifest.json')['files']),
+            {
+                'site-settings.json', 'pages/home.json', 'pages/house-designs/home-design.json',
+                'house-designs.json', 'house-designs/aira.json',
+            },
+        )
+
+    def test_rerun_only_exports_changed_pages(self):
+        self.export()
+
+        self.assertIn("Exported 0 files (5 unchanged", self.export())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.homepage.title = "New home"
+            self.homepage.save_revision().publish()
+
+        output = self.export()
+        self.assertIn("Exported 1 files (4 unchanged", output)
+        self.assertEqual(self.read('pages/home.json')['items'][0]['title'], "New home")
+
+    def test_rerun_exports_changed_designs(self):
+        self.export()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.design.name = "Aira II"
+            self.design.save()
+
+        # The listing, the design and the designs page that embeds it
+        output = self.export()
+        self.assertIn("Exported 3 files (2 unchanged", output)
+        self.assertEqual(self.read('house-designs/aira.json')['name'], "Aira II")
+        self.assertEqual(self.read('house-designs.json')['items'][0]['name'], "Aira II")
+
+    @override_settings(WAGTAILAPI_LIMIT_MAX=1)
+    def test_listing_is_split_into_pages(self):
+        HouseDesign.objects.create(name="Bryn", slug="bryn", bedrooms=4, bathrooms=2)
+
+        self.export()
+
+        self.assertEqual([item['slug'] for item in self.read('house-designs.json')['items']], ['aira'])
+        self.assertEqual([item['slug'] for item in self.read('house-designs.2.json')['items']], ['bryn'])
+        self.assertEqual(self.read('house-designs.2.json')['meta']['total_count'], 2)
+
+    def test_unpublished_page_file_is_removed(self):
+        self.export()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.designs_page.unpublish()
+
+        self.assertIn("1 removed", self.export())
+        self.assertFalse(os.path.exists(os.path.join(self.output, 'pages/house-designs/home-design.json')))
+
+    def test_unpublished_design_file_is_removed(self):
+        self.export()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.design.is_published = False
+            self.design.save()
+
+        self.assertIn("1 removed", self.export())
+        self.assertFalse(os.path.exists(os.path.join(self.output, 'house-designs/aira.json')))
+        self.assertEqual(self.read('house-designs.json')['items'], [])
+
+    def test_rerun_exports_designs_of_renamed_category(self):
+        category = HouseCategory.objects.create(name="Freedom", slug="freedom")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.design.category = category
+            self.design.save()
+        self.export()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            category.name = "Freedom Range"
+            category.save()
+
+        self.assertIn("Exported 3 files (2 unchanged", self.export())
+        self.assertEqual(self.read('house-designs/aira.json')['category']['name'], "Freedom Range")
+
+    @override_settings(MEDIA_ROOT=tempfile.mkdtemp(), RENDITION_WORKERS=0)
+    def test_rerun_exports_designs_of_replaced_image(self):
+        image = Image.objects.create(title="Aira", file=get_test_image_file())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.design.featured_image = image
+            self.design.save()
+        self.export()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image.file = get_test_image_file(filename='replaced.png')
+            image.save()
+
+        self.assertIn("Exported 3 files (2 unchanged", self.export())
+        self.assertIn('replaced', json.dumps(self.read('house-designs/aira.json')))
+
+
+class PageLinkResolutionTests(TestCase):
+    """
+    Tests for batched page link URLs in body blocks.
+    """
+
+    def setUp(self):
+        cache.clear()
+        root = Site.objects.get(is_default_site=True).root_page
+        self.targets = [
+            root.add_child(instance=HomePage(title=f"Target {i}", slug=f"target-{i}"))
+            for i in range(3)
+        ]
+        self.homepage = HomePage(
+            title="Links",
+            slug="links",
+            body=json.dumps([
+                {'type': 'quality_homes', 'value': {
+                    'main_title': f'Block {i}',
+                    'features': [],
+                    'cta': {'button_text': 'Go', 'is_external_link': False, 'page_link': target.pk},
+                }}
+                for i, target in enumerate(self.targets)
+            ]),
+        )
+        root.add_child(instance=self.homepage)
+
+    def test_links_share_one_site_root_lookup(self):
+        page = HomePage.objects.get(pk=self.homepage.pk)
+
+        with mock.patch.object(Site, 'get_site_root_paths', wraps=Site.get_site_root_paths) as lookup:
+            data = page.body_content_data
+
+        self.assertEqual(lookup.call_count, 1)
+        self.assertEqual(
+            [block['value']['cta']['page_link'] for block in data],
+            [{'id': target.pk, 'title': target.title, 'url': target.url} for target in self.targets],
+        )
@@ -5,3 +5,7 @@ class HouseDesignsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'house_designs'
     verbose_name = 'House Designs'
+
+    def ready(self):
+        # Connect API cache invalidation handlers
+        from house_designs import signals  # noqa: F401
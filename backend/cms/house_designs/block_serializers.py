@@ -0,0 +1,123 @@
+"""
+House Design Content Block Serializers
+
+Serializes HouseDesign.additional_content (a stream of
+HouseDesignContentBlock values) for the API, with responsive renditions
+for single images and galleries. Serializers are registered on
+``house_design_blocks``, which memoizes each block's output (see
+core.block_serializers).
+
+Binding the stream goes through Wagtail's bulk_to_python, which loads the
+images (and linked pages) of every block of a type with one query, and
+collect_content_renditions() registers every gallery rendition before a
+single ``renditions.resolve()``, so a design costs the same number of
+queries however many galleries and images it has.
+"""
+
+from core.block_serializers import BlockSerializerRegistry
+from home.image_config import generate_responsive_image_data, get_image_renditions
+
+
+# COMPONENT_IMAGE_MAPPING entry of the content blocks (see home.image_config)
+CONTENT_COMPONENT = 'house_design_content'
+
+
+def iter_content_images(child):
+    """
+    Yield (image, field_path) for every image of one content block.
+
+    Args:
+        child: Bound child of a HouseDesignContentBlock stream
+
+    Yields:
+        tuple: (Wagtail Image object, mapped field path)
+    """
+    if child.block_type == 'image' and child.value.get('image'):
+        yield child.value['image'], 'image.image'
+    elif child.block_type == 'image_gallery':
+        for item in child.value.get('images') or []:
+            if item.get('image'):
+                yield item['image'], 'image_gallery.images.image'
+
+
+def collect_content_renditions(blocks, renditions):
+    """
+    Register every rendition and page link the given content blocks need.
+
+    Args:
+        blocks: Bound 'content' blocks of HouseDesign.additional_content
+        renditions (RenditionResolver): Resolver to register pairs with
+
+    Returns:
+        RenditionResolver: The same resolver, for chaining
+    """
+    for block in blocks:
+        for child in block.value:
+            for image, field_path in iter_content_images(child):
+                renditions.add(image, *get_image_renditions(CONTENT_COMPONENT, field_path).values())
+            if child.block_type == 'cta_button':
+                renditions.page_urls.add(child.value.get('page_link'))
+    return renditions
+
+
+house_design_blocks = BlockSerializerRegistry('house_designs', collect=collect_content_renditions)
+
+
+def serialize_content_image(value, field_path, renditions, base_url):
+    """Serialize a ResponsiveImageBlock value (alt text defaults to the image title)"""
+    image = value.get('image')
+    data = generate_responsive_image_data(
+        image, CONTENT_COMPONENT, field_path, base_url=base_url, renditions=renditions
+    )
+    if data is not None and value.get('alt_text'):
+        data['alt'] = value['alt_text']
+    return {
+        'image': data,
+        'caption': value.get('caption', ''),
+    }
+
+
+def serialize_content_child(child, renditions, base_url):
+    """Serialize one block of a HouseDesignContentBlock stream"""
+    value = child.value
+
+    if child.block_type == 'image':
+        return serialize_content_image(value, 'image.image', renditions, base_url)
+
+    if child.block_type == 'image_gallery':
+        return {
+            'layout': value.get('layout'),
+            'images': [
+                serialize_content_image(item, 'image_gallery.images.image', renditions, base_url)
+                for item in value.get('images') or []
+            ],
+        }
+
+    if child.block_type == 'cta_button':
+        link = None
+        if value.get('is_external_link'):
+            link = value.get('external_url') or None
+        elif value.get('page_link'):
+            link = renditions.page_urls.get_url(value['page_link'])
+        return {
+            'text': value.get('button_text'),
+            'style': value.get('button_style'),
+            'is_external': value.get('is_external_link', False),
+            'link': link,
+        }
+
+    # Specifications, pricing and features lists hold plain values
+    return child.block.get_api_representation(value)
+
+
+@house_design_blocks.register('content')
+def serialize_content_block(block_value, renditions, base_url):
+    """Serialize a HouseDesignContentBlock stream"""
+    return [
+        {
+            'type': child.block_type,
+            'id': child.id,
+            'value': serialize_content_child(child, renditions, base_url),
+        }
+        for child in block_value
+    ]
@@ -0,0 +1,330 @@
+"""
+In-Process Catalog Engine for House Design Listings
+
+Optionally keeps the filter and sort columns of every published house
+design in NumPy arrays, so the listing filters (see
+get_house_design_filters) are evaluated as vectorized boolean masks and
+the sort orders are precomputed permutations. Filtering, sorting and
+counting a page then needs no database query; only the designs of the
+page itself are loaded.
+
+The engine is used when ``settings.HOUSE_DESIGN_CATALOG_ENGINE`` is on and
+NumPy is installed; otherwise get_catalog_engine() returns None and the
+listing runs on the HouseDesignSearch table.
+
+Each process loads the engine from HouseDesignSearch with one query. A
+design saved in this process is patched into a copy of the engine: its row
+is updated, appended or masked out, and moved to its place in each sort
+order by binary search, so a save costs a few array copies instead of a
+reload and re-sort. Changes made elsewhere bump the catalog dependency
+versions (see core.cache) and the engine reloads on its next use. Engines
+are never modified once built, so concurrent requests can keep using the
+one they started with.
+
+Usage:
+    engine = get_catalog_engine()
+    if engine is not None:
+        ids = engine.search({'storeys': '2'}, 'price')   # ordered design ids
+"""
+
+import bisect
+import copy
+import threading
+from decimal import Decimal
+
+from django.conf import settings
+
+from core.cache import get_dependency_versions, model_tag
+
+from .models import BuildLocation, HouseCategory, HouseDesign, HouseDesignSearch
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - optional dependency
+    numpy = None
+
+
+# Columns loaded from HouseDesignSearch, in row order
+ENGINE_COLUMNS = [
+    'pk', 'name', 'storeys', 'bedrooms', 'bathrooms',
+    'base_price', 'category_slug', 'location_slug', 'created_at',
+]
+
+# Engine arrays and their dtypes, in CatalogEngine._row_values() order
+ARRAY_COLUMNS = [
+    ('ids', 'int64'),
+    ('storeys', 'U20'),
+    ('bedrooms', 'int32'),
+    ('bathrooms', 'int32'),
+    ('has_price', 'bool'),
+    ('prices', 'float64'),
+    ('categories', 'int32'),
+    ('locations', 'int32'),
+    ('created', 'float64'),
+]
+
+
+def get_catalog_tags():
+    """Dependency tags whose changes make a loaded engine stale."""
+    return [model_tag(HouseDesign), model_tag(HouseCategory), model_tag(BuildLocation)]
+
+
+class CatalogEngine:
+    """
+    Columnar, in-memory copy of the published house design catalog.
+
+    Rows live in parallel arrays; categories and locations are stored as
+    integer codes and bathrooms as tenths, so every filter is a single
+    vectorized comparison.
+    """
+
+    def __init__(self, rows, versions=None):
+        self.versions = versions
+        self.load(rows)
+
+    @classmethod
+    def from_database(cls):
+        """Load the engine from HouseDesignSearch (one query)."""
+        versions = get_dependency_versions(get_catalog_tags())
+        rows = list(HouseDesignSearch.objects.values_list(*ENGINE_COLUMNS))
+        return cls(rows, versions)
+
+    def load(self, rows):
+        """
+        Build the column arrays and sort orders.
+
+        Args:
+            rows (list): Tuples in ENGINE_COLUMNS order
+        """
+        rows = list({row[0]: row for row in rows}.values())
+
+        self.category_codes = {}
+        self.location_codes = {}
+
+        self.positions = {row[0]: index for index, row in enumerate(rows)}
+        self.id_list = [row[0] for row in rows]
+        self.names = [row[1] for row in rows]
+        columns = list(zip(*(self._row_values(row) for row in rows))) or [()] * len(ARRAY_COLUMNS)
+        for (attr, dtype), values in zip(ARRAY_COLUMNS, columns):
+            setattr(self, attr, numpy.array(values, dtype=dtype))
+        # Rows of removed designs stay in place, masked out, until the next load
+        self.live = numpy.ones(len(rows), dtype=bool)
+
+        self._build_orders()
+
+    def _row_values(self, row):
+        """Array values of one row, in ARRAY_COLUMNS order."""
+        price = row[5]
+        return (
+            row[0],
+            row[2],
+            row[3],
+            int(row[4] * 10),
+            price is not None,
+            float(price) if price is not None else 0.0,
+            self._code(self.category_codes, row[6]),
+            self._code(self.location_codes, row[7]),
+            row[8].timestamp(),
+        )
+
+    @staticmethod
+    def _code(codes, slug):
+        if not slug:
+            return -1
+        return codes.setdefault(slug, len(codes))
+
+    def _build_orders(self):
+        """Precompute the row permutation of every sort order (see HOUSE_DESIGN_SORTS)."""
+        count = len(self.names)
+        by_name = numpy.array(
+            sorted(range(count), key=lambda index: (self.names[index], self.id_list[index])),
+            dtype=numpy.int64,
+        )
+        self._rank_names(by_name)
+        no_price = ~self.has_price
+
+        self.orders = {
+            'name': by_name,
+            'price': numpy.lexsort((self.name_rank, self.prices, no_price)),
+            '-price': numpy.lexsort((self.name_rank, -self.prices, no_price)),
+            'bedrooms': numpy.lexsort((self.name_rank, self.bedrooms)),
+            '-bedrooms': numpy.lexsort((self.name_rank, -self.bedrooms)),
+            'newest': numpy.lexsort((-self.ids, -self.created)),
+        }
+
+    def _rank_names(self, by_name):
+        self.name_rank = numpy.empty(len(by_name), dtype=numpy.int64)
+        self.name_rank[by_name] = numpy.arange(len(by_name))
+
+    def _sort_keys(self):
+        """Key of a row in each sort order (the same orders _build_orders computes)."""
+        return {
+            'name': lambda index: (self.names[index], self.id_list[index]),
+            'price': lambda index: (not self.has_price[index], self.prices[index], self.name_rank[index]),
+            '-price': lambda index: (not self.has_price[index], -self.prices[index], self.name_rank[index]),
+            'bedrooms': lambda index: (self.bedrooms[index], self.name_rank[index]),
+            '-bedrooms': lambda index: (-self.bedrooms[index], self.name_rank[index]),
+            'newest': lambda index: (-self.created[index], -self.ids[index]),
+        }
+
+    def mask(self, filters):
+        """
+        Evaluate listing filters as a boolean mask over the rows.
+
+        Args:
+            filters (dict): Output of get_house_design_filters()
+
+        Returns:
+            numpy.ndarray: True for designs passing every filter
+        """
+        mask = self.live.copy()
+        if 'storeys' in filters:
+            mask &= self.storeys == filters['storeys']
+        if 'bedrooms' in filters:
+            mask &= self.bedrooms == int(filters['bedrooms'])
+        if 'bathrooms' in filters:
+            mask &= self.bathrooms >= float(Decimal(filters['bathrooms']) * 10)
+        if 'category' in filters:
+            mask &= self.categories == self.category_codes.get(filters['category'], -2)
+        if 'location' in filters:
+            mask &= self.locations == self.location_codes.get(filters['location'], -2)
+        if 'min_price' in filters:
+            mask &= self.has_price & (self.prices >= float(filters['min_price']))
+        if 'max_price' in filters:
+            mask &= self.has_price & (self.prices <= float(filters['max_price']))
+        return mask
+
+    def search(self, filters, sort):
+        """
+        Return the ids of matching designs in sort order.
+
+        Args:
+            filters (dict): Output of get_house_design_filters()
+            sort (str): Key of HOUSE_DESIGN_SORTS
+
+        Returns:
+            numpy.ndarray: Design ids (a sequence Paginator can slice)
+        """
+        order = self.orders[sort]
+        return self.ids[order[self.mask(filters)[order]]]
+
+    def with_design(self, design_id, design=None):
+        """
+        Return a copy of the engine with one design saved or removed,
+        without reloading the catalog or re-sorting it.
+
+        Args:
+            design_id (int): Id of the changed design
+            design: Saved HouseDesign object, or None when it was deleted
+                (unpublished designs are removed as well)
+
+        Returns:
+            CatalogEngine
+        """
+        engine = copy.copy(self)
+        index = self.positions.get(design_id)
+
+        if design is None or not design.is_published:
+            if index is not None:
+                engine.live = self.live.copy()
+                engine.live[index] = False
+            return engine
+
+        entry = HouseDesignSearch.from_design(design)
+        row = tuple(design_id if column == 'pk' else getattr(entry, column) for column in ENGINE_COLUMNS)
+        engine.category_codes = dict(self.category_codes)
+        engine.location_codes = dict(self.location_codes)
+        values = engine._row_values(row)
+
+        if index is None:
+            index = len(self.id_list)
+            engine.positions = {**self.positions, design_id: index}
+            engine.id_list = self.id_list + [design_id]
+            engine.names = self.names + [row[1]]
+            for (attr, dtype), value in zip(ARRAY_COLUMNS, values):
+                setattr(engine, attr, numpy.append(getattr(self, attr), numpy.array([value], dtype=dtype)))
+            engine.live = numpy.append(self.live, True)
+            engine.name_rank = numpy.append(self.name_rank, 0)
+        else:
+            engine.names = list(self.names)
+            engine.names[index] = row[1]
+            for (attr, _), value in zip(ARRAY_COLUMNS, values):
+                column = getattr(self, attr).copy()
+                column[index] = value
+                setattr(engine, attr, column)
+            engine.live = self.live.copy()
+            engine.live[index] = True
+
+        engine._reposition(index)
+        return engine
+
+    def _reposition(self, index):
+        """Move one row to its place in every sort order."""
+        keys = self._sort_keys()
+        orders = {'name': self._move(self.orders['name'], index, keys['name'])}
+        # The other orders break ties by name rank, which the move may shift
+        self._rank_names(orders['name'])
+        for sort, order in self.orders.items():
+            if sort not in orders:
+                orders[sort] = self._move(order, index, keys[sort])
+        self.orders = orders
+
+    @staticmethod
+    def _move(order, index, key):
+        order = order[order != index]
+        position = bisect.bisect_left(order, key(index), key=key)
+        return numpy.insert(order, position, index)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_catalog_engine():
+    """
+    Return this process's catalog engine, (re)loading it when stale.
+
+    Returns:
+        CatalogEngine or None: None when disabled or NumPy is missing
+    """
+    global _engine
+
+    if numpy is None or not getattr(settings, 'HOUSE_DESIGN_CATALOG_ENGINE', False):
+        return None
+
+    versions = get_dependency_versions(get_catalog_tags())
+    engine = _engine
+    if engine is None or engine.versions != versions:
+        with _engine_lock:
+            if _engine is None or _engine.versions != versions:
+                _engine = CatalogEngine.from_database()
+            engine = _engine
+    return engine
+
+
+def apply_design_change(design_id, design=None):
+    """
+    Update a loaded engine for a saved or deleted design (see signals).
+
+    The engine adopts the current catalog versions afterwards, so the
+    change does not trigger a full reload in this process. (A change made
+    by another process in the same instant is picked up on its next bump.)
+
+    Args:
+        design_id (int): Id of the changed design
+        design: Saved HouseDesign object, or None when it was deleted
+    """
+    global _engine
+
+    with _engine_lock:
+        if _engine is None:
+            return
+        engine = _engine.with_design(design_id, design)
+        engine.versions = get_dependency_versions(get_catalog_tags())
+        _engine = engine
+
+
+def reset_catalog_engine():
+    """Drop this process's engine (it is reloaded on next use)."""
+    global _engine
+    _engine = None
@@ -0,0 +1,242 @@
+"""
+Faceted Filter Counts for the House Design Catalog
+
+For the current filter selection, counts how many published designs each
+filter option would leave. As usual for faceted search, a facet's counts
+ignore that facet's own selection (picking another storey count widens
+the results rather than narrowing them), but apply every other filter.
+
+All facets come from one grouped aggregate query: published designs are
+counted per (storeys, bedrooms, bathrooms, category, location, price
+bucket) combination, and each facet is summed from those rows in Python.
+The catalog has far fewer combinations than designs, and category and
+location options are read from the same rows. Results are cached
+per filter selection and invalidated through the house design, category
+and location dependency versions (see core.cache).
+
+Usage:
+    get_facet_counts({'storeys': '2', 'max_price': '500000'})
+"""
+
+import hashlib
+import json
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import Case, Count, IntegerField, Value, When
+
+from core.cache import PAYLOAD_CACHE_TIMEOUT, get_dependency_versions, model_tag
+
+from .models import BuildLocation, HouseCategory, HouseDesign
+
+
+# Price ranges offered as price_ranges filter options: (label, parameter, value)
+PRICE_RANGE_OPTIONS = [
+    ('Under $300k', 'max_price', '300000'),
+    ('Under $400k', 'max_price', '400000'),
+    ('Under $500k', 'max_price', '500000'),
+    ('Under $600k', 'max_price', '600000'),
+    ('$600k+', 'min_price', '600000'),
+]
+
+PRICE_FILTERS = ('min_price', 'max_price')
+
+# Minimum bathrooms (the bathrooms filter is a minimum)
+BATHROOM_OPTIONS = [
+    ('1+', '1'),
+    ('2+', '2'),
+    ('2.5+', '2.5'),
+    ('3+', '3'),
+]
+
+
+def get_catalog_tags():
+    """Dependency tags of everything the facets are computed from."""
+    return [model_tag(HouseDesign), model_tag(HouseCategory), model_tag(BuildLocation)]
+
+
+def get_facet_rows(price_thresholds):
+    """
+    Count published designs per combination of filterable values.
+
+    Args:
+        price_thresholds (list): Sorted Decimal min_price/max_price values;
+            a price below threshold ``i`` (and not below an earlier one)
+            is in ``price_bucket`` 2i, a price equal to it in 2i + 1,
+            prices above all thresholds in 2 * len(thresholds) and designs
+            without price in None
+
+    Returns:
+        list: dicts with the filter values (plus category and location
+            names), 'price_bucket' and 'count'
+    """
+    price_bucket = Case(
+        When(base_price__isnull=True, then=Value(None)),
+        *[
+            when
+            for index, threshold in enumerate(price_thresholds)
+            for when in (
+                When(base_price__lt=threshold, then=Value(2 * index)),
+                When(base_price=threshold, then=Value(2 * index + 1)),
+            )
+        ],
+        default=Value(2 * len(price_thresholds)),
+        output_field=IntegerField(),
+    )
+    return list(
+        HouseDesign.objects.filter(is_published=True)
+        .annotate(price_bucket=price_bucket)
+        .values(
+            'storeys', 'bedrooms', 'bathrooms',
+            'category__slug', 'category__name', 'category__order',
+            'build_location__slug', 'build_location__name', 'build_location__is_active',
+            'price_bucket',
+        )
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+
+
+def _row_matches(row, filters, price_thresholds, exclude=()):
+    """Whether the designs of a grouped row pass ``filters`` (except those in ``exclude``)."""
+    for name, value in filters.items():
+        if name in exclude:
+            continue
+        if name == 'storeys' and row['storeys'] != value:
+            return False
+        if name == 'bedrooms' and row['bedrooms'] != int(value):
+            return False
+        if name == 'bathrooms' and row['bathrooms'] < Decimal(value):
+            return False
+        if name == 'category' and row['category__slug'] != value:
+            return False
+        if name == 'location' and row['build_location__slug'] != value:
+            return False
+        if name in PRICE_FILTERS and not _price_within(row, name, Decimal(value), price_thresholds):
+            return False
+    return True
+
+
+def _price_within(row, name, price, price_thresholds):
+    """Whether a row's price passes a min_price or max_price filter of ``price``."""
+    bucket = row['price_bucket']
+    if bucket is None:
+        return False
+    # Bucket 2i + 1 holds prices equal to threshold i, which both bounds include
+    index = price_thresholds.index(price)
+    if name == 'min_price':
+        return bucket >= 2 * index + 1
+    return bucket <= 2 * index + 1
+
+
+def _count(rows, predicate):
+    return sum(row['count'] for row in rows if predicate(row))
+
+
+def compute_facet_counts(filters):
+    """
+    Compute the filter options with counts for a filter selection.
+
+    Args:
+        filters (dict): Output of get_house_design_filters()
+
+    Returns:
+        dict: Options per facet (storeys, bedrooms, bathrooms, categories,
+            locations, price_ranges), each ``{'label', 'value', 'count'}``;
+            price ranges also name the ``parameter`` their value is for
+    """
+    price_values = {Decimal(value) for _, _, value in PRICE_RANGE_OPTIONS}
+    price_values.update(Decimal(filters[name]) for name in PRICE_FILTERS if name in filters)
+    price_thresholds = sorted(price_values)
+
+    rows = get_facet_rows(price_thresholds)
+
+    def facet_rows(*names):
+        return [row for row in rows if _row_matches(row, filters, price_thresholds, exclude=names)]
+
+    storeys_rows = facet_rows('storeys')
+    bedrooms_rows = facet_rows('bedrooms')
+    bathrooms_rows = facet_rows('bathrooms')
+    category_rows = facet_rows('category')
+    location_rows = facet_rows('location')
+    # Price ranges replace each other, whichever bound they set
+    price_rows = facet_rows(*PRICE_FILTERS)
+
+    # Options come from the catalog itself, so values no design has are not offered
+    bedroom_values = sorted({row['bedrooms'] for row in rows})
+    categories = sorted({
+        (row['category__order'], row['category__name'], row['category__slug'])
+        for row in rows if row['category__slug']
+    })
+    locations = sorted({
+        (row['build_location__name'], row['build_location__slug'])
+        for row in rows if row['build_location__slug'] and row['build_location__is_active']
+    })
+
+    return {
+        'storeys': [
+            {'label': label, 'value': value, 'count': _count(storeys_rows, lambda row: row['storeys'] == value)}
+            for value, label in HouseDesign._meta.get_field('storeys').choices
+        ],
+        'bedrooms': [
+            {'label': str(value), 'value': str(value), 'count': _count(bedrooms_rows, lambda row: row['bedrooms'] == value)}
+            for value in bedroom_values
+        ],
+        'bathrooms': [
+            {'label': label, 'value': value, 'count': _count(bathrooms_rows, lambda row: row['bathrooms'] >= Decimal(value))}
+            for label, value in BATHROOM_OPTIONS
+        ],
+        'categories': [
+            {'label': name, 'value': slug, 'count': _count(category_rows, lambda row: row['category__slug'] == slug)}
+            for _, name, slug in categories
+        ],
+        'locations': [
+            {'label': name, 'value': slug, 'count': _count(location_rows, lambda row: row['build_location__slug'] == slug)}
+            for name, slug in locations
+        ],
+        'price_ranges': [
+            {
+                'label': label,
+                'parameter': parameter,
+                'value': value,
+                'count': _count(price_rows, lambda row: _price_within(row, parameter, Decimal(value), price_thresholds)),
+            }
+            for label, parameter, value in PRICE_RANGE_OPTIONS
+        ],
+    }
+
+
+def get_facet_cache_key(filters):
+    """
+    Build the cache key for a filter selection.
+
+    The key includes the catalog's dependency versions, so any change to a
+    design, category or location starts new keys.
+
+    Args:
+        filters (dict): Output of get_house_design_filters()
+
+    Returns:
+        str: Cache key
+    """
+    versions = get_dependency_versions(get_catalog_tags())
+    raw = json.dumps([sorted(filters.items()), sorted(versions.items())])
+    return f"house-design-facets:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+
+def get_facet_counts(filters):
+    """
+    Return the filter options with counts for a filter selection (cached).
+
+    Args:
+        filters (dict): Output of get_house_design_filters()
+
+    Returns:
+        dict: See compute_facet_counts()
+    """
+    key = get_facet_cache_key(filters)
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facet_counts(filters)
+        cache.set(key, facets, PAYLOAD_CACHE_TIMEOUT)
+    return facets
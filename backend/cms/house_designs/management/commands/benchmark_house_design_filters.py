@@ -0,0 +1,98 @@
+"""
+Compare listing filters on the HouseDesignSearch table with the in-process
+NumPy catalog engine.
+
+Runs every listing filter combination offered by the facets (plus each
+sort order) through both paths and reports the average time per filtered,
+counted and paged listing. Without NumPy only the database path is timed.
+
+Usage:
+    python manage.py benchmark_house_design_filters --iterations 50
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+
+from house_designs.engine import CatalogEngine, numpy
+from house_designs.facets import compute_facet_counts
+from house_designs.models import HOUSE_DESIGN_SORTS, HouseDesignSearch, filter_house_designs
+
+
+def get_filter_combinations():
+    """Single filters for every facet option, plus no filter."""
+    facets = compute_facet_counts({})
+    names = {
+        'storeys': 'storeys',
+        'bedrooms': 'bedrooms',
+        'bathrooms': 'bathrooms',
+        'categories': 'category',
+        'locations': 'location',
+    }
+    combinations = [{}]
+    for facet, name in names.items():
+        combinations.extend({name: option['value']} for option in facets[facet])
+    combinations.extend({option['parameter']: option['value']} for option in facets['price_ranges'])
+    return combinations
+
+
+def database_listing(filters, sort, per_page):
+    entries = filter_house_designs(HouseDesignSearch.objects.all(), filters)
+    entries = entries.order_by(*HOUSE_DESIGN_SORTS[sort]).values_list('pk', flat=True)
+    page = Paginator(entries, per_page).get_page(1)
+    return page.paginator.count, list(page)
+
+
+def engine_listing(engine, filters, sort, per_page):
+    page = Paginator(engine.search(filters, sort), per_page).get_page(1)
+    return page.paginator.count, [int(pk) for pk in page]
+
+
+class Command(BaseCommand):
+    help = "Benchmark house design listing filters: database vs in-process engine"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help="Runs per filter combination")
+        parser.add_argument('--per-page', type=int, default=12, help="Designs per listing page")
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        per_page = options['per_page']
+        combinations = [
+            (filters, sort) for filters in get_filter_combinations() for sort in HOUSE_DESIGN_SORTS
+        ]
+        self.stdout.write(
+            f"{HouseDesignSearch.objects.count()} published designs, "
+            f"{len(combinations)} filter/sort combinations, {iterations} iterations"
+        )
+
+        paths = {'database': lambda filters, sort: database_listing(filters, sort, per_page)}
+        if numpy is None:
+            self.stdout.write("NumPy is NOT installed, timing the database path only")
+        else:
+            started = time.perf_counter()
+            engine = CatalogEngine.from_database()
+            self.stdout.write(f"  engine loaded in {(time.perf_counter() - started) * 1000:.1f} ms")
+            paths['engine'] = lambda filters, sort: engine_listing(engine, filters, sort, per_page)
+
+            mismatches = [
+                (filters, sort) for filters, sort in combinations
+                if paths['engine'](filters, sort) != paths['database'](filters, sort)
+            ]
+            if mismatches:
+                self.stdout.write(self.style.ERROR(f"  engine differs for {mismatches[:5]}"))
+
+        results = {}
+        for name, listing in paths.items():
+            started = time.perf_counter()
+            for _ in range(iterations):
+                for filters, sort in combinations:
+                    listing(filters, sort)
+            elapsed = time.perf_counter() - started
+            results[name] = elapsed / (iterations * len(combinations))
+            self.stdout.write(f"  {name:<10} {results[name] * 1000:8.3f} ms/listing")
+
+        if 'engine' in results:
+            speedup = results['database'] / results['engine']
+            self.stdout.write(self.style.SUCCESS(f"Engine is {speedup:.1f}x faster"))
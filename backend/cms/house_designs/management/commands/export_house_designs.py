@@ -0,0 +1,44 @@
+"""
+Export house designs to a CSV or JSON file that import_house_designs reads.
+
+Usage:
+    python manage.py export_house_designs designs.csv
+    python manage.py export_house_designs designs.json --published --base-url https://example.com
+"""
+
+from django.core.management.base import BaseCommand
+
+from house_designs.models import HouseDesign
+from house_designs.transfer import FORMATS, export_house_designs, get_format
+
+
+class Command(BaseCommand):
+    help = "Export house designs to a CSV or JSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Output file")
+        parser.add_argument(
+            '--format', choices=FORMATS,
+            help="File format (default: from the file extension)",
+        )
+        parser.add_argument(
+            '--published', action='store_true',
+            help="Only export published designs",
+        )
+        parser.add_argument(
+            '--base-url', default='',
+            help="Prefix of featured image URLs (needed to import them elsewhere)",
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        designs = HouseDesign.objects.all()
+        if options['published']:
+            designs = designs.filter(is_published=True)
+
+        with open(path, 'w', newline='', encoding='utf-8') as stream:
+            count = export_house_designs(
+                designs, options['format'] or get_format(path), stream, options['base_url']
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Exported {count} house designs to {path}"))
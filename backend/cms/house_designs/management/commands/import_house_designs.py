@@ -0,0 +1,77 @@
+"""
+Create or update house designs from a CSV or JSON file.
+
+Designs are matched on slug; missing categories, locations and tags are
+created, and featured images are downloaded (or read from --images-dir)
+in parallel. Nothing is written when a row is invalid. See
+house_designs.transfer for the columns.
+
+Usage:
+    python manage.py import_house_designs designs.csv
+    python manage.py import_house_designs designs.json --images-dir ./photos --dry-run
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from house_designs.transfer import (
+    FORMATS,
+    IMAGE_WORKERS,
+    HouseDesignImportError,
+    get_format,
+    import_house_designs,
+)
+
+
+class Command(BaseCommand):
+    help = "Import house designs from a CSV or JSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or JSON file")
+        parser.add_argument(
+            '--format', choices=FORMATS,
+            help="File format (default: from the file extension)",
+        )
+        parser.add_argument(
+            '--images-dir',
+            help="Directory relative featured_image paths are read from",
+        )
+        parser.add_argument(
+            '--workers', type=int, default=IMAGE_WORKERS,
+            help=f"Threads fetching images (default: {IMAGE_WORKERS})",
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="Validate the file and fetch images without writing anything",
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        started = time.monotonic()
+
+        try:
+            with open(path, newline='', encoding='utf-8-sig') as stream:
+                result = import_house_designs(
+                    stream,
+                    options['format'] or get_format(path),
+                    image_root=options['images_dir'],
+                    dry_run=options['dry_run'],
+                    image_workers=options['workers'],
+                )
+        except (OSError, HouseDesignImportError) as exc:
+            raise CommandError(str(exc))
+
+        if not result.ok:
+            for number, message in result.errors:
+                self.stderr.write(f"Row {number}: {message}")
+            raise CommandError(f"{len(result.errors)} errors; nothing was imported")
+
+        elapsed = time.monotonic() - started
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"{path} is valid ({elapsed:.1f}s)"))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {result.created} and updated {result.updated} house designs "
+            f"({result.images_created} new images, {result.images_reused} reused) in {elapsed:.1f}s"
+        ))
@@ -0,0 +1,31 @@
+"""
+Rebuild the HouseDesignSearch projection from the HouseDesign table.
+
+The projection is kept in sync by model signals; run this after changes
+that bypass them (bulk inserts, queryset updates, raw SQL).
+
+Usage:
+    python manage.py rebuild_house_design_search
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from house_designs.models import HouseDesignSearch
+
+
+class Command(BaseCommand):
+    help = "Rebuild the house design search projection"
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+
+        with transaction.atomic():
+            count = HouseDesignSearch.rebuild()
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {count} published house designs in {elapsed:.1f}s"
+        ))
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_search_entries(apps, schema_editor):
+    HouseDesign = apps.get_model('house_designs', 'HouseDesign')
+    HouseDesignSearch = apps.get_model('house_designs', 'HouseDesignSearch')
+
+    designs = HouseDesign.objects.filter(is_published=True).select_related('category', 'build_location')
+    HouseDesignSearch.objects.bulk_create(
+        (
+            HouseDesignSearch(
+                design=design,
+                name=design.name,
+                storeys=design.storeys,
+                bedrooms=design.bedrooms,
+                bathrooms=design.bathrooms,
+                base_price=design.base_price,
+                category_slug=design.category.slug if design.category else '',
+                location_slug=design.build_location.slug if design.build_location else '',
+                created_at=design.created_at,
+            )
+            for design in designs.iterator(chunk_size=2000)
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('house_designs', '0002_housedesignsindexpage_hero_background_image_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HouseDesignSearch',
+            fields=[
+                ('design', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_entry', serialize=False, to='house_designs.housedesign')),
+                ('name', models.CharField(max_length=200)),
+                ('storeys', models.CharField(max_length=20)),
+                ('bedrooms', models.IntegerField()),
+                ('bathrooms', models.DecimalField(decimal_places=1, max_digits=3)),
+                ('base_price', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('category_slug', models.CharField(blank=True, max_length=100)),
+                ('location_slug', models.CharField(blank=True, max_length=100)),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'House Design Search Entry',
+                'verbose_name_plural': 'House Design Search Entries',
+                'indexes': [models.Index(fields=['name', 'design'], name='hds_name_idx'), models.Index(fields=['base_price', 'name', 'design'], name='hds_price_idx'), models.Index(fields=['-created_at', '-design'], name='hds_newest_idx'), models.Index(fields=['storeys', 'bedrooms', 'bathrooms', 'name'], name='hds_storeys_idx'), models.Index(fields=['bedrooms', 'bathrooms', 'name'], name='hds_bedrooms_idx'), models.Index(fields=['category_slug', 'storeys', 'bedrooms', 'name'], name='hds_category_idx'), models.Index(fields=['location_slug', 'storeys', 'bedrooms', 'name'], name='hds_location_idx')],
+            },
+        ),
+        migrations.RunPython(populate_search_entries, migrations.RunPython.noop),
+    ]
@@ -3,6 +3,9 @@ House Designs models for Wagtail headless CMS
 Includes HouseDesign snippets and HouseDesignsIndexPage for listing
 """
 
+from decimal import Decimal
+
+from django.core.paginator import Paginator
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from wagtail.models import Page
@@ -17,7 +20,15 @@ from modelcluster.models import ClusterableModel
 from taggit.models import TaggedItemBase
 from modelcluster.contrib.taggit import ClusterTaggableManager
 
+from core.cache import image_tag, model_tag
+from core.image_metadata import get_image_file_url
+from core.pagination import get_ordering_keys, paginate_by_cursor, parse_count_parameter
+from core.renditions import RenditionResolver
+from core.utils import get_base_url
+
+from .block_serializers import house_design_blocks
 from .blocks import HouseDesignContentBlock
+from .serializers import LISTING_FIELDS, get_design_queryset, serialize_designs
 
 
 # ===== CATEGORY MODEL =====
@@ -304,6 +315,12 @@ class HouseDesign(index.Indexed, ClusterableModel):
     def __str__(self):
         return self.name
     
+    def get_additional_content_data(self, request=None):
+        """Serialize additional_content for the API (memoized per block)"""
+        return house_design_blocks.serialize_stream(
+            self.additional_content, RenditionResolver(), get_base_url(request)
+        )
+    
     class Meta:
         verbose_name = "House Design"
         verbose_name_plural = "House Designs"
@@ -326,6 +343,192 @@ class HouseDesign(index.Indexed, ClusterableModel):
         return "Contact for pricing"
 
 
+# ===== HOUSE DESIGN SEARCH PROJECTION =====
+
+class HouseDesignSearch(models.Model):
+    """
+    Filter and sort columns of published house designs, one row per design.
+    
+    The listing filters, sorts, counts and paginates this narrow table
+    (category and location slugs are copied in, so no joins are needed)
+    and only loads the designs of the requested page. The composite
+    indexes cover the filter combinations offered by the listing.
+    
+    Rows are kept in sync by house_designs.signals; code that bypasses
+    model signals (bulk_create, queryset.update) must call rebuild().
+    """
+    design = models.OneToOneField(
+        HouseDesign,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='search_entry'
+    )
+    name = models.CharField(max_length=200)
+    storeys = models.CharField(max_length=20)
+    bedrooms = models.IntegerField()
+    bathrooms = models.DecimalField(max_digits=3, decimal_places=1)
+    base_price = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    category_slug = models.CharField(max_length=100, blank=True)
+    location_slug = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField()
+    
+    # HouseDesign fields copied into the projection
+    copied_fields = ['name', 'storeys', 'bedrooms', 'bathrooms', 'base_price', 'created_at']
+    
+    class Meta:
+        verbose_name = "House Design Search Entry"
+        verbose_name_plural = "House Design Search Entries"
+        indexes = [
+            models.Index(fields=['name', 'design'], name='hds_name_idx'),
+            models.Index(fields=['base_price', 'name', 'design'], name='hds_price_idx'),
+            models.Index(fields=['-created_at', '-design'], name='hds_newest_idx'),
+            models.Index(fields=['storeys', 'bedrooms', 'bathrooms', 'name'], name='hds_storeys_idx'),
+            models.Index(fields=['bedrooms', 'bathrooms', 'name'], name='hds_bedrooms_idx'),
+            models.Index(fields=['category_slug', 'storeys', 'bedrooms', 'name'], name='hds_category_idx'),
+            models.Index(fields=['location_slug', 'storeys', 'bedrooms', 'name'], name='hds_location_idx'),
+        ]
+    
+    def __str__(self):
+        return self.name
+    
+    @classmethod
+    def from_design(cls, design):
+        """Build the (unsaved) projection row of a design"""
+        entry = cls(
+            design=design,
+            category_slug=design.category.slug if design.category else '',
+            location_slug=design.build_location.slug if design.build_location else '',
+        )
+        for field_name in cls.copied_fields:
+            setattr(entry, field_name, getattr(design, field_name))
+        return entry
+    
+    @classmethod
+    def sync(cls, design):
+        """
+        Write (or remove, for unpublished designs) the row of one design.
+        
+        Args:
+            design: HouseDesign object
+        """
+        if not design.is_published:
+            cls.objects.filter(design=design).delete()
+            return
+        cls.from_design(design).save()
+    
+    @classmethod
+    def rebuild(cls, designs=None):
+        """
+        Rebuild the rows of many designs in batches.
+        
+        Args:
+            designs: HouseDesign QuerySet (defaults to all designs)
+            
+        Returns:
+            int: Number of rows written
+        """
+        if designs is None:
+            designs = HouseDesign.objects.all()
+        designs = designs.select_related('category', 'build_location')
+        
+        cls.objects.filter(design__in=designs.values('pk')).delete()
+        entries = cls.objects.bulk_create(
+            (cls.from_design(design) for design in designs.filter(is_published=True).iterator(chunk_size=2000)),
+            batch_size=500,
+        )
+        return len(entries)
+
+
+# Filters accepted by the listing (query parameter names)
+HOUSE_DESIGN_FILTERS = ['storeys', 'bedrooms', 'bathrooms', 'category', 'location', 'min_price', 'max_price']
+
+# Sort orders accepted through ?sort= (ids break ties so pages never overlap)
+HOUSE_DESIGN_SORTS = {
+    'name': ['name', 'pk'],
+    'price': [models.F('base_price').asc(nulls_last=True), 'name', 'pk'],
+    '-price': [models.F('base_price').desc(nulls_last=True), 'name', 'pk'],
+    'bedrooms': ['bedrooms', 'name', 'pk'],
+    '-bedrooms': ['-bedrooms', 'name', 'pk'],
+    'newest': ['-created_at', '-pk'],
+}
+DEFAULT_HOUSE_DESIGN_SORT = 'name'
+
+# All query parameters read by HouseDesignsIndexPage.get_house_designs_listing()
+HOUSE_DESIGN_QUERY_PARAMETERS = HOUSE_DESIGN_FILTERS + [
+    'sort', 'page', 'per_page', 'designs_cursor', 'designs_count',
+]
+
+MAX_DESIGNS_PER_PAGE = 100
+
+
+def get_house_design_filters(params):
+    """
+    Read the listing filters from query parameters.
+    
+    Invalid values are ignored, the same as an absent filter.
+    
+    Args:
+        params: request.GET (or any mapping)
+        
+    Returns:
+        dict: Valid filter values keyed by parameter name
+    """
+    filters = {}
+    
+    storeys = params.get('storeys')
+    if storeys in dict(HouseDesign._meta.get_field('storeys').choices):
+        filters['storeys'] = storeys
+    
+    for name in ('category', 'location'):
+        if params.get(name):
+            filters[name] = params.get(name)
+    
+    for name, parse in (('bedrooms', int), ('bathrooms', Decimal), ('min_price', Decimal), ('max_price', Decimal)):
+        value = params.get(name)
+        if not value:
+            continue
+        try:
+            value = parse(value)
+        except (ValueError, ArithmeticError):
+            continue
+        if isinstance(value, Decimal) and not value.is_finite():
+            continue
+        filters[name] = str(value)
+    
+    return filters
+
+
+def filter_house_designs(queryset, filters):
+    """
+    Apply listing filters to a HouseDesignSearch queryset.
+    
+    Bathrooms is a minimum (the '3+' option), min_price and max_price are
+    inclusive and exclude designs without a price.
+    
+    Args:
+        queryset: HouseDesignSearch QuerySet
+        filters (dict): Output of get_house_design_filters()
+        
+    Returns:
+        QuerySet: Filtered queryset
+    """
+    if 'storeys' in filters:
+        queryset = queryset.filter(storeys=filters['storeys'])
+    if 'bedrooms' in filters:
+        queryset = queryset.filter(bedrooms=filters['bedrooms'])
+    if 'bathrooms' in filters:
+        queryset = queryset.filter(bathrooms__gte=filters['bathrooms'])
+    if 'category' in filters:
+        queryset = queryset.filter(category_slug=filters['category'])
+    if 'location' in filters:
+        queryset = queryset.filter(location_slug=filters['location'])
+    if 'min_price' in filters:
+        queryset = queryset.filter(base_price__gte=filters['min_price'], base_price__isnull=False)
+    if 'max_price' in filters:
+        queryset = queryset.filter(base_price__lte=filters['max_price'], base_price__isnull=False)
+    return queryset
+
+
 # ===== HOUSE DESIGNS INDEX PAGE =====
 
 class HouseDesignsIndexPage(Page):
@@ -395,25 +598,29 @@ class HouseDesignsIndexPage(Page):
         APIField('designs_per_page'),
         APIField('hero_data'),
         APIField('house_designs_data'),
+        APIField('house_designs_meta'),
         APIField('filter_options'),
     ]
     
+    # Listing query parameters accepted by the Pages API
+    api_query_parameters = HOUSE_DESIGN_QUERY_PARAMETERS
+    
+    # API fields stored at publish time (see core.snapshots), i.e. the
+    # unfiltered first page; requests with listing parameters are computed
+    snapshot_fields = ['hero_data', 'house_designs_data', 'house_designs_meta', 'filter_options']
+    
     @property
     def hero_data(self):
         """Return hero section data for API"""
         from django.conf import settings
         
         # Build base URL for media files
-        request = getattr(self, '_request', None)
-        if request:
-            base_url = f"{request.scheme}://{request.get_host()}"
-        else:
-            base_url = "http://127.0.0.1:8000"
+        base_url = get_base_url(getattr(self, '_request', None))
         
         hero_image = None
         if self.hero_background_image:
             hero_image = {
-                'url': base_url + self.hero_background_image.file.url,
+                'url': base_url + get_image_file_url(self.hero_background_image),
                 'alt': self.hero_background_image.title,
                 'width': self.hero_background_image.width,
                 'height': self.hero_background_image.height,
@@ -426,133 +633,199 @@ class HouseDesignsIndexPage(Page):
             'overlay_opacity': self.hero_overlay_opacity / 100.0,  # Convert to 0-1 range
         }
     
+    def get_snapshot_dependencies(self):
+        """House design snippets and their featured images feed the snapshot"""
+        featured_images = HouseDesign.objects.filter(
+            is_published=True, featured_image__isnull=False
+        ).values_list('featured_image_id', flat=True)
+        
+        return [
+            model_tag(HouseDesign),
+            model_tag(HouseCategory),
+            model_tag(BuildLocation),
+        ] + [image_tag(image_id) for image_id in featured_images]
+    
     def get_context(self, request):
         """Add filtered house designs to context"""
         context = super().get_context(request)
         
-        # Get all published house designs
-        house_designs = HouseDesign.objects.filter(is_published=True)
+        listing = self.get_house_designs_listing(request.GET)
+        context['house_designs'] = listing['designs']
+        context['house_designs_page'] = listing['page']
+        context['filter_options'] = self.get_filter_options(listing['filters'])
         
-        # Apply filters from query parameters
-        storeys = request.GET.get('storeys')
-        if storeys:
-            house_designs = house_designs.filter(storeys=storeys)
+        return context
+    
+    def get_house_designs_queryset(self):
+        """
+        Published designs with everything house_designs_data reads.
         
-        bedrooms = request.GET.get('bedrooms')
-        if bedrooms:
-            house_designs = house_designs.filter(bedrooms=bedrooms)
+        Images, categories and locations are joined, tags are prefetched and
+        only the listing fields' columns are loaded (see
+        house_designs.serializers), so the listing costs the same number of
+        queries however many designs there are.
+        """
+        return get_design_queryset(HouseDesign.objects.filter(is_published=True), LISTING_FIELDS)
+    
+    def get_listing_params(self):
+        """Query parameters of the API request, if any (see get_house_designs_listing)"""
+        request = getattr(self, '_request', None)
+        return request.GET if request is not None else {}
+    
+    def get_house_designs_listing(self, params=None):
+        """
+        Filter, sort and paginate the published designs in the database.
         
-        bathrooms = request.GET.get('bathrooms')
-        if bathrooms:
-            house_designs = house_designs.filter(bathrooms=bathrooms)
+        Filtering, counting and paging run on the HouseDesignSearch
+        projection, or in memory when the catalog engine is enabled (see
+        house_designs.engine); only the designs of the requested page are
+        loaded.
         
-        category = request.GET.get('category')
-        if category:
-            house_designs = house_designs.filter(category__slug=category)
+        Pages are numbered (``page``), or follow an opaque keyset cursor
+        (``designs_cursor``, empty for the first page; see core.pagination)
+        whose queries stay index seeks however deep the listing goes.
+        ``designs_count=false`` skips the total count in either mode.
         
-        max_price = request.GET.get('max_price')
-        if max_price:
-            try:
-                house_designs = house_designs.filter(
-                    base_price__lte=float(max_price),
-                    base_price__isnull=False
-                )
-            except (ValueError, TypeError):
-                pass
+        The result is memoized per set of parameters, so house_designs_data
+        and house_designs_meta share the same queries.
         
-        context['house_designs'] = house_designs
-        context['filter_options'] = self.filter_options
+        Args:
+            params: Query parameters (defaults to the API request's, if any)
+            
+        Returns:
+            dict: 'designs' (HouseDesign list), 'page' (django Page of
+                design ids, when numbered and counted), 'page_number',
+                'total_count', 'num_pages', 'has_next', 'next_cursor',
+                'per_page', 'sort' and 'filters'
+        """
+        if params is None:
+            params = self.get_listing_params()
         
-        return context
+        filters = get_house_design_filters(params)
+        sort = params.get('sort')
+        if sort not in HOUSE_DESIGN_SORTS:
+            sort = DEFAULT_HOUSE_DESIGN_SORT
+        try:
+            per_page = min(max(int(params.get('per_page')), 1), MAX_DESIGNS_PER_PAGE)
+        except (TypeError, ValueError):
+            per_page = self.designs_per_page
+        page_number = params.get('page') or 1
+        cursor = params.get('designs_cursor')
+        with_count = parse_count_parameter(params, 'designs_count')
+        
+        key = (sort, per_page, str(page_number), cursor, with_count, tuple(sorted(filters.items())))
+        listings = self.__dict__.setdefault('_house_designs_listings', {})
+        if key not in listings:
+            listing = {
+                'page': None,
+                'page_number': None,
+                'total_count': None,
+                'num_pages': None,
+                'has_next': False,
+                'next_cursor': None,
+                'per_page': per_page,
+                'sort': sort,
+                'filters': filters,
+            }
+            if cursor is not None:
+                page_ids = self._get_cursor_page(listing, cursor, with_count)
+            else:
+                page_ids = self._get_numbered_page(listing, page_number, with_count)
+            
+            designs = self.get_house_designs_queryset().in_bulk(page_ids)
+            listing['designs'] = [designs[pk] for pk in page_ids if pk in designs]
+            listings[key] = listing
+        return listings[key]
+    
+    def _get_numbered_page(self, listing, page_number, with_count):
+        """Fill in a numbered page of the listing and return its design ids"""
+        from .engine import get_catalog_engine
+        
+        sort, per_page, filters = listing['sort'], listing['per_page'], listing['filters']
+        engine = get_catalog_engine()
+        if engine is not None:
+            entries = engine.search(filters, sort)
+        else:
+            entries = filter_house_designs(HouseDesignSearch.objects.all(), filters)
+            entries = entries.order_by(*HOUSE_DESIGN_SORTS[sort]).values_list('pk', flat=True)
+        
+        if with_count:
+            page = Paginator(entries, per_page).get_page(page_number)
+            listing.update({
+                'page': page,
+                'page_number': page.number,
+                'total_count': page.paginator.count,
+                'num_pages': page.paginator.num_pages,
+                'has_next': page.has_next(),
+            })
+            return [int(pk) for pk in page]
+        
+        # Without a count, read one extra row to know whether a next page exists
+        try:
+            page_number = max(int(page_number), 1)
+        except (TypeError, ValueError):
+            page_number = 1
+        start = (page_number - 1) * per_page
+        page_ids = [int(pk) for pk in entries[start:start + per_page + 1]]
+        listing.update({'page_number': page_number, 'has_next': len(page_ids) > per_page})
+        return page_ids[:per_page]
+    
+    def _get_cursor_page(self, listing, cursor, with_count):
+        """Fill in the keyset page after ``cursor`` and return its design ids"""
+        ordering = HOUSE_DESIGN_SORTS[listing['sort']]
+        key_fields = [name for name, _, _ in get_ordering_keys(ordering)]
+        
+        entries = filter_house_designs(HouseDesignSearch.objects.all(), listing['filters'])
+        rows, next_cursor = paginate_by_cursor(
+            entries.values_list(*key_fields), ordering, cursor, listing['per_page']
+        )
+        listing.update({
+            'total_count': entries.count() if with_count else None,
+            'has_next': next_cursor is not None,
+            'next_cursor': next_cursor,
+        })
+        # Every sort order ends with the primary key
+        return [row[-1] for row in rows]
     
     @property
     def house_designs_data(self):
         """Transform house designs for API"""
-        from django.conf import settings
-        designs = HouseDesign.objects.filter(is_published=True)
-        
-        # Build base URL for media files
-        request = getattr(self, '_request', None)
-        if request:
-            base_url = f"{request.scheme}://{request.get_host()}"
-        else:
-            base_url = "http://127.0.0.1:8000"  # Fallback for development
-        
-        return [
-            {
-                'id': design.id,
-                'name': design.name,
-                'slug': design.slug,
-                'description': design.description,
-                'image': {
-                    'url': base_url + design.featured_image.file.url if design.featured_image else None,
-                    'alt': design.featured_image.title if design.featured_image else design.name,
-                    'width': design.featured_image.width if design.featured_image else None,
-                    'height': design.featured_image.height if design.featured_image else None,
-                } if design.featured_image else None,
-                'specs': {
-                    'storeys': design.storeys,
-                    'storeys_label': design.get_storeys_display(),
-                    'bedrooms': design.bedrooms,
-                    'bathrooms': str(design.bathrooms),
-                    'garage_spaces': design.garage_spaces,
-                    'block_width': design.block_width_display,
-                },
-                'pricing': {
-                    'base_price': str(design.base_price) if design.base_price else None,
-                    'display': design.price_display,
-                    'note': design.price_note,
-                },
-                'category': {
-                    'name': design.category.name,
-                    'slug': design.category.slug,
-                } if design.category else None,
-                'location': {
-                    'name': design.build_location.name,
-                    'slug': design.build_location.slug,
-                } if design.build_location else None,
-                'badges': {
-                    'on_display': design.is_on_display,
-                    'virtual_tour': design.has_virtual_tour,
-                },
-                'virtual_tour_url': design.virtual_tour_url if design.has_virtual_tour else None,
-                'tags': [tag.name for tag in design.tags.all()],
-            }
-            for design in designs
-        ]
+        designs = self.get_house_designs_listing()['designs']
+        return serialize_designs(designs, LISTING_FIELDS, get_base_url(getattr(self, '_request', None)))
     
     @property
-    def filter_options(self):
-        """Get available filter options"""
+    def house_designs_meta(self):
+        """Pagination, sort and filters of house_designs_data"""
+        listing = self.get_house_designs_listing()
         return {
-            'storeys': [
-                {'label': 'Single Storey', 'value': '1'},
-                {'label': 'Double Storey', 'value': '2'},
-                {'label': 'Three Storey', 'value': '3'},
-            ],
-            'bedrooms': [
-                {'label': str(i), 'value': str(i)}
-                for i in range(1, 7)  # 1-6 bedrooms
-            ],
-            'bathrooms': [
-                {'label': '1', 'value': '1'},
-                {'label': '2', 'value': '2'},
-                {'label': '2.5', 'value': '2.5'},
-                {'label': '3', 'value': '3'},
-                {'label': '3+', 'value': '3'},
-            ],
-            'categories': [
-                {'label': cat.name, 'value': cat.slug}
-                for cat in HouseCategory.objects.all()
-            ],
-            'price_ranges': [
-                {'label': 'Under $300k', 'value': '300000'},
-                {'label': 'Under $400k', 'value': '400000'},
-                {'label': 'Under $500k', 'value': '500000'},
-                {'label': 'Under $600k', 'value': '600000'},
-                {'label': '$600k+', 'value': '600001'},
-            ],
+            'total_count': listing['total_count'],
+            'page': listing['page_number'],
+            'per_page': listing['per_page'],
+            'num_pages': listing['num_pages'],
+            'has_next': listing['has_next'],
+            'next_cursor': listing['next_cursor'],
+            'sort': listing['sort'],
+            'sorts': list(HOUSE_DESIGN_SORTS),
+            'filters': listing['filters'],
         }
     
+    @property
+    def filter_options(self):
+        """Filter options with facet counts for the current filter selection"""
+        return self.get_filter_options(get_house_design_filters(self.get_listing_params()))
+    
+    def get_filter_options(self, filters):
+        """
+        Filter options, each with the number of designs it would leave.
+        
+        Args:
+            filters (dict): Output of get_house_design_filters()
+            
+        Returns:
+            dict: Options per facet (see house_designs.facets)
+        """
+        from .facets import get_facet_counts
+        return get_facet_counts(filters)
+    
     class Meta:
         verbose_name = "House Designs Index Page"
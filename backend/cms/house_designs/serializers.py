@@ -0,0 +1,348 @@
+"""
+Field Registry for House Design API Payloads
+
+Every field a house design payload can contain is declared once, with the
+columns it reads, the relations it joins or prefetches and the featured
+image renditions it needs. A payload is built for a list of field names:
+the queryset loads only those columns and relations (``?fields=name,slug``
+selects two columns and joins nothing), and renditions of all designs are
+fetched in bulk.
+
+Used by the house designs API endpoint (see house_designs.views) and by
+HouseDesignsIndexPage.house_designs_data. Detail payloads are cached per
+design revision (see get_design_detail).
+
+Usage:
+    fields = parse_fields_parameter('name,slug,thumbnail,pricing', LISTING_FIELDS)
+    designs = get_design_queryset(HouseDesign.objects.all(), fields)
+    data = serialize_designs(designs, fields, base_url)
+
+    get_design_detail(HouseDesign.objects.filter(slug='aira'), DETAIL_FIELDS, base_url)
+"""
+
+import hashlib
+import json
+
+from django.core.cache import cache
+from wagtail.api.v2.utils import BadRequestError
+
+from core.cache import PAYLOAD_CACHE_TIMEOUT, get_dependency_versions, image_tag, model_tag
+from core.image_metadata import get_image_file_url
+from core.renditions import RenditionResolver
+from core.utils import RESPONSIVE_RENDITION_SPECS, get_rendition_data
+
+from .block_serializers import house_design_blocks
+
+
+THUMBNAIL_SPEC = RESPONSIVE_RENDITION_SPECS['thumbnail']
+
+# Featured image columns read by the original image payload
+IMAGE_COLUMNS = [
+    'featured_image__title', 'featured_image__file',
+    'featured_image__width', 'featured_image__height',
+    'featured_image__metadata__source_file', 'featured_image__metadata__file_url',
+]
+
+# Featured image columns read when looking up (or creating) a rendition
+RENDITION_COLUMNS = [
+    'featured_image__title', 'featured_image__file',
+    'featured_image__width', 'featured_image__height',
+    'featured_image__focal_point_x', 'featured_image__focal_point_y',
+    'featured_image__focal_point_width', 'featured_image__focal_point_height',
+]
+
+
+class DesignField:
+    """
+    One field of a house design payload.
+
+    Args:
+        serialize (callable): ``serialize(design, context)`` returning the value;
+            context holds 'base_url' and 'renditions' (RenditionResolver)
+        columns (list): Columns passed to ``QuerySet.only()``
+        select_related (list): Relations joined for the field
+        prefetch_related (list): Relations prefetched for the field
+        renditions (list): Featured image rendition specs the field reads
+    """
+
+    def __init__(self, serialize, columns=(), select_related=(), prefetch_related=(), renditions=()):
+        self.serialize = serialize
+        self.columns = list(columns)
+        self.select_related = list(select_related)
+        self.prefetch_related = list(prefetch_related)
+        self.renditions = list(renditions)
+
+
+def _image(design, context):
+    image = design.featured_image
+    if not image:
+        return None
+    return {
+        'url': context['base_url'] + get_image_file_url(image),
+        'alt': image.title,
+        'width': image.width,
+        'height': image.height,
+    }
+
+
+def _thumbnail(design, context):
+    return get_rendition_data(design.featured_image, THUMBNAIL_SPEC, context['base_url'], context['renditions'])
+
+
+def _specs(design, context):
+    return {
+        'storeys': design.storeys,
+        'storeys_label': design.get_storeys_display(),
+        'bedrooms': design.bedrooms,
+        'bathrooms': str(design.bathrooms),
+        'garage_spaces': design.garage_spaces,
+        'block_width': design.block_width_display,
+    }
+
+
+def _pricing(design, context):
+    return {
+        'base_price': str(design.base_price) if design.base_price else None,
+        'display': design.price_display,
+        'note': design.price_note,
+    }
+
+
+def _category(design, context):
+    if not design.category:
+        return None
+    return {'name': design.category.name, 'slug': design.category.slug}
+
+
+def _location(design, context):
+    if not design.build_location:
+        return None
+    return {'name': design.build_location.name, 'slug': design.build_location.slug}
+
+
+HOUSE_DESIGN_FIELDS = {
+    'id': DesignField(lambda design, context: design.id),
+    'name': DesignField(lambda design, context: design.name, columns=['name']),
+    'slug': DesignField(lambda design, context: design.slug, columns=['slug']),
+    'description': DesignField(lambda design, context: design.description, columns=['description']),
+    'image': DesignField(_image, columns=IMAGE_COLUMNS, select_related=['featured_image__metadata']),
+    'thumbnail': DesignField(
+        _thumbnail, columns=RENDITION_COLUMNS, select_related=['featured_image'], renditions=[THUMBNAIL_SPEC]
+    ),
+    'specs': DesignField(_specs, columns=[
+        'storeys', 'bedrooms', 'bathrooms', 'garage_spaces', 'min_block_width', 'max_block_width',
+    ]),
+    'pricing': DesignField(_pricing, columns=['base_price', 'price_note']),
+    'category': DesignField(
+        _category, columns=['category__name', 'category__slug'], select_related=['category']
+    ),
+    'location': DesignField(
+        _location, columns=['build_location__name', 'build_location__slug'], select_related=['build_location']
+    ),
+    'badges': DesignField(
+        lambda design, context: {'on_display': design.is_on_display, 'virtual_tour': design.has_virtual_tour},
+        columns=['is_on_display', 'has_virtual_tour'],
+    ),
+    'virtual_tour_url': DesignField(
+        lambda design, context: design.virtual_tour_url if design.has_virtual_tour else None,
+        columns=['has_virtual_tour', 'virtual_tour_url'],
+    ),
+    'tags': DesignField(
+        lambda design, context: [tag.name for tag in design.tags.all()], prefetch_related=['tags']
+    ),
+    'updated_at': DesignField(lambda design, context: design.updated_at, columns=['updated_at']),
+    'additional_content': DesignField(
+        lambda design, context: house_design_blocks.serialize_stream(
+            design.additional_content, context['renditions'], context['base_url']
+        ),
+        columns=['additional_content'],
+    ),
+}
+
+# Fields only served by the detail endpoint
+DETAIL_ONLY_FIELDS = ['additional_content']
+
+# Fields of a listing card (house_designs_data and the API listing default)
+LISTING_FIELDS = [
+    'id', 'name', 'slug', 'description', 'image', 'specs', 'pricing',
+    'category', 'location', 'badges', 'virtual_tour_url', 'tags',
+]
+
+DETAIL_FIELDS = list(HOUSE_DESIGN_FIELDS)
+
+# Fields whose payload shows the featured image
+IMAGE_FIELDS = ['image', 'thumbnail']
+
+
+def parse_fields_parameter(value, default, available=None):
+    """
+    Read a ``?fields=`` value.
+
+    Accepts a comma-separated list of field names, ``*`` for every
+    available field, and ``-name`` to drop a field from the default (e.g.
+    ``*,-description``). ``id`` is always included.
+
+    Args:
+        value (str): Parameter value, or None for the default
+        default (list): Field names used when no fields are given
+        available (list): Field names that may be requested (default: all)
+
+    Returns:
+        list: Field names in registry order
+
+    Raises:
+        BadRequestError: Unknown field names
+    """
+    if available is None:
+        available = list(HOUSE_DESIGN_FIELDS)
+    if value is None:
+        return list(default)
+
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    selected = set()
+    if not names or all(name.startswith('-') for name in names):
+        selected.update(default)
+
+    unknown = []
+    for name in names:
+        if name == '*':
+            selected.update(available)
+        elif name.lstrip('-') not in available:
+            unknown.append(name.lstrip('-'))
+        elif name.startswith('-'):
+            selected.discard(name[1:])
+        else:
+            selected.add(name)
+
+    if unknown:
+        raise BadRequestError("unknown fields: %s" % ", ".join(sorted(unknown)))
+
+    selected.add('id')
+    return [name for name in HOUSE_DESIGN_FIELDS if name in selected]
+
+
+def get_design_queryset(queryset, field_names):
+    """
+    Restrict a HouseDesign queryset to what the given fields read.
+
+    Args:
+        queryset: HouseDesign QuerySet
+        field_names (list): Keys of HOUSE_DESIGN_FIELDS
+
+    Returns:
+        QuerySet: Only the fields' columns loaded, their relations joined
+            or prefetched
+    """
+    fields = [HOUSE_DESIGN_FIELDS[name] for name in field_names]
+    columns = {column for field in fields for column in field.columns}
+    select_related = {relation for field in fields for relation in field.select_related}
+    prefetch_related = {relation for field in fields for relation in field.prefetch_related}
+
+    # only() needs at least one column; the primary key is always loaded
+    queryset = queryset.only(*sorted(columns or ['id']))
+    if select_related:
+        queryset = queryset.select_related(*sorted(select_related))
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*sorted(prefetch_related))
+    return queryset
+
+
+def serialize_designs(designs, field_names, base_url, renditions=None):
+    """
+    Serialize house designs, resolving their renditions in bulk.
+
+    Args:
+        designs (iterable): HouseDesign objects (see get_design_queryset)
+        field_names (list): Keys of HOUSE_DESIGN_FIELDS
+        base_url (str): Base URL for image URLs
+        renditions (RenditionResolver): Resolver to use, e.g. to read its
+            ``dependencies`` afterwards (optional)
+
+    Returns:
+        list: One dict per design, keyed by field name
+    """
+    designs = list(designs)
+    fields = [(name, HOUSE_DESIGN_FIELDS[name]) for name in field_names]
+
+    if renditions is None:
+        renditions = RenditionResolver()
+    specs = [spec for _, field in fields for spec in field.renditions]
+    if specs:
+        for design in designs:
+            renditions.add(design.featured_image, *specs)
+        renditions.resolve()
+
+    context = {'base_url': base_url, 'renditions': renditions}
+    return [
+        {name: field.serialize(design, context) for name, field in fields}
+        for design in designs
+    ]
+
+
+def get_design_detail_cache_key(design_id, updated_at, field_names, base_url):
+    """
+    Build the cache key of a design's detail payload.
+
+    Saving a design changes ``updated_at``, so each revision has its own key.
+
+    Args:
+        design_id (int): Design primary key
+        updated_at (datetime): Design revision timestamp
+        field_names (list): Keys of HOUSE_DESIGN_FIELDS
+        base_url (str): Base URL for image URLs
+
+    Returns:
+        str: Cache key
+    """
+    raw = json.dumps([updated_at.isoformat(), list(field_names), base_url])
+    return f"house-design-detail:{design_id}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+
+def get_design_detail(queryset, field_names, base_url):
+    """
+    Serialize one design, cached per design revision.
+
+    A cached payload is reused while the design's ``updated_at`` is
+    unchanged and none of its dependencies (images and pages shown in
+    additional_content, the featured image, categories and locations)
+    has a newer version, so a hit costs one query. Misses load the design
+    with get_design_queryset() and serialize it with all of its gallery
+    renditions resolved in bulk.
+
+    Args:
+        queryset: HouseDesign QuerySet matching the design (e.g. by slug)
+        field_names (list): Keys of HOUSE_DESIGN_FIELDS
+        base_url (str): Base URL for image URLs
+
+    Returns:
+        dict or None: Payload, or None when no design matches
+    """
+    from .models import BuildLocation, HouseCategory
+
+    row = queryset.values_list('pk', 'updated_at').first()
+    if row is None:
+        return None
+    key = get_design_detail_cache_key(row[0], row[1], field_names, base_url)
+
+    entry = cache.get(key)
+    if entry is not None and get_dependency_versions(entry['tags']) == entry['versions']:
+        return entry['data']
+
+    design = get_design_queryset(queryset.filter(pk=row[0]), field_names).first()
+    if design is None:
+        return None
+
+    renditions = RenditionResolver()
+    data = serialize_designs([design], field_names, base_url, renditions)[0]
+
+    tags = set(renditions.dependencies) | {model_tag(HouseCategory), model_tag(BuildLocation)}
+    if set(field_names).intersection(IMAGE_FIELDS) and design.featured_image_id:
+        tags.add(image_tag(design.featured_image_id))
+    tags = sorted(tags)
+
+    cache.set(
+        key,
+        {'tags': tags, 'versions': get_dependency_versions(tags), 'data': data},
+        PAYLOAD_CACHE_TIMEOUT,
+    )
+    return data
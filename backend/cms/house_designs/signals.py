@@ -0,0 +1,81 @@
+"""
+Signal handlers for house_designs app - API cache invalidation, the
+HouseDesignSearch projection and the in-process catalog engine
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import model_tag
+from core.signals import bump_versions_on_commit, refresh_snapshots_on_commit
+
+from .engine import apply_design_change
+from .models import BuildLocation, HouseCategory, HouseDesign, HouseDesignSearch
+
+
+@receiver(post_save, sender=HouseDesign)
+@receiver(post_delete, sender=HouseDesign)
+@receiver(post_save, sender=HouseCategory)
+@receiver(post_delete, sender=HouseCategory)
+@receiver(post_save, sender=BuildLocation)
+@receiver(post_delete, sender=BuildLocation)
+def bump_catalog_version(sender, **kwargs):
+    """
+    House design snippets feed page API fields, so their validators must
+    change, and cached facet counts (see house_designs.facets) expire.
+    """
+    bump_versions_on_commit(model_tag(sender))
+
+
+@receiver(post_save, sender=HouseDesign)
+@receiver(post_delete, sender=HouseDesign)
+@receiver(post_save, sender=HouseCategory)
+@receiver(post_delete, sender=HouseCategory)
+@receiver(post_save, sender=BuildLocation)
+@receiver(post_delete, sender=BuildLocation)
+def refresh_catalog_snapshots(sender, **kwargs):
+    """Rebuild the snapshots of pages listing house designs."""
+    refresh_snapshots_on_commit(tags=[model_tag(sender)])
+
+
+@receiver(post_save, sender=HouseDesign)
+def sync_house_design_search(sender, instance, raw=False, **kwargs):
+    """Keep the design's row in the search projection up to date."""
+    if not raw:
+        HouseDesignSearch.sync(instance)
+
+
+@receiver(post_save, sender=HouseCategory)
+def sync_category_slug(sender, instance, **kwargs):
+    """Copy a (possibly renamed) category slug into the projection."""
+    HouseDesignSearch.objects.filter(design__category=instance).exclude(
+        category_slug=instance.slug
+    ).update(category_slug=instance.slug)
+
+
+@receiver(post_save, sender=BuildLocation)
+def sync_location_slug(sender, instance, **kwargs):
+    """Copy a (possibly renamed) location slug into the projection."""
+    HouseDesignSearch.objects.filter(design__build_location=instance).exclude(
+        location_slug=instance.slug
+    ).update(location_slug=instance.slug)
+
+
+@receiver(post_delete, sender=HouseCategory)
+@receiver(post_delete, sender=BuildLocation)
+def sync_cleared_relations(sender, **kwargs):
+    """Designs of a deleted category or location lose it (SET_NULL)."""
+    HouseDesignSearch.objects.filter(design__category__isnull=True).exclude(category_slug='').update(category_slug='')
+    HouseDesignSearch.objects.filter(design__build_location__isnull=True).exclude(location_slug='').update(location_slug='')
+
+
+@receiver(post_save, sender=HouseDesign)
+@receiver(post_delete, sender=HouseDesign)
+def update_catalog_engine(sender, instance, signal, raw=False, **kwargs):
+    """Apply the design to this process's catalog engine, if one is loaded."""
+    if raw:
+        return
+    design_id = instance.pk
+    design = None if signal is post_delete else instance
+    transaction.on_commit(lambda: apply_design_change(design_id, design))
@@ -1,3 +1,1091 @@
-from django.test import TestCase
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from taggit.models import Tag
+from wagtail.images.models import Image
+from wagtail.images.tests.utils import get_test_image_file
+from wagtail.models import Site
+
+from core.cache import get_content_version
+from house_designs.engine import CatalogEngine, get_catalog_engine, numpy as engine_numpy, reset_catalog_engine
+from house_designs.models import (
+    HOUSE_DESIGN_SORTS,
+    BuildLocation,
+    HouseCategory,
+    HouseDesign,
+    HouseDesignSearch,
+    HouseDesignTag,
+    HouseDesignsIndexPage,
+    filter_house_designs,
+)
+from house_designs import transfer
+from house_designs.transfer import (
+    HouseDesignImportError,
+    export_house_designs,
+    fetch_image,
+    get_public_address,
+    import_house_designs,
+)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), RENDITION_WORKERS=0)
+class HouseDesignListingQueryTests(TestCase):
+    """
+    Tests for the query cost of HouseDesignsIndexPage.house_designs_data.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.image = Image.objects.create(title="Facade", file=get_test_image_file())
+        self.category = HouseCategory.objects.create(name="Freedom", slug="freedom")
+        self.location = BuildLocation.objects.create(name="Melbourne", slug="melbourne")
+        self.tags = [Tag.objects.create(name="Modern"), Tag.objects.create(name="Coastal")]
+        self.page = HouseDesignsIndexPage(title="Designs", slug="designs")
+        self.count = 0
+
+    def create_designs(self, count):
+        designs = HouseDesign.objects.bulk_create([
+            HouseDesign(
+                name=f"Design {i:05d}",
+                slug=f"design-{i}",
+                bedrooms=3,
+                bathrooms=2,
+                featured_image=self.image,
+                category=self.category,
+                build_location=self.location,
+            )
+            for i in range(self.count, self.count + count)
+        ])
+        HouseDesignTag.objects.bulk_create([
+            HouseDesignTag(content_object=design, tag=tag)
+            for design in designs
+            for tag in self.tags
+        ])
+        HouseDesignSearch.rebuild(HouseDesign.objects.filter(pk__in=[design.pk for design in designs]))
+        self.count += count
+
+    def count_listing_queries(self):
+        page = HouseDesignsIndexPage(title="Designs", slug="designs")
+        with CaptureQueriesContext(connection) as queries:
+            data = page.house_designs_data
+            meta = page.house_designs_meta
+        self.assertEqual(len(data), min(self.count, page.designs_per_page))
+        self.assertEqual(meta['total_count'], self.count)
+        return len(queries)
+
+    def test_listing_serializes_related_data(self):
+        self.create_designs(1)
+
+        design = self.page.house_designs_data[0]
+
+        self.assertEqual(design['category'], {'name': "Freedom", 'slug': "freedom"})
+        self.assertEqual(design['location'], {'name': "Melbourne", 'slug': "melbourne"})
+        self.assertEqual(sorted(design['tags']), ["Coastal", "Modern"])
+        self.assertEqual(design['image']['alt'], "Facade")
+        self.assertTrue(design['image']['url'].endswith(self.image.file.url))
+
+    def test_query_count_is_flat_from_10_to_10000_designs(self):
+        self.create_designs(10)
+        small = self.count_listing_queries()
+
+        self.create_designs(9990)
+        large = self.count_listing_queries()
+
+        self.assertEqual(small, large)
+        # count and page ids (search projection), designs, tags
+        self.assertLessEqual(large, 4)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), RENDITION_WORKERS=0)
+class HouseDesignsAPITests(TestCase):
+    """
+    Tests for the /api/v2/house-designs/ endpoint and its field projection.
+    """
+
+    url = "/api/v2/house-designs/"
+
+    def setUp(self):
+        cache.clear()
+        self.image = Image.objects.create(title="Facade", file=get_test_image_file())
+        self.category = HouseCategory.objects.create(name="Freedom", slug="freedom")
+        for index, (name, storeys, price) in enumerate([("Aira", '1', 310000), ("Banksia", '2', 450000), ("Coral", '2', None)]):
+            design = HouseDesign.objects.create(
+                name=name,
+                slug=name.lower(),
+                storeys=storeys,
+                bedrooms=3 + index,
+                bathrooms=2,
+                base_price=price,
+                featured_image=self.image,
+                category=self.category,
+            )
+            design.tags.add("Modern")
+            design.save()
+        HouseDesign.objects.create(name="Draft", slug="draft", bedrooms=3, bathrooms=2, is_published=False)
+
+    def get(self, params='', **headers):
+        return self.client.get(self.url + params, **headers)
+
+    def test_listing_defaults_to_card_fields(self):
+        response = self.get()
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['meta']['total_count'], 3)
+        self.assertEqual([item['name'] for item in data['items']], ["Aira", "Banksia", "Coral"])
+        self.assertEqual(data['items'][0]['category'], {'name': "Freedom", 'slug': "freedom"})
+        self.assertEqual(data['items'][0]['tags'], ["Modern"])
+
+    def test_fields_projection_loads_only_requested_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get("?fields=name,slug")
+
+        items = response.json()['items']
+        self.assertEqual(items[0], {'id': items[0]['id'], 'name': "Aira", 'slug': "aira"})
+
+        design_query = next(
+            query['sql'] for query in queries.captured_queries
+            if 'FROM "house_designs_housedesign"' in query['sql']
+        )
+        self.assertNotIn('"description"', design_query)
+        self.assertNotIn('JOIN', design_query)
+        self.assertFalse(any('taggit' in query['sql'] for query in queries.captured_queries))
+
+    def test_card_fields_with_thumbnail(self):
+        self.get("?fields=name,slug,thumbnail,pricing")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get("?fields=name,slug,thumbnail,pricing&count=false")
+
+        item = response.json()['items'][1]
+        self.assertEqual(sorted(item), ['id', 'name', 'pricing', 'slug', 'thumbnail'])
+        self.assertEqual(item['pricing']['display'], "$450,000")
+        self.assertIn('fill-400x300', item['thumbnail']['url'])
+        self.assertEqual((item['thumbnail']['width'], item['thumbnail']['height']), (400, 300))
+        # page ids, designs with their images, image metadata, renditions
+        self.assertLessEqual(len(queries), 4)
+
+    def test_exclude_and_all_fields(self):
+        item = self.get("?fields=*,-description,-tags").json()['items'][0]
+
+        self.assertIn('thumbnail', item)
+        self.assertIn('updated_at', item)
+        self.assertNotIn('description', item)
+        self.assertNotIn('tags', item)
+
+    def test_unknown_field_or_parameter_is_rejected(self):
+        self.assertEqual(self.get("?fields=name,floor_plan").status_code, 400)
+        self.assertEqual(self.get("?colour=red").status_code, 400)
+        self.assertEqual(self.get("?sort=colour").status_code, 400)
+
+    def test_filters_sort_and_cursor(self):
+        data = self.get("?fields=name&storeys=2&sort=-price&limit=1&cursor=").json()
+        self.assertEqual([item['name'] for item in data['items']], ["Banksia"])
+        self.assertEqual(data['meta']['total_count'], 2)
+
+        data = self.get(f"?fields=name&storeys=2&sort=-price&limit=1&cursor={data['meta']['next_cursor']}").json()
+        self.assertEqual([item['name'] for item in data['items']], ["Coral"])
+        self.assertIsNone(data['meta']['next_cursor'])
+
+    def test_detail(self):
+        design = HouseDesign.objects.get(slug="banksia")
+
+        response = self.get(f"{design.pk}/?fields=name")
+        self.assertEqual(response.json(), {'id': design.pk, 'name': "Banksia"})
+
+        draft = HouseDesign.objects.get(slug="draft")
+        self.assertEqual(self.get(f"{draft.pk}/").status_code, 404)
+
+    def test_conditional_request_runs_no_queries(self):
+        etag = self.get("?fields=name")["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.get("?fields=name", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            HouseDesign.objects.get(slug="aira").save()
+        self.assertEqual(self.get("?fields=name", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), RENDITION_WORKERS=0)
+class HouseDesignDetailAPITests(TestCase):
+    """
+    Tests for the house design detail endpoint and its additional_content.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.images = [Image.objects.create(title=f"Photo {i}", file=get_test_image_file()) for i in range(8)]
+        self.home = Site.objects.get(is_default_site=True).root_page
+        self.design = HouseDesign.objects.create(
+            name="Aira",
+            slug="aira",
+            bedrooms=4,
+            bathrooms=Decimal('2.5'),
+            featured_image=self.images[0],
+            additional_content=self.get_content(self.images[:2]),
+        )
+
+    def get_content(self, gallery_images):
+        half = len(gallery_images) // 2
+        return [
+            {'type': 'content', 'value': [
+                {'type': 'image', 'value': {'image': self.images[0].pk, 'alt_text': "Facade", 'caption': ""}},
+                {'type': 'image_gallery', 'value': {
+                    'images': [
+                        {'type': 'item', 'id': f"item-{image.pk}", 'value': {'image': image.pk, 'alt_text': "", 'caption': image.title}}
+                        for image in gallery_images[:half]
+                    ],
+                    'layout': 'grid',
+                }},
+                {'type': 'cta_button', 'value': {
+                    'button_text': "Enquire", 'button_style': 'primary', 'is_external_link': False,
+                    'external_url': "", 'page_link': self.home.pk,
+                }},
+                {'type': 'pricing', 'value': {
+                    'base_price': '350000.00', 'price_label': "From", 'currency': "$", 'price_note': "",
+                }},
+            ]},
+            {'type': 'content', 'value': [
+                {'type': 'image_gallery', 'value': {
+                    'images': [
+                        {'type': 'item', 'id': f"item-{image.pk}", 'value': {'image': image.pk, 'alt_text': "", 'caption': image.title}}
+                        for image in gallery_images[half:]
+                    ],
+                    'layout': 'carousel',
+                }},
+            ]},
+        ]
+
+    def get_detail(self, slug="aira"):
+        return self.client.get(f"/api/v2/house-designs/{slug}/")
+
+    def test_detail_by_slug_serializes_additional_content(self):
+        response = self.get_detail()
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['name'], "Aira")
+        self.assertIn('thumbnail', data)
+
+        first, second = data['additional_content']
+        image, gallery, cta, pricing = first['value']
+        self.assertEqual(image['value']['image']['alt'], "Facade")
+        self.assertIn('fill-1200x800', image['value']['image']['desktop'])
+        self.assertEqual(gallery['value']['layout'], 'grid')
+        self.assertEqual(gallery['value']['images'][0]['caption'], "Photo 0")
+        self.assertIn('fill-1600x1200', gallery['value']['images'][0]['image']['desktop'])
+        self.assertEqual(cta['value']['link'], self.home.url)
+        self.assertEqual(pricing['value']['price_label'], "From")
+        self.assertEqual(len(second['value'][0]['value']['images']), 1)
+
+    def test_gallery_queries_do_not_grow_with_images(self):
+        HouseDesign.objects.create(
+            name="Banksia", slug="banksia", bedrooms=4, bathrooms=2,
+            featured_image=self.images[0], additional_content=self.get_content(self.images),
+        )
+        # Create the renditions first, then measure uncached payloads
+        self.get_detail()
+        self.get_detail("banksia")
+        cache.clear()
+        Site.get_site_root_paths()
+
+        with CaptureQueriesContext(connection) as small:
+            self.get_detail()
+        with CaptureQueriesContext(connection) as large:
+            response = self.get_detail("banksia")
+
+        self.assertEqual(len(response.json()['additional_content'][1]['value'][0]['value']['images']), 4)
+        self.assertEqual(len(large), len(small))
+
+    def test_detail_is_cached_per_revision(self):
+        self.get_detail()
+
+        with self.assertNumQueries(1):
+            response = self.get_detail()
+        self.assertEqual(response.json()['name'], "Aira")
+
+        self.design.name = "Aira II"
+        self.design.save()
+        self.assertEqual(self.get_detail().json()['name'], "Aira II")
+
+    def test_image_change_refreshes_cached_detail(self):
+        self.get_detail()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.images[0].title = "Renamed"
+            self.images[0].save()
+
+        gallery = self.get_detail().json()['additional_content'][0]['value'][1]
+        self.assertEqual(gallery['value']['images'][0]['image']['alt'], "Renamed")
+
+    def test_missing_or_unpublished_design(self):
+        self.assertEqual(self.get_detail("nope").status_code, 404)
+
+        self.design.is_published = False
+        self.design.save()
+        self.assertEqual(self.get_detail().status_code, 404)
+
+    def test_additional_content_is_detail_only(self):
+        response = self.client.get("/api/v2/house-designs/?fields=additional_content")
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get(f"/api/v2/house-designs/{self.design.pk}/?fields=name,additional_content")
+        self.assertEqual(sorted(response.json()), ['additional_content', 'id', 'name'])
+
+
+class HouseDesignListingParametersTests(TestCase):
+    """
+    Tests for filtering, sorting and pagination of the house design listing.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.freedom = HouseCategory.objects.create(name="Freedom", slug="freedom")
+        self.designer = HouseCategory.objects.create(name="Designer", slug="designer")
+        specs = [
+            ("Aira", '1', 3, '2.0', 310000, self.freedom),
+            ("Banksia", '2', 4, '2.5', 450000, self.designer),
+            ("Coral", '2', 4, '3.0', None, self.designer),
+            ("Dune", '1', 2, '1.0', 280000, self.freedom),
+            ("Elm", '2', 5, '3.5', 620000, self.designer),
+        ]
+        for name, storeys, bedrooms, bathrooms, price, category in specs:
+            HouseDesign.objects.create(
+                name=name,
+                slug=name.lower(),
+                storeys=storeys,
+                bedrooms=bedrooms,
+                bathrooms=Decimal(bathrooms),
+                base_price=price,
+                category=category,
+            )
+        self.page = HouseDesignsIndexPage(title="Designs", slug="designs", designs_per_page=6)
+
+    def get_names(self, **params):
+        listing = self.page.get_house_designs_listing(params)
+        return [design.name for design in listing['designs']]
+
+    def test_filters(self):
+        self.assertEqual(self.get_names(storeys='1'), ["Aira", "Dune"])
+        self.assertEqual(self.get_names(bedrooms='4'), ["Banksia", "Coral"])
+        self.assertEqual(self.get_names(bathrooms='3'), ["Coral", "Elm"])
+        self.assertEqual(self.get_names(category='freedom'), ["Aira", "Dune"])
+        self.assertEqual(self.get_names(max_price='400000'), ["Aira", "Dune"])
+        self.assertEqual(self.get_names(min_price='450000'), ["Banksia", "Elm"])
+        self.assertEqual(self.get_names(min_price='300000', max_price='450000'), ["Aira", "Banksia"])
+        self.assertEqual(self.get_names(storeys='2', category='designer', bedrooms='4'), ["Banksia", "Coral"])
+
+    def test_invalid_filters_are_ignored(self):
+        self.assertEqual(len(self.get_names(bedrooms='many', max_price='cheap', storeys='9')), 5)
+
+    def test_sorts(self):
+        self.assertEqual(self.get_names(sort='price'), ["Dune", "Aira", "Banksia", "Elm", "Coral"])
+        self.assertEqual(self.get_names(sort='-price'), ["Elm", "Banksia", "Aira", "Dune", "Coral"])
+        self.assertEqual(self.get_names(sort='-bedrooms')[0], "Elm")
+        self.assertEqual(self.get_names(sort='bogus'), ["Aira", "Banksia", "Coral", "Dune", "Elm"])
+
+    def test_pagination(self):
+        self.assertEqual(self.get_names(per_page='2', page='2'), ["Coral", "Dune"])
+        self.assertEqual(self.get_names(per_page='2', page='99'), ["Elm"])
+
+        self.page.designs_per_page = 3
+        self.assertEqual(self.get_names(), ["Aira", "Banksia", "Coral"])
+
+    def test_cursor_pages_match_numbered_pages(self):
+        for sort in HOUSE_DESIGN_SORTS:
+            names, cursor = [], ''
+            while cursor is not None:
+                listing = self.page.get_house_designs_listing(
+                    {'sort': sort, 'per_page': '2', 'designs_cursor': cursor}
+                )
+                names += [design.name for design in listing['designs']]
+                cursor = listing['next_cursor']
+                self.assertEqual(listing['total_count'], 5)
+
+            self.assertEqual(names, self.get_names(sort=sort), sort)
+
+    def test_count_free_pages(self):
+        params = {'per_page': '2', 'designs_count': 'false'}
+        with CaptureQueriesContext(connection) as queries:
+            first = self.page.get_house_designs_listing({**params, 'page': '1'})
+            last = self.page.get_house_designs_listing({**params, 'designs_cursor': '', 'sort': 'newest', 'per_page': '5'})
+        self.assertFalse(any('COUNT(' in query['sql'] for query in queries))
+
+        self.assertEqual([design.name for design in first['designs']], ["Aira", "Banksia"])
+        self.assertTrue(first['has_next'])
+        self.assertIsNone(first['total_count'])
+        self.assertFalse(last['has_next'])
+        self.assertIsNone(last['next_cursor'])
+
+    def test_api_listing_parameters(self):
+        root = Site.objects.get(is_default_site=True).root_page
+        root.add_child(instance=self.page)
+
+        response = self.client.get("/api/v2/pages/", {
+            'type': 'house_designs.HouseDesignsIndexPage',
+            'fields': 'house_designs_data,house_designs_meta',
+            'storeys': '2',
+            'sort': '-price',
+            'per_page': '2',
+        })
+        self.assertEqual(response.status_code, 200)
+        item = response.json()['items'][0]
+
+        self.assertEqual([design['name'] for design in item['house_designs_data']], ["Elm", "Banksia"])
+        self.assertEqual(item['house_designs_meta']['total_count'], 3)
+        self.assertEqual(item['house_designs_meta']['num_pages'], 2)
+        self.assertEqual(item['house_designs_meta']['filters'], {'storeys': '2'})
+
+    def test_unknown_api_parameter_is_rejected(self):
+        response = self.client.get("/api/v2/pages/", {
+            'type': 'house_designs.HouseDesignsIndexPage', 'colour': 'red',
+        })
+        self.assertEqual(response.status_code, 400)
+
+
+class HouseDesignFacetTests(TestCase):
+    """
+    Tests for the facet counts in HouseDesignsIndexPage.filter_options.
+    """
+
+    def setUp(self):
+        cache.clear()
+        freedom = HouseCategory.objects.create(name="Freedom", slug="freedom", order=1)
+        designer = HouseCategory.objects.create(name="Designer", slug="designer", order=2)
+        HouseCategory.objects.create(name="Empty", slug="empty")
+        melbourne = BuildLocation.objects.create(name="Melbourne", slug="melbourne")
+        specs = [
+            ("Aira", '1', 3, '2.0', 310000, freedom, melbourne),
+            ("Banksia", '2', 4, '2.5', 450000, designer, melbourne),
+            ("Coral", '2', 4, '3.0', None, designer, None),
+            ("Dune", '1', 2, '1.0', 280000, freedom, None),
+        ]
+        for name, storeys, bedrooms, bathrooms, price, category, location in specs:
+            HouseDesign.objects.create(
+                name=name,
+                slug=name.lower(),
+                storeys=storeys,
+                bedrooms=bedrooms,
+                bathrooms=Decimal(bathrooms),
+                base_price=price,
+                category=category,
+                build_location=location,
+            )
+        self.page = HouseDesignsIndexPage(title="Designs", slug="designs")
+
+    def get_counts(self, facet, **filters):
+        options = self.page.get_filter_options(filters)[facet]
+        return {option['label']: option['count'] for option in options}
+
+    def test_counts_without_filters(self):
+        self.assertEqual(
+            self.get_counts('storeys'),
+            {'Single Storey': 2, 'Double Storey': 2, 'Three Storey': 0},
+        )
+        self.assertEqual(self.get_counts('bedrooms'), {'2': 1, '3': 1, '4': 2})
+        self.assertEqual(self.get_counts('bathrooms'), {'1+': 4, '2+': 3, '2.5+': 2, '3+': 1})
+        self.assertEqual(self.get_counts('categories'), {'Freedom': 2, 'Designer': 2})
+        self.assertEqual(self.get_counts('locations'), {'Melbourne': 2})
+        self.assertEqual(self.get_counts('price_ranges')['Under $300k'], 1)
+        self.assertEqual(self.get_counts('price_ranges')['Under $500k'], 3)
+
+    def test_facet_ignores_its_own_filter(self):
+        self.assertEqual(
+            self.get_counts('storeys', storeys='2', category='freedom'),
+            {'Single Storey': 2, 'Double Storey': 0, 'Three Storey': 0},
+        )
+        self.assertEqual(
+            self.get_counts('categories', storeys='2', category='freedom'),
+            {'Freedom': 0, 'Designer': 2},
+        )
+
+    def test_arbitrary_max_price(self):
+        self.assertEqual(self.get_counts('storeys', max_price='320000')['Single Storey'], 2)
+        self.assertEqual(self.get_counts('storeys', max_price='300000')['Single Storey'], 1)
+
+    def test_arbitrary_min_price(self):
+        self.assertEqual(self.get_counts('storeys', min_price='300000')['Single Storey'], 1)
+        self.assertEqual(self.get_counts('storeys', min_price='280000')['Single Storey'], 2)
+
+    def test_price_range_counts_at_bucket_boundaries(self):
+        for name, price in [("Fern", 300000), ("Gum", 599999), ("Hakea", 600000), ("Ivy", 600001)]:
+            HouseDesign.objects.create(name=name, slug=name.lower(), bedrooms=3, bathrooms=2, base_price=price)
+
+        # 280k, 300k, 310k, 450k, 599,999, 600k and 600,001; ranges include their bound
+        self.assertEqual(self.get_counts('price_ranges'), {
+            'Under $300k': 2,
+            'Under $400k': 3,
+            'Under $500k': 4,
+            'Under $600k': 6,
+            '$600k+': 2,
+        })
+        self.assertEqual(self.get_counts('storeys', min_price='600000')['Single Storey'], 2)
+        options = self.page.get_filter_options({})['price_ranges']
+        self.assertEqual(options[-1]['parameter'], 'min_price')
+
+    def test_price_range_counts_ignore_either_price_bound(self):
+        self.assertEqual(
+            self.get_counts('price_ranges', min_price='600000')['Under $300k'],
+            self.get_counts('price_ranges')['Under $300k'],
+        )
+        self.assertEqual(self.get_counts('storeys', min_price='600000')['Single Storey'], 0)
+
+    def test_bathroom_counts_at_boundaries(self):
+        HouseDesign.objects.create(name="Fern", slug="fern", bedrooms=3, bathrooms=Decimal('3.0'))
+
+        # 1.0, 2.0, 2.5, 3.0 and 3.0: each option is a minimum
+        self.assertEqual(self.get_counts('bathrooms'), {'1+': 5, '2+': 4, '2.5+': 3, '3+': 2})
+
+    def test_counts_use_one_query_and_are_cached(self):
+        with self.assertNumQueries(1):
+            self.page.get_filter_options({'storeys': '1'})
+        with self.assertNumQueries(0):
+            self.page.get_filter_options({'storeys': '1'})
+
+    def test_design_change_expires_cached_counts(self):
+        self.assertEqual(self.get_counts('storeys')['Three Storey'], 0)
+
+        coral = HouseDesign.objects.get(slug='coral')
+        with self.captureOnCommitCallbacks(execute=True):
+            coral.storeys = '3'
+            coral.save()
+
+        self.assertEqual(self.get_counts('storeys')['Three Storey'], 1)
+
+    def test_versions_are_bumped_once_the_change_commits(self):
+        version = get_content_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            coral = HouseDesign.objects.get(slug='coral')
+            coral.storeys = '3'
+            coral.save()
+            # Other connections still read the old rows until the commit
+            self.assertEqual(get_content_version(), version)
+
+        self.assertGreater(get_content_version(), version)
+
+
+class HouseDesignSearchTests(TestCase):
+    """
+    Tests for keeping the HouseDesignSearch projection in sync.
+    """
+
+    def setUp(self):
+        self.category = HouseCategory.objects.create(name="Freedom", slug="freedom")
+        self.design = HouseDesign.objects.create(
+            name="Aira",
+            slug="aira",
+            bedrooms=3,
+            bathrooms=Decimal('2.0'),
+            base_price=310000,
+            category=self.category,
+        )
+
+    def test_save_writes_entry(self):
+        entry = HouseDesignSearch.objects.get(design=self.design)
+
+        self.assertEqual(entry.name, "Aira")
+        self.assertEqual(entry.bedrooms, 3)
+        self.assertEqual(entry.category_slug, "freedom")
+        self.assertEqual(entry.location_slug, "")
+
+        self.design.bedrooms = 4
+        self.design.save()
+        self.assertEqual(HouseDesignSearch.objects.get(design=self.design).bedrooms, 4)
+
+    def test_unpublish_and_delete_remove_entry(self):
+        self.design.is_published = False
+        self.design.save()
+        self.assertFalse(HouseDesignSearch.objects.filter(design=self.design).exists())
+
+        self.design.is_published = True
+        self.design.save()
+        self.design.delete()
+        self.assertFalse(HouseDesignSearch.objects.exists())
+
+    def test_category_changes_are_copied(self):
+        self.category.slug = "freedom-range"
+        self.category.save()
+        self.assertEqual(HouseDesignSearch.objects.get().category_slug, "freedom-range")
+
+        self.category.delete()
+        self.assertEqual(HouseDesignSearch.objects.get().category_slug, "")
+
+    def test_rebuild(self):
+        HouseDesignSearch.objects.all().delete()
+        HouseDesign.objects.create(name="Draft", slug="draft", bedrooms=2, bathrooms=1, is_published=False)
+
+        self.assertEqual(HouseDesignSearch.rebuild(), 1)
+        self.assertEqual(list(HouseDesignSearch.objects.values_list('name', flat=True)), ["Aira"])
+
+
+@unittest.skipIf(engine_numpy is None, "NumPy is not installed")
+class CatalogEngineTests(HouseDesignListingParametersTests):
+    """
+    Runs the listing tests through the NumPy catalog engine and checks it
+    against the database path.
+    """
+
+    def setUp(self):
+        super().setUp()
+        reset_catalog_engine()
+        self.enable_engine = override_settings(HOUSE_DESIGN_CATALOG_ENGINE=True)
+        self.enable_engine.enable()
+        self.addCleanup(self.enable_engine.disable)
+        self.addCleanup(reset_catalog_engine)
+
+    def assertEngineMatchesDatabase(self, engine):
+        entries = HouseDesignSearch.objects.all()
+        combinations = [
+            {}, {'storeys': '2'}, {'bathrooms': '2.5'}, {'max_price': '450000'}, {'min_price': '450000'},
+            {'category': 'designer', 'bedrooms': '4'}, {'category': 'missing'},
+        ]
+        for filters in combinations:
+            for sort, ordering in HOUSE_DESIGN_SORTS.items():
+                expected = list(
+                    filter_house_designs(entries, filters).order_by(*ordering).values_list('pk', flat=True)
+                )
+                self.assertEqual([int(pk) for pk in engine.search(filters, sort)], expected, (filters, sort))
+
+    def test_engine_matches_database(self):
+        self.assertEngineMatchesDatabase(get_catalog_engine())
+
+    def test_listing_uses_no_filter_queries(self):
+        get_catalog_engine()
+        # one page of designs and its tags
+        with self.assertNumQueries(2):
+            self.get_names(storeys='2', sort='-price')
+
+    def test_saved_design_is_applied_without_reload(self):
+        engine = get_catalog_engine()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            HouseDesign.objects.get(slug='aira').delete()
+
+        updated = get_catalog_engine()
+        self.assertIsNot(updated, engine)
+        with self.assertNumQueries(0):
+            self.assertIs(get_catalog_engine(), updated)
+        self.assertEqual(len(updated.search({}, 'name')), 4)
+
+        banksia = HouseDesign.objects.get(slug='banksia')
+        with self.captureOnCommitCallbacks(execute=True):
+            banksia.storeys = '1'
+            banksia.save()
+
+        self.assertIn(banksia.pk, get_catalog_engine().search({'storeys': '1'}, 'name'))
+
+    def test_saves_are_patched_without_reload_or_resort(self):
+        get_catalog_engine()
+        coral = HouseDesign.objects.get(slug='coral')
+        dune = HouseDesign.objects.get(slug='dune')
+
+        with mock.patch.object(CatalogEngine, 'load', side_effect=AssertionError), \
+                mock.patch.object(CatalogEngine, '_build_orders', side_effect=AssertionError):
+            with self.captureOnCommitCallbacks(execute=True):
+                coral.name = "Acacia"
+                coral.base_price = 300000
+                coral.save()
+            with self.captureOnCommitCallbacks(execute=True):
+                HouseDesign.objects.create(
+                    name="Fig", slug="fig", storeys='2', bedrooms=4,
+                    bathrooms=Decimal('2.5'), base_price=450000, category=self.freedom,
+                )
+            with self.captureOnCommitCallbacks(execute=True):
+                dune.is_published = False
+                dune.save()
+            with self.captureOnCommitCallbacks(execute=True):
+                HouseDesign.objects.get(slug='elm').delete()
+            with self.captureOnCommitCallbacks(execute=True):
+                dune.is_published = True
+                dune.bedrooms = 6
+                dune.save()
+
+            self.assertEngineMatchesDatabase(get_catalog_engine())
+
+
+class CatalogEngineFallbackTests(HouseDesignListingParametersTests):
+    """
+    The listing falls back to the database when the engine is unavailable.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.numpy = mock.patch('house_designs.engine.numpy', None)
+        self.numpy.start()
+        self.addCleanup(self.numpy.stop)
+        self.enable_engine = override_settings(HOUSE_DESIGN_CATALOG_ENGINE=True)
+        self.enable_engine.enable()
+        self.addCleanup(self.enable_engine.disable)
+
+    def test_engine_is_disabled(self):
+        self.assertIsNone(get_catalog_engine())
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), RENDITION_WORKERS=0)
+class HouseDesignTransferTests(TestCase):
+    """
+    Tests for bulk import and export (house_designs.transfer).
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.image_root = tempfile.mkdtemp()
+        self.category = HouseCategory.objects.create(name="Freedom", slug="freedom")
+        self.location = BuildLocation.objects.create(name="Melbourne", slug="melbourne")
+        self.design = HouseDesign.objects.create(
+            name="Aira",
+            slug="aira",
+            description="<p>Open plan</p>",
+            storeys='2',
+            bedrooms=4,
+            bathrooms=Decimal('2.5'),
+            base_price=Decimal('350000.00'),
+            category=self.category,
+            build_location=self.location,
+        )
+        self.design.tags.add("Modern", "Family Home")
+        self.design.save()
+
+    def write_image(self, name, colour='white'):
+        with open(os.path.join(self.image_root, name), 'wb') as image_file:
+            image_file.write(get_test_image_file(colour=colour).file.getvalue())
+
+    def import_csv(self, text, **kwargs):
+        return import_house_designs(io.StringIO(text), 'csv', image_root=self.image_root, **kwargs)
+
+    def design_rows(self, count, start=0):
+        header = "slug,name,bedrooms,bathrooms,category,location,tags\n"
+        return header + "".join(
+            f'design-{i},Design {i},3,2,freedom,melbourne,"Modern, Coastal"\n'
+            for i in range(start, start + count)
+        )
+
+    def test_csv_round_trip(self):
+        stream = io.StringIO()
+        self.assertEqual(export_house_designs(HouseDesign.objects.all(), 'csv', stream), 1)
+
+        HouseDesign.objects.all().delete()
+        HouseCategory.objects.all().delete()
+        BuildLocation.objects.all().delete()
+        stream.seek(0)
+        result = import_house_designs(stream, 'csv')
+
+        self.assertTrue(result.ok, result.errors)
+        self.assertEqual((result.created, result.updated), (1, 0))
+        design = HouseDesign.objects.select_related('category', 'build_location').get(slug='aira')
+        self.assertEqual(design.description, "<p>Open plan</p>")
+        self.assertEqual(design.storeys, '2')
+        self.assertEqual(design.bathrooms, Decimal('2.5'))
+        self.assertEqual(design.base_price, Decimal('350000.00'))
+        self.assertEqual((design.category.slug, design.category.name), ('freedom', 'Freedom'))
+        self.assertEqual((design.build_location.slug, design.build_location.name), ('melbourne', 'Melbourne'))
+        self.assertEqual(sorted(tag.name for tag in design.tags.all()), ["Family Home", "Modern"])
+        self.assertTrue(HouseDesignSearch.objects.filter(design=design, category_slug='freedom').exists())
+
+    def test_json_round_trip(self):
+        stream = io.StringIO()
+        export_house_designs(HouseDesign.objects.all(), 'json', stream)
+        rows = json.loads(stream.getvalue())
+        self.assertEqual(rows[0]['tags'], ["Family Home", "Modern"])
+        self.assertEqual(rows[0]['bathrooms'], '2.5')
+
+        rows[0]['bedrooms'] = 5
+        rows[0]['tags'] = ["Coastal"]
+        result = import_house_designs(io.StringIO(json.dumps(rows)), 'json')
+
+        self.assertEqual((result.created, result.updated), (0, 1))
+        self.design.refresh_from_db()
+        self.assertEqual(self.design.bedrooms, 5)
+        self.assertEqual([tag.name for tag in self.design.tags.all()], ["Coastal"])
+
+    def test_update_leaves_absent_columns_unchanged(self):
+        updated_at = self.design.updated_at
+        result = self.import_csv("slug,base_price,is_published\naira,410000,false\n")
+
+        self.assertEqual((result.created, result.updated), (0, 1))
+        self.design.refresh_from_db()
+        self.assertEqual(self.design.base_price, Decimal('410000'))
+        self.assertFalse(self.design.is_published)
+        self.assertEqual(self.design.name, "Aira")
+        self.assertEqual(self.design.category, self.category)
+        self.assertEqual(self.design.tags.count(), 2)
+        self.assertGreater(self.design.updated_at, updated_at)
+        # Unpublished designs leave the projection
+        self.assertFalse(HouseDesignSearch.objects.filter(design=self.design).exists())
+
+    def test_import_creates_missing_categories_and_locations(self):
+        result = self.import_csv(
+            "slug,name,bedrooms,bathrooms,category,category_name,location\n"
+            "ness,Ness,3,2,designer,Designer Range,north-west\n"
+        )
+
+        self.assertTrue(result.ok, result.errors)
+        design = HouseDesign.objects.get(slug='ness')
+        self.assertEqual(design.category.name, "Designer Range")
+        self.assertEqual(design.build_location.name, "North West")
+
+    def test_invalid_rows_abort_the_import(self):
+        result = self.import_csv(
+            "slug,name,bedrooms,bathrooms,storeys\n"
+            "one,One,3,2,1\n"
+            "two,Two,many,2,1\n"
+            "one,One again,3,2,1\n"
+            "three,Three,3,2,triple\n"
+            "four,Four,,2,1\n"
+        )
+
+        self.assertFalse(result.ok)
+        self.assertEqual([number for number, _ in result.errors], [3, 4, 5, 6])
+        self.assertIn("bedrooms", result.errors[0][1])
+        self.assertIn("more than once", result.errors[1][1])
+        self.assertIn("storeys", result.errors[2][1])
+        self.assertEqual(HouseDesign.objects.count(), 1)
+
+    def test_new_designs_need_required_fields(self):
+        result = self.import_csv("slug,name\nness,Ness\n")
+        self.assertEqual(result.errors, [(2, "new designs need bedrooms, bathrooms")])
+
+    def test_dry_run_writes_nothing(self):
+        result = self.import_csv(self.design_rows(3), dry_run=True)
+        self.assertTrue(result.ok)
+        self.assertEqual(HouseDesign.objects.count(), 1)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        Tag.objects.create(name="Coastal")
+        with CaptureQueriesContext(connection) as small:
+            self.import_csv(self.design_rows(5))
+        # Within one insert batch (SQLite limits the parameters of a query)
+        with CaptureQueriesContext(connection) as large:
+            self.import_csv(self.design_rows(40, start=5))
+
+        self.assertEqual(len(large), len(small))
+        self.assertEqual(HouseDesignSearch.objects.count(), 46)
+
+    def test_import_bumps_versions_once(self):
+        with mock.patch('house_designs.transfer.bump_versions_on_commit') as bump:
+            self.import_csv(self.design_rows(20))
+        bump.assert_called_once_with(
+            'model:house_designs.housedesign', 'model:house_designs.housecategory', 'model:house_designs.buildlocation',
+        )
+
+    def test_images_are_fetched_and_deduplicated_by_hash(self):
+        existing = Image(title="Existing", file=get_test_image_file())
+        existing._set_image_file_metadata()
+        existing.save()
+        self.write_image('same.png')
+        self.write_image('red.png', colour='red')
+        self.write_image('red-copy.png', colour='red')
+
+        result = self.import_csv(
+            "slug,name,bedrooms,bathrooms,featured_image,featured_image_title\n"
+            "one,One,3,2,same.png,\n"
+            "two,Two,3,2,red.png,Red facade\n"
+            "three,Three,3,2,red-copy.png,\n"
+            f"four,Four,3,2,{existing.pk},\n"
+        )
+
+        self.assertTrue(result.ok, result.errors)
+        self.assertEqual((result.images_created, result.images_reused), (1, 1))
+        images = dict(HouseDesign.objects.values_list('slug', 'featured_image'))
+        self.assertEqual(images['one'], existing.pk)
+        self.assertEqual(images['four'], existing.pk)
+        self.assertEqual(images['two'], images['three'])
+        self.assertEqual(Image.objects.get(pk=images['two']).title, "Red facade")
+
+    def test_image_errors(self):
+        with open(os.path.join(self.image_root, 'notes.txt'), 'w') as text_file:
+            text_file.write("not an image")
+
+        result = self.import_csv(
+            "slug,name,bedrooms,bathrooms,featured_image\n"
+            "one,One,3,2,missing.png\n"
+            "two,Two,3,2,notes.txt\n"
+            "three,Three,3,2,../secret.png\n"
+            "four,Four,3,2,999999\n"
+        )
+
+        self.assertEqual([number for number, _ in result.errors], [2, 3, 4, 5])
+        self.assertIn("not an image", result.errors[1][1])
+        self.assertIn("outside the image directory", result.errors[2][1])
+        self.assertIn("does not exist", result.errors[3][1])
+
+    def test_local_paths_need_an_image_root(self):
+        self.write_image('same.png')
+        result = import_house_designs(
+            io.StringIO("slug,featured_image\naira,same.png\n"), 'csv'
+        )
+        self.assertIn("not allowed", result.errors[0][1])
+
+    @override_settings(WAGTAILIMAGES_MAX_UPLOAD_SIZE=100)
+    def test_local_images_are_limited_in_size(self):
+        self.write_image('same.png')
+        with self.assertRaisesMessage(ValueError, "larger than 100 bytes"):
+            fetch_image('same.png', self.image_root)
+
+    def test_unreadable_files(self):
+        with self.assertRaises(HouseDesignImportError):
+            import_house_designs(io.StringIO('{"slug": "aira"}'), 'json')
+        with self.assertRaises(HouseDesignImportError):
+            import_house_designs(io.StringIO("name\nAira\n"), 'csv')
+
+    def test_management_commands(self):
+        path = os.path.join(self.image_root, 'designs.json')
+        call_command('export_house_designs', path, stdout=io.StringIO())
+        HouseDesign.objects.all().delete()
+
+        stdout = io.StringIO()
+        call_command('import_house_designs', path, stdout=stdout)
+        self.assertIn("Created 1 and updated 0", stdout.getvalue())
+        self.assertTrue(HouseDesign.objects.filter(slug='aira').exists())
+
+    def test_admin_export_and_import(self):
+        user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(user)
+
+        url = reverse('wagtail_bulk_action', args=('house_designs', 'housedesign', 'export_csv'))
+        response = self.client.get(url, {'id': self.design.pk})
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        exported = response.content.decode()
+        self.assertIn("Aira,aira", exported)
+
+        upload = SimpleUploadedFile('designs.csv', exported.replace("Aira,aira", "Aira II,aira").encode())
+        response = self.client.post(reverse('house_designs_import'), {'file': upload})
+        self.assertEqual(response.status_code, 302)
+        self.design.refresh_from_db()
+        self.assertEqual(self.design.name, "Aira II")
+
+    def test_admin_import_of_images_needs_image_permission(self):
+        user = get_user_model().objects.create_user('editor', 'editor@example.com', 'password')
+        user.user_permissions.add(*Permission.objects.filter(
+            content_type__app_label__in=['wagtailadmin', 'house_designs'],
+            codename__in=['access_admin', 'add_housedesign', 'change_housedesign'],
+        ))
+        self.client.force_login(user)
+        image = Image.objects.create(title="Aira", file=get_test_image_file())
+
+        upload = SimpleUploadedFile('designs.csv', f"slug,featured_image\naira,{image.pk}\n".encode())
+        response = self.client.post(reverse('house_designs_import'), {'file': upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "you do not have permission to add images")
+        self.design.refresh_from_db()
+        self.assertIsNone(self.design.featured_image)
+
+        upload = SimpleUploadedFile('designs.csv', b"slug,name\naira,Aira II\n")
+        response = self.client.post(reverse('house_designs_import'), {'file': upload})
+        self.assertEqual(response.status_code, 302)
+
+
+class ImageServerHandler(BaseHTTPRequestHandler):
+    """Serves a test image, an oversized file and redirects"""
+
+    image = get_test_image_file().file.getvalue()
+
+    def do_GET(self):
+        if self.path == '/photo.png':
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(self.image)
+        elif self.path.startswith('/redirect?to='):
+            self.send_response(302)
+            self.send_header('Location', self.path.split('=', 1)[1])
+            self.end_headers()
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class HouseDesignImageDownloadTests(TestCase):
+    """
+    Tests for downloading imported images (house_designs.transfer.fetch_image).
+
+    A local server stands in for an image host: ``images.test`` resolves
+    to it, while other hosts are checked as usual.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), ImageServerHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.addClassCleanup(cls.server.server_close)
+        cls.addClassCleanup(cls.server.shutdown)
+        cls.base_url = f"http://images.test:{cls.server.server_port}"
+
+    def setUp(self):
+        def resolve(host, port):
+            return '127.0.0.1' if host == 'images.test' else get_public_address(host, port)
+
+        patcher = mock.patch('house_designs.transfer.get_public_address', side_effect=resolve)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_downloads_image(self):
+        content, name, _ = fetch_image(f"{self.base_url}/photo.png")
+        self.assertEqual(content, ImageServerHandler.image)
+        self.assertEqual(name, 'photo.png')
+
+    def test_internal_addresses_are_refused(self):
+        for url in [
+            "http://169.254.169.254/latest/meta-data/photo.png",
+            "http://127.0.0.1/photo.png",
+            "http://10.0.0.5/photo.png",
+            "http://[::1]/photo.png",
+            "http://[::ffff:192.168.0.1]/photo.png",
+        ]:
+            with self.subTest(url=url), self.assertRaisesMessage(ValueError, "not a public address"):
+                fetch_image(url)
+
+    def test_host_names_resolving_to_internal_addresses_are_refused(self):
+        addresses = [(2, 1, 6, '', ('93.184.216.34', 80)), (2, 1, 6, '', ('169.254.169.254', 80))]
+        with mock.patch('house_designs.transfer.socket.getaddrinfo', return_value=addresses):
+            with self.assertRaisesMessage(ValueError, "not a public address"):
+                transfer.get_public_address('metadata.example.com', 80)
+
+    def test_redirects_to_internal_addresses_are_refused(self):
+        with self.assertRaisesMessage(ValueError, "not a public address"):
+            fetch_image(f"{self.base_url}/redirect?to=http://169.254.169.254/photo.png")
+        with self.assertRaisesMessage(ValueError, "not a public address"):
+            fetch_image(f"{self.base_url}/redirect?to=http://localhost:{self.server.server_port}/photo.png")
+
+        content, _, _ = fetch_image(f"{self.base_url}/redirect?to={self.base_url}/photo.png")
+        self.assertEqual(content, ImageServerHandler.image)
+
+    def test_downloads_are_limited_in_size(self):
+        with override_settings(WAGTAILIMAGES_MAX_UPLOAD_SIZE=len(ImageServerHandler.image) - 1):
+            with self.assertRaisesMessage(ValueError, "larger than"):
+                fetch_image(f"{self.base_url}/photo.png")
+        with override_settings(WAGTAILIMAGES_MAX_UPLOAD_SIZE=len(ImageServerHandler.image)):
+            self.assertEqual(fetch_image(f"{self.base_url}/photo.png")[0], ImageServerHandler.image)
+
+    def test_import_reports_refused_urls(self):
+        result = import_house_designs(io.StringIO(
+            "slug,name,bedrooms,bathrooms,featured_image\n"
+            "one,One,3,2,http://169.254.169.254/latest/meta-data/\n"
+            f"two,Two,3,2,{self.base_url}/photo.png\n"
+        ), 'csv')
+
+        self.assertEqual([number for number, _ in result.errors], [2])
+        self.assertIn("not a public address", result.errors[0][1])
 
-# Create your tests here.
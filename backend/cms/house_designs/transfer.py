@@ -0,0 +1,726 @@
+"""
+Bulk Import and Export of House Designs
+
+Reads and writes house designs as CSV or JSON, one design per row, with
+their category, build location, tags and featured image. Designs are
+matched on ``slug``: unknown slugs are created, known ones updated, and
+columns left out of a file are left unchanged.
+
+An import validates every row and fetches every image first; if anything
+is invalid, nothing is written. It then runs in one transaction:
+
+- missing categories and locations are created with one bulk_create each
+- images are downloaded (or read from ``image_root``) by a thread pool;
+  files already in the library (same hash) are reused, new ones saved.
+  Downloads only connect to public addresses (never internal or
+  link-local ones, redirects included) and files are limited to the
+  image library's upload size
+- designs are written with batched bulk_create / bulk_update and their
+  tag links replaced in bulk
+- the HouseDesignSearch projection, the Wagtail search index and the API
+  caches are updated once at the end, since bulk writes send no signals
+
+Usage:
+    export_house_designs(HouseDesign.objects.all(), 'csv', stream, base_url)
+    result = import_house_designs(stream, 'json', image_root='/data/photos')
+    result.created, result.updated, result.errors
+"""
+
+import csv
+import hashlib
+import http.client
+import io
+import ipaddress
+import json
+import os
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from urllib.request import (
+    HTTPDefaultErrorHandler,
+    HTTPErrorProcessor,
+    HTTPHandler,
+    HTTPRedirectHandler,
+    HTTPSHandler,
+    OpenerDirector,
+)
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.images import ImageFile, get_image_dimensions
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import validate_slug
+from django.db import models, transaction
+from django.utils import timezone
+from taggit.models import Tag
+from taggit.utils import edit_string_for_tags, parse_tags
+from wagtail.images import get_image_model
+from wagtail.search.backends import get_search_backends
+
+from core.cache import model_tag
+from core.image_metadata import get_image_file_url
+from core.signals import bump_versions_on_commit, refresh_snapshots_on_commit
+
+from .models import BuildLocation, HouseCategory, HouseDesign, HouseDesignSearch, HouseDesignTag
+
+
+FORMATS = ('csv', 'json')
+
+BATCH_SIZE = 500
+
+# Threads fetching images; each fetch waits on the network or the disk
+IMAGE_WORKERS = 8
+IMAGE_TIMEOUT = 30
+
+# Wagtail's default WAGTAILIMAGES_MAX_UPLOAD_SIZE
+DEFAULT_MAX_IMAGE_SIZE = 10 * 1024 * 1024
+
+# HouseDesign fields copied to and from files as they are
+DESIGN_FIELDS = [
+    'name', 'slug', 'description',
+    'storeys', 'bedrooms', 'bathrooms', 'garage_spaces',
+    'min_block_width', 'max_block_width',
+    'base_price', 'price_note',
+    'is_on_display', 'has_virtual_tour', 'virtual_tour_url', 'is_published',
+]
+
+# Columns of related objects: slugs (names are used when creating them),
+# tag names, and the featured image (URL, path or image id) and its title
+RELATION_COLUMNS = [
+    'category', 'category_name', 'location', 'location_name', 'tags',
+    'featured_image', 'featured_image_title',
+]
+
+COLUMNS = DESIGN_FIELDS + RELATION_COLUMNS
+
+# Fields a new design must be given (no default, cannot be empty)
+REQUIRED_FIELDS = ['name', 'slug', 'bedrooms', 'bathrooms']
+
+
+class HouseDesignImportError(Exception):
+    """The file cannot be read as a house design import."""
+
+
+class ImportResult:
+    """
+    Outcome of import_house_designs().
+
+    Attributes:
+        created (int): Designs created
+        updated (int): Designs updated
+        images_created (int): Images added to the library
+        images_reused (int): Image files that were already in the library
+        errors (list): (row number, message) pairs; nothing is written
+            when there are any
+    """
+
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.images_created = 0
+        self.images_reused = 0
+        self.errors = []
+
+    @property
+    def ok(self):
+        return not self.errors
+
+
+def get_format(filename, default='csv'):
+    """Guess the file format from a file name's extension."""
+    extension = os.path.splitext(filename or '')[1].lower().lstrip('.')
+    return extension if extension in FORMATS else default
+
+
+# ===== EXPORT =====
+
+def get_export_rows(queryset, base_url=''):
+    """
+    Yield one dict per design, keyed by COLUMNS.
+
+    Args:
+        queryset: HouseDesign QuerySet
+        base_url (str): Prefix of featured image URLs
+
+    Yields:
+        dict: Row values (tags as a list of names)
+    """
+    queryset = queryset.select_related(
+        'category', 'build_location', 'featured_image__metadata'
+    ).prefetch_related('tags').order_by('name', 'pk')
+
+    for design in queryset.iterator(chunk_size=BATCH_SIZE):
+        row = {name: getattr(design, name) for name in DESIGN_FIELDS}
+        image = design.featured_image
+        row.update({
+            'category': design.category.slug if design.category else '',
+            'category_name': design.category.name if design.category else '',
+            'location': design.build_location.slug if design.build_location else '',
+            'location_name': design.build_location.name if design.build_location else '',
+            'tags': sorted(tag.name for tag in design.tags.all()),
+            'featured_image': base_url + get_image_file_url(image) if image else '',
+            'featured_image_title': image.title if image else '',
+        })
+        yield row
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return value
+
+
+def export_house_designs(queryset, file_format, stream, base_url=''):
+    """
+    Write designs to a text stream.
+
+    Args:
+        queryset: HouseDesign QuerySet
+        file_format (str): 'csv' or 'json'
+        stream: Writable text stream (file, StringIO, HttpResponse)
+        base_url (str): Prefix of featured image URLs
+
+    Returns:
+        int: Number of designs written
+    """
+    count = 0
+    if file_format == 'json':
+        rows = list(get_export_rows(queryset, base_url))
+        json.dump(rows, stream, cls=DjangoJSONEncoder, indent=2)
+        return len(rows)
+
+    writer = csv.DictWriter(stream, fieldnames=COLUMNS)
+    writer.writeheader()
+    for row in get_export_rows(queryset, base_url):
+        row['tags'] = edit_string_for_tags([Tag(name=name) for name in row['tags']])
+        writer.writerow({name: _csv_value(value) for name, value in row.items()})
+        count += 1
+    return count
+
+
+# ===== IMPORT: READING AND VALIDATION =====
+
+def read_rows(stream, file_format):
+    """
+    Read the rows of an import file.
+
+    Args:
+        stream: Text stream, or binary stream (decoded as UTF-8)
+        file_format (str): 'csv' or 'json'
+
+    Returns:
+        list: (row number, dict) pairs; CSV rows are numbered by line
+
+    Raises:
+        HouseDesignImportError: Unreadable file or missing slug column
+    """
+    if isinstance(stream.read(0), bytes):
+        stream = io.TextIOWrapper(stream, encoding='utf-8-sig')
+
+    try:
+        if file_format == 'json':
+            data = json.load(stream)
+            if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+                raise HouseDesignImportError("JSON imports must be a list of objects")
+            rows = list(enumerate(data, start=1))
+        else:
+            reader = csv.DictReader(stream)
+            if 'slug' not in (reader.fieldnames or []):
+                raise HouseDesignImportError("CSV imports need a 'slug' column")
+            rows = [(reader.line_num, row) for row in reader]
+    except (ValueError, csv.Error) as exc:
+        raise HouseDesignImportError(f"Could not read the {file_format.upper()} file: {exc}")
+
+    return rows
+
+
+def parse_bool(value):
+    """Read a boolean cell ('true', 'yes', '1', ...)."""
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ('true', 't', 'yes', 'y', '1'):
+        return True
+    if text in ('false', 'f', 'no', 'n', '0', ''):
+        return False
+    raise ValidationError(f"'{value}' is not true or false")
+
+
+def clean_design_values(raw):
+    """
+    Validate the HouseDesign field columns of one row.
+
+    Args:
+        raw (dict): Row as read from the file
+
+    Returns:
+        tuple: (values keyed by field name, list of error messages)
+    """
+    values = {}
+    errors = []
+    for name in DESIGN_FIELDS:
+        if name not in raw:
+            continue
+        field = HouseDesign._meta.get_field(name)
+        value = raw[name]
+        if isinstance(value, str):
+            value = value.strip()
+
+        try:
+            if isinstance(field, models.BooleanField):
+                value = parse_bool(value)
+            elif value in ('', None) and not isinstance(field, (models.CharField, models.TextField)):
+                value = field.get_default() if field.has_default() else None
+            elif value is None:
+                value = ''
+            values[name] = field.clean(value, None)
+        except ValidationError as exc:
+            errors.append(f"{name}: {' '.join(exc.messages)}")
+
+    return values, errors
+
+
+def clean_relations(raw):
+    """
+    Validate the related-object columns of one row.
+
+    Args:
+        raw (dict): Row as read from the file
+
+    Returns:
+        tuple: (values keyed by column, list of error messages); tags are
+            a list of names, featured_image an int (image id), a source
+            string or None
+    """
+    values = {}
+    errors = []
+
+    for column in ('category', 'location'):
+        if column in raw:
+            slug = str(raw[column] or '').strip()
+            try:
+                if slug:
+                    validate_slug(slug)
+                values[column] = slug
+            except ValidationError as exc:
+                errors.append(f"{column}: {' '.join(exc.messages)}")
+    for column in ('category_name', 'location_name', 'featured_image_title'):
+        if column in raw:
+            values[column] = str(raw[column] or '').strip()
+
+    if 'tags' in raw:
+        tags = raw['tags']
+        if isinstance(tags, list):
+            values['tags'] = sorted({str(tag).strip() for tag in tags if str(tag).strip()})
+        else:
+            values['tags'] = parse_tags(tags or '')
+
+    if 'featured_image' in raw:
+        image = raw['featured_image']
+        if isinstance(image, int) or str(image or '').strip().isdigit():
+            values['featured_image'] = int(image)
+        else:
+            values['featured_image'] = str(image or '').strip() or None
+
+    return values, errors
+
+
+def get_max_image_size():
+    """Largest image file accepted, the same as for admin uploads (bytes)"""
+    return getattr(settings, 'WAGTAILIMAGES_MAX_UPLOAD_SIZE', None) or DEFAULT_MAX_IMAGE_SIZE
+
+
+def get_public_address(host, port):
+    """
+    Resolve a host, refusing it unless every address is public.
+
+    Args:
+        host (str): Host name or IP address
+        port (int): Port to connect to
+
+    Returns:
+        str: The first resolved IP address
+
+    Raises:
+        ValueError: The host resolves to a private, loopback, link-local
+            (e.g. 169.254.169.254), reserved or multicast address
+        OSError: The host cannot be resolved
+    """
+    addresses = [info[4][0] for info in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)]
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split('%')[0])
+        if ip.version == 6 and ip.ipv4_mapped:
+            ip = ip.ipv4_mapped
+        if not ip.is_global or ip.is_multicast:
+            raise ValueError(f"image host {host} is not a public address")
+    return addresses[0]
+
+
+def _create_public_connection(address, *args, **kwargs):
+    """socket.create_connection() to the checked address of a host"""
+    host, port = address
+    return socket.create_connection((get_public_address(host, port), port), *args, **kwargs)
+
+
+class _PublicHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _create_public_connection
+
+
+class _PublicHTTPSConnection(http.client.HTTPSConnection):
+    # Certificates are still checked against the host name
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _create_public_connection
+
+
+class _PublicHTTPHandler(HTTPHandler):
+    def http_open(self, req):
+        return self.do_open(_PublicHTTPConnection, req)
+
+
+class _PublicHTTPSHandler(HTTPSHandler):
+    def https_open(self, req):
+        return self.do_open(_PublicHTTPSConnection, req, context=self._context)
+
+
+def build_image_opener():
+    """
+    URL opener for image downloads.
+
+    Every connection, including those of redirects, goes to an address
+    checked by get_public_address() (so a host cannot be re-resolved to an
+    internal address after the check), only http(s) URLs are opened and
+    no proxies are used.
+    """
+    opener = OpenerDirector()
+    for handler in (
+        _PublicHTTPHandler(), _PublicHTTPSHandler(),
+        HTTPRedirectHandler(), HTTPDefaultErrorHandler(), HTTPErrorProcessor(),
+    ):
+        opener.add_handler(handler)
+    return opener
+
+
+def download_image(url, max_size):
+    """
+    Download an image URL of at most ``max_size`` bytes.
+
+    Raises:
+        ValueError: URL without host, refused host or file too large
+        OSError: Download failure
+    """
+    if not urlparse(url).hostname:
+        raise ValueError("image URL has no host")
+
+    with build_image_opener().open(url, timeout=IMAGE_TIMEOUT) as response:
+        length = response.headers.get('Content-Length')
+        if length and length.isdigit() and int(length) > max_size:
+            raise ValueError(f"image is larger than {max_size} bytes")
+        content = response.read(max_size + 1)
+    if len(content) > max_size:
+        raise ValueError(f"image is larger than {max_size} bytes")
+    return content
+
+
+def fetch_image(source, image_root=None):
+    """
+    Read an image from a URL or a file below ``image_root``.
+
+    Runs in the image thread pool, so it touches neither the database nor
+    shared state.
+
+    Args:
+        source (str): http(s) URL of a public host, or path relative to
+            image_root
+        image_root (str): Directory local paths are read from (local paths
+            are refused without one)
+
+    Returns:
+        tuple: (content bytes, file name, SHA-1 hex digest)
+
+    Raises:
+        ValueError: Refused URL or path, file too large or not an image
+        OSError: Download or read failure
+    """
+    max_size = get_max_image_size()
+    if urlparse(source).scheme in ('http', 'https'):
+        content = download_image(source, max_size)
+        name = os.path.basename(urlparse(source).path)
+    else:
+        if not image_root:
+            raise ValueError("local image paths are not allowed here")
+        root = os.path.realpath(image_root)
+        path = os.path.realpath(os.path.join(root, source))
+        if not path.startswith(root + os.sep):
+            raise ValueError("image path is outside the image directory")
+        if os.path.getsize(path) > max_size:
+            raise ValueError(f"image is larger than {max_size} bytes")
+        with open(path, 'rb') as image_file:
+            content = image_file.read()
+        name = os.path.basename(path)
+
+    if get_image_dimensions(io.BytesIO(content)) == (None, None):
+        raise ValueError("file is not an image")
+    return content, name or 'image', hashlib.sha1(content).hexdigest()
+
+
+def fetch_images(sources, image_root=None, workers=IMAGE_WORKERS):
+    """
+    Fetch many images in parallel.
+
+    Args:
+        sources (iterable): Image sources (see fetch_image)
+        image_root (str): Directory local paths are read from
+        workers (int): Number of threads
+
+    Returns:
+        tuple: (fetched images keyed by source, error messages keyed by source)
+    """
+    sources = list(sources)
+    fetched = {}
+    errors = {}
+    if not sources:
+        return fetched, errors
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(sources))) as executor:
+        futures = {source: executor.submit(fetch_image, source, image_root) for source in sources}
+        for source, future in futures.items():
+            try:
+                fetched[source] = future.result()
+            except (OSError, ValueError) as exc:
+                errors[source] = str(exc)
+    return fetched, errors
+
+
+# ===== IMPORT: WRITING =====
+
+def get_or_create_by_slug(model, names_by_slug):
+    """
+    Load objects by slug, creating the missing ones with one bulk_create.
+
+    Args:
+        model: HouseCategory or BuildLocation
+        names_by_slug (dict): Names for new objects keyed by slug ('' when
+            the file gave none)
+
+    Returns:
+        dict: Objects keyed by slug
+    """
+    objects = model.objects.in_bulk(list(names_by_slug), field_name='slug')
+    missing = [
+        model(slug=slug, name=name or slug.replace('-', ' ').title())
+        for slug, name in names_by_slug.items() if slug not in objects
+    ]
+    model.objects.bulk_create(missing, batch_size=BATCH_SIZE)
+    return model.objects.in_bulk(list(names_by_slug), field_name='slug')
+
+
+def save_images(fetched, titles, result):
+    """
+    Add fetched images to the library, reusing files it already holds.
+
+    Args:
+        fetched (dict): fetch_images() output
+        titles (dict): Titles keyed by source
+        result (ImportResult): Counts are added to it
+
+    Returns:
+        dict: Image objects keyed by source
+    """
+    Image = get_image_model()
+    hashes = {digest for _, _, digest in fetched.values()}
+    by_hash = {image.file_hash: image for image in Image.objects.filter(file_hash__in=hashes)}
+    result.images_reused = len(by_hash)
+
+    images = {}
+    for source, (content, name, digest) in fetched.items():
+        if digest not in by_hash:
+            image = Image(
+                title=titles.get(source) or os.path.splitext(name)[0],
+                file=ImageFile(io.BytesIO(content), name=name),
+                file_size=len(content),
+                file_hash=digest,
+            )
+            image.save()
+            by_hash[digest] = image
+            result.images_created += 1
+        images[source] = by_hash[digest]
+    return images
+
+
+def replace_tags(designs, tags_by_slug):
+    """
+    Replace the tags of designs with bulk queries.
+
+    New tag names are created one by one so taggit picks unique slugs;
+    their number is the number of distinct new names, not of rows.
+
+    Args:
+        designs (dict): Saved designs keyed by slug
+        tags_by_slug (dict): Tag names keyed by design slug
+    """
+    names = {name for tags in tags_by_slug.values() for name in tags}
+    tags = {tag.name: tag for tag in Tag.objects.filter(name__in=names)}
+    for name in names - set(tags):
+        tags[name] = Tag.objects.create(name=name)
+
+    design_ids = [designs[slug].pk for slug in tags_by_slug]
+    HouseDesignTag.objects.filter(content_object_id__in=design_ids).delete()
+    HouseDesignTag.objects.bulk_create(
+        [
+            HouseDesignTag(content_object=designs[slug], tag=tags[name])
+            for slug, names in tags_by_slug.items()
+            for name in names
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def update_indexes(design_ids):
+    """
+    Bring indexes and caches up to date after bulk writes, once per import.
+
+    Rebuilds the designs' HouseDesignSearch rows and Wagtail search index
+    entries, and expires everything the catalog signals would have (API
+    validators, facet counts, the catalog engine and listing snapshots).
+
+    Args:
+        design_ids (list): Primary keys of the written designs
+    """
+    designs = HouseDesign.objects.filter(pk__in=design_ids)
+    HouseDesignSearch.rebuild(designs)
+
+    indexed = list(designs)
+    for backend in get_search_backends(with_auto_update=True):
+        backend.add_bulk(HouseDesign, indexed)
+
+    tags = [model_tag(HouseDesign), model_tag(HouseCategory), model_tag(BuildLocation)]
+    bump_versions_on_commit(*tags)
+    refresh_snapshots_on_commit(tags=tags)
+
+
+def import_house_designs(
+    stream, file_format, image_root=None, dry_run=False, image_workers=IMAGE_WORKERS, allow_images=True,
+):
+    """
+    Create or update house designs from a CSV or JSON file.
+
+    Args:
+        stream: Text or binary stream of the file
+        file_format (str): 'csv' or 'json'
+        image_root (str): Directory relative image paths are read from
+            (None refuses local paths, e.g. for uploads through the admin)
+        dry_run (bool): Validate and fetch images without writing anything
+        image_workers (int): Threads fetching images
+        allow_images (bool): False rejects rows that set a featured image
+            (e.g. for admin users who may not add images)
+
+    Returns:
+        ImportResult
+
+    Raises:
+        HouseDesignImportError: Unreadable file
+    """
+    result = ImportResult()
+    rows = read_rows(stream, file_format)
+
+    # Validate every row before writing anything
+    existing = HouseDesign.objects.in_bulk(
+        [str(raw.get('slug') or '').strip() for _, raw in rows], field_name='slug'
+    )
+    cleaned = []
+    seen = set()
+    for number, raw in rows:
+        values, errors = clean_design_values(raw)
+        relations, relation_errors = clean_relations(raw)
+        errors += relation_errors
+        if not allow_images and relations.get('featured_image') is not None:
+            errors.append("featured_image: you do not have permission to add images")
+
+        slug = values.get('slug')
+        if not slug and 'slug' not in raw:
+            errors.append("slug: every row needs a slug")
+        elif slug in seen:
+            errors.append(f"slug: '{slug}' appears more than once")
+        seen.add(slug)
+        if slug and slug not in existing:
+            missing = [name for name in REQUIRED_FIELDS if name not in raw]
+            if missing:
+                errors.append(f"new designs need {', '.join(missing)}")
+
+        if errors:
+            result.errors.extend((number, message) for message in errors)
+        else:
+            cleaned.append((number, values, relations))
+
+    Image = get_image_model()
+    image_ids = {r['featured_image'] for _, _, r in cleaned if isinstance(r.get('featured_image'), int)}
+    images_by_id = Image.objects.in_bulk(list(image_ids))
+    sources = {
+        r['featured_image']: r.get('featured_image_title') or values.get('name')
+        for _, values, r in cleaned if isinstance(r.get('featured_image'), str)
+    }
+    fetched, image_errors = fetch_images(sources, image_root, image_workers)
+
+    for number, _, relations in cleaned:
+        image = relations.get('featured_image')
+        if isinstance(image, int) and image not in images_by_id:
+            result.errors.append((number, f"featured_image: image {image} does not exist"))
+        elif image in image_errors:
+            result.errors.append((number, f"featured_image: {image_errors[image]}"))
+
+    if result.errors or dry_run:
+        result.errors.sort()
+        return result
+
+    with transaction.atomic():
+        categories = get_or_create_by_slug(HouseCategory, {
+            r['category']: r.get('category_name', '') for _, _, r in cleaned if r.get('category')
+        })
+        locations = get_or_create_by_slug(BuildLocation, {
+            r['location']: r.get('location_name', '') for _, _, r in cleaned if r.get('location')
+        })
+        images = save_images(fetched, sources, result)
+        images.update(images_by_id)
+
+        now = timezone.now()
+        created, updated = [], []
+        update_fields = {'updated_at'}
+        for _, values, relations in cleaned:
+            design = existing.get(values['slug'])
+            if design is None:
+                design = HouseDesign()
+                created.append(design)
+            else:
+                updated.append(design)
+                update_fields.update(values)
+
+            for name, value in values.items():
+                setattr(design, name, value)
+            if 'category' in relations:
+                design.category = categories.get(relations['category'])
+                update_fields.add('category')
+            if 'location' in relations:
+                design.build_location = locations.get(relations['location'])
+                update_fields.add('build_location')
+            if 'featured_image' in relations:
+                design.featured_image = images.get(relations['featured_image'])
+                update_fields.add('featured_image')
+            design.updated_at = now
+
+        HouseDesign.objects.bulk_create(created, batch_size=BATCH_SIZE)
+        HouseDesign.objects.bulk_update(updated, sorted(update_fields), batch_size=BATCH_SIZE)
+        result.created, result.updated = len(created), len(updated)
+
+        designs = {design.slug: design for design in created + updated}
+        tags_by_slug = {values['slug']: r['tags'] for _, values, r in cleaned if 'tags' in r}
+        if tags_by_slug:
+            replace_tags(designs, tags_by_slug)
+
+        update_indexes([design.pk for design in designs.values()])
+
+    return result
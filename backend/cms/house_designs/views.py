@@ -1,3 +1,156 @@
-from django.shortcuts import render
+"""
+API Views for House Designs - the read-only house designs endpoint
+"""
 
-# Create your views here.
+import hashlib
+import json
+
+from django.http import Http404
+from django.urls import path
+from rest_framework.response import Response
+from wagtail.api.v2.utils import BadRequestError
+from wagtail.api.v2.views import BaseAPIViewSet
+
+from core.cache import get_content_version
+from core.pagination import CursorPagination, get_ordering_keys
+from core.utils import get_base_url
+from core.views import FastJSONRendererMixin, get_not_modified_response, set_validators
+
+from .models import (
+    DEFAULT_HOUSE_DESIGN_SORT,
+    HOUSE_DESIGN_FILTERS,
+    HOUSE_DESIGN_SORTS,
+    HouseDesign,
+    HouseDesignSearch,
+    filter_house_designs,
+    get_house_design_filters,
+)
+from .serializers import (
+    DETAIL_FIELDS,
+    DETAIL_ONLY_FIELDS,
+    LISTING_FIELDS,
+    get_design_detail,
+    get_design_queryset,
+    parse_fields_parameter,
+    serialize_designs,
+)
+
+
+class HouseDesignsAPIViewSet(FastJSONRendererMixin, BaseAPIViewSet):
+    """
+    Read-only API endpoint for published house designs.
+
+    ``?fields=`` picks the fields of each item (see
+    house_designs.serializers), and only their columns and relations are
+    loaded: ``?fields=name,slug,thumbnail,pricing`` is what a listing card
+    needs. Listings accept the same filters and ``?sort=`` values as the
+    house designs index page, and are paged with ``limit``/``offset`` or an
+    opaque ``?cursor=`` (``?count=false`` skips the total count; see
+    core.pagination). Filtering, sorting and paging run on the
+    HouseDesignSearch projection; only the designs of the page are loaded.
+
+    A single design is served by slug (``/api/v2/house-designs/<slug>/``)
+    or id, with every field by default, including ``additional_content``
+    with its galleries' responsive renditions. Detail payloads are cached
+    per design revision (see get_design_detail).
+
+    Responses carry an ETag/Last-Modified derived from the content version,
+    which every design, category, location and image change bumps, so
+    conditional requests are answered with 304 before any query runs.
+    """
+
+    model = HouseDesign
+    pagination_class = CursorPagination
+
+    known_query_parameters = frozenset(['limit', 'offset', 'fields', 'sort', '_', 'format']).union(
+        HOUSE_DESIGN_FILTERS,
+        CursorPagination.query_parameters,
+    )
+    listing_default_fields = LISTING_FIELDS
+    listing_fields = [name for name in DETAIL_FIELDS if name not in DETAIL_ONLY_FIELDS]
+    detail_default_fields = DETAIL_FIELDS
+
+    @classmethod
+    def get_urlpatterns(cls):
+        return super().get_urlpatterns() + [
+            path("<slug:slug>/", cls.as_view({"get": "slug_detail_view"}), name="slug_detail"),
+        ]
+
+    def get_queryset(self):
+        return HouseDesign.objects.filter(is_published=True).order_by('id')
+
+    def check_query_parameters(self, queryset=None):
+        """Only operations and filters are accepted (designs have no field filters)"""
+        unknown_parameters = set(self.request.GET.keys()) - self.known_query_parameters
+        if unknown_parameters:
+            raise BadRequestError(
+                "query parameter is not an operation or a recognised field: %s"
+                % ", ".join(sorted(unknown_parameters))
+            )
+
+    def get_validators(self):
+        """
+        Compute (etag, last_modified) for the current request.
+
+        Returns:
+            tuple: (quoted ETag string, Unix timestamp)
+        """
+        content_version = get_content_version()
+        raw = json.dumps([
+            self.request.get_full_path(),
+            self.request.get_host(),
+            self.request.META.get('HTTP_ACCEPT', ''),
+            content_version,
+        ])
+        return f'"{hashlib.sha1(raw.encode("utf-8")).hexdigest()}"', content_version
+
+    def get_sort(self):
+        sort = self.request.GET.get('sort', DEFAULT_HOUSE_DESIGN_SORT)
+        if sort not in HOUSE_DESIGN_SORTS:
+            raise BadRequestError("sort must be one of: %s" % ", ".join(HOUSE_DESIGN_SORTS))
+        return sort
+
+    def listing_view(self, request):
+        self.check_query_parameters()
+        field_names = parse_fields_parameter(
+            request.GET.get('fields'), self.listing_default_fields, self.listing_fields
+        )
+        ordering = HOUSE_DESIGN_SORTS[self.get_sort()]
+
+        etag, last_modified = self.get_validators()
+        not_modified = get_not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        # Page through the projection's sort keys; every sort ends with the primary key
+        key_fields = [name for name, _, _ in get_ordering_keys(ordering)]
+        entries = filter_house_designs(HouseDesignSearch.objects.all(), get_house_design_filters(request.GET))
+        rows = self.paginate_queryset(entries.order_by(*ordering).values_list(*key_fields))
+        page_ids = [row[-1] for row in rows]
+
+        designs = get_design_queryset(HouseDesign.objects.all(), field_names).in_bulk(page_ids)
+        items = serialize_designs(
+            [designs[pk] for pk in page_ids if pk in designs], field_names, get_base_url(request)
+        )
+        return set_validators(self.get_paginated_response(items), etag, last_modified)
+
+    def detail_view(self, request, pk):
+        return self.get_detail_response(request, self.get_queryset().filter(pk=pk))
+
+    def slug_detail_view(self, request, slug):
+        return self.get_detail_response(request, self.get_queryset().filter(slug=slug))
+
+    def get_detail_response(self, request, queryset):
+        """Serve the design matching ``queryset`` (see get_design_detail)"""
+        self.check_query_parameters()
+        field_names = parse_fields_parameter(request.GET.get('fields'), self.detail_default_fields)
+
+        etag, last_modified = self.get_validators()
+        not_modified = get_not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        data = get_design_detail(queryset, field_names, get_base_url(request))
+        if data is None:
+            raise Http404("not found")
+        return set_validators(Response(data), etag, last_modified)
@@ -0,0 +1,174 @@
+"""
+Wagtail admin hooks for house designs - bulk import and export
+
+Adds an "Import house designs" view (CSV or JSON upload, see
+house_designs.transfer) and "Export CSV" / "Export JSON" bulk actions to
+the house design snippet listing.
+"""
+
+from django import forms
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.shortcuts import redirect
+from django.urls import path, reverse
+from django.utils.functional import classproperty
+from django.views.generic import FormView
+from wagtail import hooks
+from wagtail.admin import messages
+from wagtail.admin.menu import MenuItem
+from wagtail.admin.views.generic.base import WagtailAdminTemplateMixin
+from wagtail.images.permissions import permission_policy as image_permission_policy
+from wagtail.snippets.bulk_actions.snippet_bulk_action import SnippetBulkAction
+from wagtail.snippets.permissions import get_permission_name
+
+from core.utils import get_base_url
+
+from .models import HouseDesign
+from .transfer import HouseDesignImportError, export_house_designs, get_format, import_house_designs
+
+
+# Row errors listed on the import form (the rest are counted)
+MAX_LISTED_ERRORS = 20
+
+
+def can_import_house_designs(user):
+    return user.has_perm(get_permission_name('add', HouseDesign)) and user.has_perm(
+        get_permission_name('change', HouseDesign)
+    )
+
+
+class HouseDesignImportForm(forms.Form):
+    file = forms.FileField(
+        help_text="CSV or JSON file with one design per row, in the format of the export. "
+                  "Designs are matched on slug; featured images must be URLs or image ids "
+                  "(and need permission to add images)."
+    )
+    dry_run = forms.BooleanField(required=False, label="Only check the file")
+
+
+class HouseDesignImportView(WagtailAdminTemplateMixin, FormView):
+    """Upload a CSV or JSON file of house designs (nothing is saved if a row is invalid)"""
+
+    page_title = "Import house designs"
+    header_icon = 'upload'
+    template_name = 'wagtailadmin/generic/form.html'
+    form_class = HouseDesignImportForm
+
+    def dispatch(self, request, *args, **kwargs):
+        if not can_import_house_designs(request.user):
+            raise PermissionDenied
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(
+            action_url=self.request.path,
+            submit_button_label="Import",
+            **kwargs,
+        )
+
+    def form_valid(self, form):
+        upload = form.cleaned_data['file']
+        dry_run = form.cleaned_data['dry_run']
+
+        # Local image paths are refused: uploads must not read the server's disk
+        try:
+            result = import_house_designs(
+                upload,
+                get_format(upload.name),
+                dry_run=dry_run,
+                allow_images=image_permission_policy.user_has_permission(self.request.user, 'add'),
+            )
+        except HouseDesignImportError as exc:
+            form.add_error('file', str(exc))
+            return self.form_invalid(form)
+
+        if not result.ok:
+            for number, message in result.errors[:MAX_LISTED_ERRORS]:
+                form.add_error('file', f"Row {number}: {message}")
+            if len(result.errors) > MAX_LISTED_ERRORS:
+                form.add_error('file', f"... and {len(result.errors) - MAX_LISTED_ERRORS} more errors")
+            return self.form_invalid(form)
+
+        if dry_run:
+            messages.success(self.request, f"{upload.name} is valid; nothing was imported.")
+            return redirect(self.request.path)
+
+        messages.success(
+            self.request,
+            f"Created {result.created} and updated {result.updated} house designs "
+            f"({result.images_created} new images).",
+        )
+        return redirect(HouseDesign.snippet_viewset.get_url_name('list'))
+
+
+@hooks.register('register_bulk_action')
+class ExportHouseDesignsBulkAction(SnippetBulkAction):
+    """Download the selected house designs (see house_designs.transfer)"""
+
+    file_format = 'csv'
+    content_type = 'text/csv; charset=utf-8'
+    display_name = "Export CSV"
+    action_type = 'export_csv'
+    aria_label = "Export selected house designs as CSV"
+    action_priority = 50
+
+    @classproperty
+    def models(cls):
+        return [HouseDesign]
+
+    @classmethod
+    def get_queryset(cls, model, object_ids):
+        return model.objects.filter(pk__in=object_ids).only('pk')
+
+    def check_perm(self, obj):
+        if getattr(self, 'can_export', None) is None:
+            user = self.request.user
+            self.can_export = any(
+                user.has_perm(get_permission_name(action, self.model)) for action in ('view', 'change')
+            )
+        return self.can_export
+
+    def get(self, request, *args, **kwargs):
+        designs, _ = self.get_actionable_objects()
+        response = HttpResponse(content_type=self.content_type)
+        response['Content-Disposition'] = f'attachment; filename="house-designs.{self.file_format}"'
+        export_house_designs(
+            HouseDesign.objects.filter(pk__in=[design.pk for design in designs]),
+            self.file_format,
+            response,
+            get_base_url(request),
+        )
+        return response
+
+
+@hooks.register('register_bulk_action')
+class ExportHouseDesignsJSONBulkAction(ExportHouseDesignsBulkAction):
+    file_format = 'json'
+    content_type = 'application/json'
+    display_name = "Export JSON"
+    action_type = 'export_json'
+    aria_label = "Export selected house designs as JSON"
+    action_priority = 51
+
+
+class HouseDesignImportMenuItem(MenuItem):
+    def is_shown(self, request):
+        return can_import_house_designs(request.user)
+
+
+@hooks.register('register_admin_urls')
+def register_house_design_import_url():
+    return [
+        path('house-designs/import/', HouseDesignImportView.as_view(), name='house_designs_import'),
+    ]
+
+
+@hooks.register('register_admin_menu_item')
+def register_house_design_import_menu_item():
+    return HouseDesignImportMenuItem(
+        "Import house designs",
+        reverse('house_designs_import'),
+        icon_name='upload',
+        order=900,
+    )
+
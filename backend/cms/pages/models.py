@@ -18,7 +18,8 @@ from modelcluster.fields import ParentalKey
 
 from core.models import PageAbstract, HeroAbstract, SEOAbstract
 from core.fields import generalpage_stream_fields, landingpage_stream_fields
-from core.api import HeadlessSerializerMixin
+from core.api import HeadlessSerializerMixin, StreamBlocksField
+from core.block_serializers import core_blocks
 
 
 # ============================================================================
@@ -89,14 +90,20 @@ class GeneralPage(PageAbstract, SEOAbstract, HeadlessSerializerMixin, Page):
     
     promote_panels = PageAbstract.settings_panels + SEOAbstract.seo_panels
     
+    # Inline hero exposed as hero_data in the API
+    hero_relation_name = 'generalpage_hero'
+    
     # API configuration for headless CMS
     api_fields = [
         APIField('intro_title'),
         APIField('intro_text'),
-        APIField('body'),
-        APIField('hero_data', serializer=lambda self: self.get_hero_data('generalpage_hero')),
+        APIField('body', serializer=StreamBlocksField(core_blocks)),
+        APIField('hero_data'),
     ]
     
+    # API fields stored at publish time (see core.snapshots)
+    snapshot_fields = ['body', 'hero_data']
+    
     class Meta:
         verbose_name = 'General Page'
         verbose_name_plural = 'General Pages'
@@ -185,14 +192,20 @@ class LandingPage(PageAbstract, SEOAbstract, HeadlessSerializerMixin, Page):
         ], heading="Landing Page Settings"),
     ]
     
+    # Inline hero exposed as hero_data in the API
+    hero_relation_name = 'landingpage_hero'
+    
     # API configuration for headless CMS
     api_fields = [
         APIField('subtitle'),
-        APIField('body'),
+        APIField('body', serializer=StreamBlocksField(core_blocks)),
         APIField('hide_from_navigation'),
-        APIField('hero_data', serializer=lambda self: self.get_hero_data('landingpage_hero')),
+        APIField('hero_data'),
     ]
     
+    # API fields stored at publish time (see core.snapshots)
+    snapshot_fields = ['body', 'hero_data']
+    
     class Meta:
         verbose_name = 'Landing Page'
         verbose_name_plural = 'Landing Pages'
@@ -1,5 +1,5 @@
 import React, { useState } from 'react';
-import { HouseDesignFilters as FilterOptions } from '../../types';
+import { FilterOption, HouseDesignFilters as FilterOptions } from '../../types';
 import './HouseDesignFilters.css';
 
 interface HouseDesignFiltersProps {
@@ -30,6 +30,24 @@ const HouseDesignFilters: React.FC<HouseDesignFiltersProps> = ({
     onFilterChange(newFilters);
   };
 
+  // Price ranges set either bound, and picking one replaces the other
+  const handlePriceChange = (option: FilterOption) => {
+    const parameter = option.parameter ?? 'max_price';
+    const newFilters = { ...activeFilters };
+    const isActive = newFilters[parameter] === option.value;
+
+    delete newFilters.min_price;
+    delete newFilters.max_price;
+    if (!isActive) {
+      newFilters[parameter] = option.value;
+    }
+
+    onFilterChange(newFilters);
+  };
+
+  const isPriceActive = (option: FilterOption) =>
+    activeFilters[option.parameter ?? 'max_price'] === option.value;
+
   const clearAllFilters = () => {
     onFilterChange({});
   };
@@ -69,8 +87,10 @@ const HouseDesignFilters: React.FC<HouseDesignFiltersProps> = ({
               key={option.value}
               className={`filter-option ${activeFilters.storeys === option.value ? 'active' : ''}`}
               onClick={() => handleFilterChange('storeys', option.value)}
+              disabled={option.count === 0 && activeFilters.storeys !== option.value}
             >
               {option.label}
+              {option.count !== undefined && <span className="filter-option-count"> ({option.count})</span>}
             </button>
           ))}
         </div>
@@ -88,8 +108,10 @@ const HouseDesignFilters: React.FC<HouseDesignFiltersProps> = ({
                   key={option.value}
                   className={`filter-option ${activeFilters.bedrooms === option.value ? 'active' : ''}`}
                   onClick={() => handleFilterChange('bedrooms', option.value)}
+                  disabled={option.count === 0 && activeFilters.bedrooms !== option.value}
                 >
                   {option.label}
+                  {option.count !== undefined && <span className="filter-option-count"> ({option.count})</span>}
                 </button>
               ))}
             </div>
@@ -104,24 +126,28 @@ const HouseDesignFilters: React.FC<HouseDesignFiltersProps> = ({
                   key={option.value}
                   className={`filter-option ${activeFilters.bathrooms === option.value ? 'active' : ''}`}
                   onClick={() => handleFilterChange('bathrooms', option.value)}
+                  disabled={option.count === 0 && activeFilters.bathrooms !== option.value}
                 >
                   {option.label}
+                  {option.count !== undefined && <span className="filter-option-count"> ({option.count})</span>}
                 </button>
               ))}
             </div>
           </div>
 
-          {/* Max Price */}
+          {/* Base Price */}
           <div className="filter-group">
-            <h4 className="filter-group-title">MAX BASE PRICE</h4>
+            <h4 className="filter-group-title">BASE PRICE</h4>
             <div className="filter-options">
               {filters.price_ranges.map((option) => (
                 <button
-                  key={option.value}
-                  className={`filter-option ${activeFilters.max_price === option.value ? 'active' : ''}`}
-                  onClick={() => handleFilterChange('max_price', option.value)}
+                  key={`${option.parameter}-${option.value}`}
+                  className={`filter-option ${isPriceActive(option) ? 'active' : ''}`}
+                  onClick={() => handlePriceChange(option)}
+                  disabled={option.count === 0 && !isPriceActive(option)}
                 >
                   {option.label}
+                  {option.count !== undefined && <span className="filter-option-count"> ({option.count})</span>}
                 </button>
               ))}
             </div>
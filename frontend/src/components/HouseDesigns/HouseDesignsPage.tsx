@@ -1,4 +1,4 @@
-import React, { useState, useMemo } from 'react';
+import React, { useState } from 'react';
 import { HouseDesign, HouseDesignsPageData } from '../../types';
 import HouseDesignCard from './HouseDesignCard';
 import HouseDesignFilters from './HouseDesignFilters';
@@ -6,43 +6,25 @@ import './HouseDesignsPage.css';
 
 interface HouseDesignsPageProps {
   pageData: HouseDesignsPageData;
+  activeFilters: Record<string, string>;
+  onFilterChange: (filters: Record<string, string>) => void;
+  onPageChange: (page: number) => void;
 }
 
-const HouseDesignsPage: React.FC<HouseDesignsPageProps> = ({ pageData }) => {
-  const [activeFilters, setActiveFilters] = useState<Record<string, string>>({});
+const HouseDesignsPage: React.FC<HouseDesignsPageProps> = ({
+  pageData,
+  activeFilters,
+  onFilterChange,
+  onPageChange,
+}) => {
   const [compareList, setCompareList] = useState<HouseDesign[]>([]);
 
-  // Filter house designs based on active filters
-  const filteredDesigns = useMemo(() => {
-    let designs = [...pageData.house_designs_data];
-
-    // Apply storeys filter
-    if (activeFilters.storeys) {
-      designs = designs.filter(d => d.specs.storeys === activeFilters.storeys);
-    }
-
-    // Apply bedrooms filter
-    if (activeFilters.bedrooms) {
-      designs = designs.filter(d => d.specs.bedrooms === parseInt(activeFilters.bedrooms));
-    }
-
-    // Apply bathrooms filter
-    if (activeFilters.bathrooms) {
-      const bathValue = parseFloat(activeFilters.bathrooms);
-      designs = designs.filter(d => parseFloat(d.specs.bathrooms) >= bathValue);
-    }
-
-    // Apply price filter
-    if (activeFilters.max_price) {
-      const maxPrice = parseFloat(activeFilters.max_price);
-      designs = designs.filter(d => {
-        if (!d.pricing.base_price) return false; // Exclude if no price
-        return parseFloat(d.pricing.base_price) <= maxPrice;
-      });
-    }
-
-    return designs;
-  }, [pageData.house_designs_data, activeFilters]);
+  // Designs arrive filtered, sorted and paginated by the API
+  const designs = pageData.house_designs_data;
+  const meta = pageData.house_designs_meta;
+  const totalCount = meta?.total_count ?? designs.length;
+  const currentPage = meta?.page ?? 1;
+  const numPages = meta?.num_pages ?? 1;
 
   // Handle compare toggle
   const handleCompareToggle = (design: HouseDesign) => {
@@ -99,7 +81,7 @@ const HouseDesignsPage: React.FC<HouseDesignsPageProps> = ({ pageData }) => {
           )}
           <div className="house-designs-hero-stats">
             <div className="hero-stat">
-              <span className="hero-stat-number">{filteredDesigns.length}</span>
+              <span className="hero-stat-number">{totalCount}</span>
               <span className="hero-stat-label">House Designs</span>
             </div>
             <div className="hero-stat">
@@ -117,17 +99,17 @@ const HouseDesignsPage: React.FC<HouseDesignsPageProps> = ({ pageData }) => {
       {/* Filters */}
       <HouseDesignFilters
         filters={pageData.filter_options}
-        onFilterChange={setActiveFilters}
+        onFilterChange={onFilterChange}
         activeFilters={activeFilters}
-        resultsCount={filteredDesigns.length}
+        resultsCount={totalCount}
       />
 
       {/* Designs Grid */}
       <div className="designs-section">
         <div className="container">
-          {filteredDesigns.length > 0 ? (
+          {designs.length > 0 ? (
             <div className="designs-grid">
-              {filteredDesigns.map((design) => (
+              {designs.map((design) => (
                 <HouseDesignCard
                   key={design.id}
                   design={design}
@@ -142,12 +124,34 @@ const HouseDesignsPage: React.FC<HouseDesignsPageProps> = ({ pageData }) => {
               <p>Try adjusting your filters to see more results</p>
               <button 
                 className="reset-filters-btn"
-                onClick={() => setActiveFilters({})}
+                onClick={() => onFilterChange({})}
               >
                 Clear all filters
               </button>
             </div>
           )}
+
+          {numPages > 1 && (
+            <div className="designs-pagination">
+              <button
+                className="pagination-btn"
+                disabled={currentPage <= 1}
+                onClick={() => onPageChange(currentPage - 1)}
+              >
+                Previous
+              </button>
+              <span className="pagination-status">
+                Page {currentPage} of {numPages}
+              </span>
+              <button
+                className="pagination-btn"
+                disabled={currentPage >= numPages}
+                onClick={() => onPageChange(currentPage + 1)}
+              >
+                Next
+              </button>
+            </div>
+          )}
         </div>
       </div>
 
@@ -3,7 +3,11 @@ import { HouseDesignsPageData } from '../types';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://127.0.0.1:8000/api/v2';
 
-export const useHouseDesigns = (slug: string = 'home-design') => {
+// Listing parameters (filters, sort, page, per_page) are applied by the API
+export const useHouseDesigns = (
+  slug: string = 'home-design',
+  listingParams: Record<string, string> = {}
+) => {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [pageData, setPageData] = useState<HouseDesignsPageData | null>(null);
@@ -15,7 +19,13 @@ export const useHouseDesigns = (slug: string = 'home-design') => {
         setError(null);
 
         // Fetch page data from Wagtail API
-        const url = `${API_BASE_URL}/pages/?type=house_designs.HouseDesignsIndexPage&fields=*&slug=${slug}`;
+        const params = new URLSearchParams({
+          type: 'house_designs.HouseDesignsIndexPage',
+          fields: '*',
+          slug,
+          ...listingParams,
+        });
+        const url = `${API_BASE_URL}/pages/?${params.toString()}`;
         
         const response = await fetch(url);
 
@@ -40,7 +50,8 @@ export const useHouseDesigns = (slug: string = 'home-design') => {
     };
 
     fetchHouseDesigns();
-  }, [slug]);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [slug, JSON.stringify(listingParams)]);
 
   return { loading, error, pageData };
 };
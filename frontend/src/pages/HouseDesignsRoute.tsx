@@ -1,8 +1,16 @@
+import { useState } from 'react';
 import { HouseDesignsPage } from '../components/HouseDesigns';
 import { useHouseDesigns } from '../hooks/useHouseDesigns';
 
 const HouseDesignsRoute = () => {
-  const { error, pageData } = useHouseDesigns();
+  const [activeFilters, setActiveFilters] = useState<Record<string, string>>({});
+  const [page, setPage] = useState(1);
+  const { error, pageData } = useHouseDesigns('home-design', { ...activeFilters, page: String(page) });
+
+  const handleFilterChange = (filters: Record<string, string>) => {
+    setActiveFilters(filters);
+    setPage(1);
+  };
 
   if (error) {
     return (
@@ -23,7 +31,14 @@ const HouseDesignsRoute = () => {
     );
   }
 
-  return <HouseDesignsPage pageData={pageData} />;
+  return (
+    <HouseDesignsPage
+      pageData={pageData}
+      activeFilters={activeFilters}
+      onFilterChange={handleFilterChange}
+      onPageChange={setPage}
+    />
+  );
 };
 
 export default HouseDesignsRoute;
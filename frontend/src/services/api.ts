@@ -1,5 +1,6 @@
 // Wagtail API service
 import axios from 'axios';
+import { HouseDesignApiResponse, HouseDesignDetail } from '../types';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://127.0.0.1:8000/api/v2';
 
@@ -358,4 +359,29 @@ export const fetchHomePage = async (): Promise<WagtailHomePage | null> => {
   }
 };
 
+// Fields a house design card needs
+export const HOUSE_DESIGN_CARD_FIELDS = 'name,slug,thumbnail,pricing';
+
+// Fetch house designs from the dedicated endpoint; only the requested
+// fields are loaded and returned (filters, sort, limit and cursor are
+// passed through as query parameters)
+export const fetchHouseDesigns = async (
+  params: Record<string, string> = {},
+  fields: string = HOUSE_DESIGN_CARD_FIELDS
+): Promise<HouseDesignApiResponse> => {
+  const response = await api.get<HouseDesignApiResponse>('/house-designs/', {
+    params: { fields, ...params },
+  });
+  return response.data;
+};
+
+// Fetch one house design by slug, with its additional content (all fields
+// unless narrowed with `fields`)
+export const fetchHouseDesign = async (slug: string, fields?: string): Promise<HouseDesignDetail> => {
+  const response = await api.get<HouseDesignDetail>(`/house-designs/${slug}/`, {
+    params: fields ? { fields } : {},
+  });
+  return response.data;
+};
+
 export default api;
\ No newline at end of file
@@ -86,9 +86,42 @@ export interface HouseDesign {
   tags: string[];
 }
 
+// Item of /api/v2/house-designs/; only the fields asked for with ?fields= are present
+export interface HouseDesignApiItem extends Partial<Omit<HouseDesign, 'id'>> {
+  id: number;
+  thumbnail?: WagtailImage | null;
+  updated_at?: string;
+}
+
+// Block of HouseDesign.additional_content (value shape depends on type)
+export interface HouseDesignContentBlock {
+  type: string;
+  id: string;
+  value: Array<{ type: string; id: string; value: any }>;
+}
+
+// /api/v2/house-designs/<slug>/
+export interface HouseDesignDetail extends HouseDesignApiItem {
+  additional_content?: HouseDesignContentBlock[];
+}
+
+export interface HouseDesignApiResponse {
+  meta: {
+    // Absent with count=false
+    total_count?: number;
+    // Present in cursor mode
+    next_cursor?: string | null;
+  };
+  items: HouseDesignApiItem[];
+}
+
 export interface FilterOption {
   label: string;
   value: string;
+  // Query parameter the value is for (price ranges: min_price or max_price)
+  parameter?: string;
+  // Designs left when the option is picked (with the other active filters)
+  count?: number;
 }
 
 export interface HouseDesignFilters {
@@ -96,6 +129,7 @@ export interface HouseDesignFilters {
   bedrooms: FilterOption[];
   bathrooms: FilterOption[];
   categories: FilterOption[];
+  locations?: FilterOption[];
   price_ranges: FilterOption[];
 }
 
@@ -112,9 +146,24 @@ export interface HouseDesignsPageData {
     overlay_opacity: number;
   };
   house_designs_data: HouseDesign[];
+  house_designs_meta: HouseDesignsMeta;
   filter_options: HouseDesignFilters;
 }
 
+export interface HouseDesignsMeta {
+  // null when the listing was requested with designs_count=false
+  total_count: number | null;
+  // null in cursor mode (designs_cursor)
+  page: number | null;
+  per_page: number;
+  num_pages: number | null;
+  has_next: boolean;
+  next_cursor: string | null;
+  sort: string;
+  sorts: string[];
+  filters: Record<string, string>;
+}
+
 export interface WagtailHomePage {
   id: number;
   title: string;